@@ -0,0 +1,6 @@
+"""
+基准测试：合成测绘表（SurveyGenerator）+ 分阶段微基准，报告吞吐、整批耗时分位数与峰值内存，并与基线比较。
+
+    python -m benchmarks.run --sizes 1000 10000
+    python -m benchmarks.run --sizes 1000 --save-baseline
+"""
@@ -0,0 +1,117 @@
+# benchmarks/cases.py
+"""
+分阶段微基准用例。计算类用例较慢，只取前 *_LIMIT 栋（吞吐按实际栋数折算）。
+
+    data_loader          DataLoader 读表 + 入库（换算、编码）
+    format_buildings     逐栋格式化为 building_data
+    form_inferencer      FormInferencer.run
+    rule_manager         RuleManager.get_building_rules（已预热）
+    calculator_factory   CalculatorFactory.create_calculator
+    calculators          逐栋 create_calculator + calculate_all
+    scheduler            FormScheduler 分桶批量计算（条目只计成功的栋）
+    assembly             Mock bpy 下 BulkWriter 合并写入
+"""
+from configs.config_manager import RuleManager
+from core import CalculatorFactory, DataLoader, FormInferencer, FormScheduler
+from core.scheduler import INFER_ERRORS
+
+from .harness import register_case
+
+CALC_LIMIT = 2000
+SCHEDULER_LIMIT = 20000
+ASSEMBLY_LIMIT = 200
+
+
+def _inferred(loader: DataLoader, limit: int = None):
+    """可推断且有形态规则的 building_data 列表"""
+    out = []
+    for row in range(min(loader.get_building_count(), limit or loader.get_building_count())):
+        data = loader.format_building(row)
+        try:
+            FormInferencer(data).run()
+            RuleManager.get_building_rules(data["category_info"]["form_name"])
+        except INFER_ERRORS:
+            continue
+        out.append(data)
+    return out
+
+
+@register_case("data_loader")
+def data_loader(path: str, n: int):
+    return (lambda: DataLoader(path)), n
+
+
+@register_case("format_buildings")
+def format_buildings(path: str, n: int):
+    loader = DataLoader(path)
+    rows = range(loader.get_building_count())
+    return (lambda: [loader.format_building(r) for r in rows]), len(rows)
+
+
+@register_case("form_inferencer")
+def form_inferencer(path: str, n: int):
+    buildings = _inferred(DataLoader(path))
+
+    def op():
+        for data in buildings:
+            FormInferencer(data).run()
+
+    return op, len(buildings)
+
+
+@register_case("rule_manager")
+def rule_manager(path: str, n: int):
+    names = [d["category_info"]["form_name"] for d in _inferred(DataLoader(path))]
+
+    def op():
+        for name in names:
+            RuleManager.get_building_rules(name)
+
+    return op, len(names)
+
+
+@register_case("calculator_factory")
+def calculator_factory(path: str, n: int):
+    buildings = _inferred(DataLoader(path))
+    return (lambda: [CalculatorFactory.create_calculator(d) for d in buildings]), len(buildings)
+
+
+@register_case("calculators")
+def calculators(path: str, n: int):
+    buildings = _inferred(DataLoader(path), CALC_LIMIT)
+    return (lambda: [CalculatorFactory.create_calculator(d).calculate_all() for d in buildings]), len(buildings)
+
+
+@register_case("scheduler")
+def scheduler(path: str, n: int):
+    loader = DataLoader(path)
+    rows = range(min(loader.get_building_count(), SCHEDULER_LIMIT))
+    # 推断 / 规则 / 计算失败的行不计入吞吐；结果确定，预先跑一次数出成功栋数
+    succeeded = sum(p is not None for p in FormScheduler(loader).run(rows))
+    return (lambda: FormScheduler(loader).run(rows)), succeeded
+
+
+@register_case("assembly")
+def assembly(path: str, n: int):
+    from exporters import batches_from_packed
+    from structure.component_calculator_schema import bpy
+    from structure.utils import ensure_collection
+    from structure.writer import BulkWriter
+
+    loader = DataLoader(path)
+    packed = [p for p in FormScheduler(loader).run(range(min(n, ASSEMBLY_LIMIT))) if p is not None]
+    scenes = [(p["basic_info"]["garden_id"], batches_from_packed(p)) for p in packed]
+
+    def op():
+        writer = BulkWriter()
+        for garden, batches in scenes:
+            collection = ensure_collection(garden or "garden")
+            for batch in batches:
+                writer.add(batch.name, batch.mesh, collection, batch.matrices)
+        writer.commit()
+        if hasattr(bpy, "data_meshes_new"):
+            # Mock 环境：数据块常驻字典，重复计时前清空
+            for blocks in (bpy.data.meshes, bpy.data.objects, bpy.data.collections):
+                blocks.clear()
+
+    return op, len(scenes)
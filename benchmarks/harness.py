@@ -0,0 +1,83 @@
+# benchmarks/harness.py
+"""
+计时与统计：每个用例在独立子进程中运行（峰值 RSS 互不干扰）。
+
+用例约定：setup(path, n) 返回 (op, items)
+    op    无参可调用，执行一次被测操作（一次处理全部条目）
+    items 一次 op 成功处理的条目数（栋、次），用于折算吞吐
+
+计时单位是一次 op（整批），不是单个条目：run_p50_ms / run_p90_ms 为整批耗时的
+分位数，单栋平均耗时 = run_p50_ms / items。重复次数少（缺省 5），不给 p99。
+"""
+import multiprocessing as mp
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+Setup = Callable[[str, int], Tuple[Callable[[], object], int]]
+
+CASES: Dict[str, Setup] = {}
+
+
+def register_case(name: str):
+    def deco(fn: Setup) -> Setup:
+        CASES[name] = fn
+        return fn
+    return deco
+
+
+@dataclass
+class CaseResult:
+    case: str
+    size: int
+    items: int
+    repeat: int
+    throughput: float        # 条目 / 秒（按整批耗时中位数折算）
+    run_p50_ms: float        # 整批耗时
+    run_p90_ms: float
+    peak_rss_mb: float
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def peak_rss_mb() -> float:
+    """本进程峰值常驻内存（Linux ru_maxrss 以 KB 计，macOS 以字节计）"""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024.0 * 1024.0) if sys.platform == "darwin" else rss / 1024.0
+
+
+def measure(name: str, path: str, size: int, repeat: int = 5, warmup: int = 1) -> CaseResult:
+    """在当前进程内执行用例：预热 warmup 次，再计时 repeat 次"""
+    op, items = CASES[name](path, size)
+    for _ in range(warmup):
+        op()
+    runs = np.empty(repeat)
+    for i in range(repeat):
+        t = time.perf_counter()
+        op()
+        runs[i] = time.perf_counter() - t
+
+    p50, p90 = np.percentile(runs, [50, 90]) * 1000.0
+    return CaseResult(
+        case=name,
+        size=size,
+        items=items,
+        repeat=repeat,
+        throughput=items / (p50 / 1000.0) if p50 > 0 else float("inf"),
+        run_p50_ms=float(p50),
+        run_p90_ms=float(p90),
+        peak_rss_mb=peak_rss_mb(),
+    )
+
+
+def measure_isolated(name: str, path: str, size: int, repeat: int = 5, warmup: int = 1) -> CaseResult:
+    """同 measure，但在新的子进程中执行（fork 继承已导入模块，不计入导入时间）"""
+    ctx = mp.get_context("fork") if "fork" in mp.get_all_start_methods() else None
+    with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+        return pool.submit(measure, name, path, size, repeat, warmup).result()
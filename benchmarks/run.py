@@ -0,0 +1,125 @@
+# benchmarks/run.py
+"""
+    python -m benchmarks.run                          # 默认 1000 栋，全部用例，与基线比较
+    python -m benchmarks.run --sizes 1000 10000 100000 --cases data_loader scheduler
+    python -m benchmarks.run --save-baseline          # 以本次结果覆盖基线
+
+比较规则：吞吐低于基线 (1 - tolerance) 倍，或峰值内存高于基线 (1 + tolerance) 倍，
+记为回退；有回退时退出码为 1。
+"""
+import argparse
+import json
+import logging
+import platform
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from configs import ConfigManager
+
+from . import cases  # noqa: F401  注册用例
+from .harness import CASES, CaseResult, measure, measure_isolated
+from .survey_generator import SurveyGenerator
+
+BASELINE_FILE = Path(__file__).with_name("baseline.json")
+DEFAULT_SIZES = (1000,)
+
+
+def survey_path(workdir: Path, size: int, seed: int) -> Path:
+    path = workdir / f"survey_{size}_{seed}.csv"
+    if not path.exists():
+        SurveyGenerator(path, size, seed=seed).run()
+    return path
+
+
+def compare(results: List[dict], baseline: List[dict], tolerance: float) -> List[Tuple[dict, dict, List[str]]]:
+    """→ [(本次, 基线, 回退项)]，基线中没有的用例不比较"""
+    base: Dict[Tuple[str, int], dict] = {(b["case"], b["size"]): b for b in baseline}
+    out = []
+    for r in results:
+        b = base.get((r["case"], r["size"]))
+        if b is None:
+            continue
+        regressions = []
+        if r["throughput"] < b["throughput"] * (1.0 - tolerance):
+            regressions.append("throughput")
+        if r["peak_rss_mb"] > b["peak_rss_mb"] * (1.0 + tolerance):
+            regressions.append("peak_rss")
+        out.append((r, b, regressions))
+    return out
+
+
+def format_table(results: List[dict], comparison=None) -> str:
+    ratios = {(r["case"], r["size"]): (r["throughput"] / b["throughput"], reg) for r, b, reg in comparison or []}
+    lines = [f"{'case':<20}{'size':>8}{'items':>8}{'items/s':>12}{'run p50 ms':>12}{'run p90 ms':>12}"
+             f"{'RSS MB':>9}{'vs base':>9}"]
+    for r in results:
+        ratio, regressions = ratios.get((r["case"], r["size"]), (None, []))
+        mark = "" if ratio is None else f"{ratio:.2f}x" + (" !" if regressions else "")
+        lines.append(
+            f"{r['case']:<20}{r['size']:>8}{r['items']:>8}{r['throughput']:>12.1f}{r['run_p50_ms']:>12.2f}"
+            f"{r['run_p90_ms']:>12.2f}{r['peak_rss_mb']:>9.1f}{mark:>9}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="test_arch 基准测试")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--cases", nargs="+", default=None, help=f"可选：{', '.join(CASES)}")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", default=None, help="合成测绘表目录（缺省 base_config [paths] cache_dir）")
+    parser.add_argument("--baseline", default=str(BASELINE_FILE))
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--output", default=None, help="本次结果另存为 JSON")
+    parser.add_argument("--in-process", action="store_true", help="不开子进程（峰值内存为累计值）")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.ERROR)
+    names = args.cases or list(CASES)
+    unknown = [n for n in names if n not in CASES]
+    if unknown:
+        parser.error(f"未知用例：{', '.join(unknown)}")
+
+    workdir = Path(args.workdir or ConfigManager.get_base_config("paths", "cache_dir", "cache/")) / "benchmarks"
+    run = measure if args.in_process else measure_isolated
+
+    results: List[CaseResult] = []
+    for size in args.sizes:
+        path = str(survey_path(workdir, size, args.seed))
+        for name in names:
+            result = run(name, path, size, args.repeat, args.warmup)
+            results.append(result)
+            print(f"  {name} @ {size}: {result.throughput:.1f} items/s", file=sys.stderr)
+
+    records = [r.to_dict() for r in results]
+    meta = {"python": platform.python_version(), "machine": platform.machine(), "seed": args.seed}
+
+    baseline_path = Path(args.baseline)
+    comparison = None
+    if baseline_path.exists() and not args.save_baseline:
+        with open(baseline_path, "r", encoding="utf-8") as f:
+            comparison = compare(records, json.load(f)["results"], args.tolerance)
+
+    print(format_table(records, comparison))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": records}, f, ensure_ascii=False, indent=2)
+    if args.save_baseline:
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": records}, f, ensure_ascii=False, indent=2)
+        print(f"基线已写入 {baseline_path}")
+
+    regressed = [r for r, _, reg in comparison or [] if reg]
+    if regressed:
+        print(f"回退 {len(regressed)} 项：" + ", ".join(f"{r['case']}@{r['size']}" for r in regressed))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,316 @@
+# benchmarks/survey_generator.py
+"""
+大规模合成测绘表：与真实表同一中文表头与说明行，按规则词汇抽样，流式写出，内存与行数无关。
+
+    python -m benchmarks.survey_generator out.csv --rows 1000000 --seed 7 --error-rate 0.01
+    python -m benchmarks.survey_generator out.xlsx --rows 100000 --manifest errors.csv
+
+抽样（均可由 SurveyProfile 调整）：
+- 形态：ruled_fraction 的建筑取自 building_forms.toml 中有规则的形态，
+  檩数 / 屋脊类型 / 等级由形态名拆出，屋顶形式取其 roof_types 继承（在类映射中者），否则按 roof_weights；
+  其余建筑随机组合（多数无规则，模拟真实表中尚未建模的形态）
+- 进深与檐步：通进深 = 檐步架 × (檩数 - 2) + 余量，保证 FormInferencer 推出同一檩数
+- 开间：楹 ∈ {3, 5, 7, 9}，明间正态，次间及以外逐级收分
+- 标注列：按 annotated_rates 的比例出现，取值与檐柱径制比例一致并加噪声
+- 错误注入：error_rate 的行注入一种错误（ERROR_KINDS），manifest 记录行号、类型与字段
+
+同一 seed 与 chunk_size 得到逐字节相同的输出。
+"""
+import argparse
+import csv
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from configs import Vocabulary
+from configs.config_manager import ClassRegistry, RuleManager
+from core.form_inferencer import FormInferencer
+from core.naming_service import format_fixed
+
+TEMPLATE_CSV = Path("data/data.csv")
+ERROR_KINDS = ("missing", "non_numeric", "unknown_term", "outlier", "negative")
+
+GARDENS = ("CC", "YH", "BH")
+SUB_CATEGORIES = ("正房", "厢房", "倒座房")
+CORRIDORS = ("无廊", "前廊", "后廊", "前后廊")
+EXTRA_RIDGES = ("卷棚", "一殿一卷", "歇山", "硬山")
+BAY_FIELDS = ("明间", "次间", "二次间", "三次间", "四次间")
+
+_CN_TO_NUM = {FormInferencer._num_to_cn(n): n for n in range(3, 9)}
+
+
+@dataclass
+class SurveyProfile:
+    """抽样分布参数（尺寸单位与真实测绘表一致：米）"""
+    ruled_fraction: float = 0.85
+    roof_weights: Dict[str, float] = field(default_factory=lambda: {
+        "悬山": 0.40, "歇山": 0.30, "硬山": 0.20, "庑殿": 0.05, "攒尖": 0.05,
+    })
+    corridor_weights: Tuple[float, ...] = (0.40, 0.30, 0.10, 0.20)
+    sub_category_weights: Tuple[float, ...] = (0.50, 0.35, 0.15)
+    bay_count_weights: Dict[int, float] = field(default_factory=lambda: {3: 0.25, 5: 0.55, 7: 0.15, 9: 0.05})
+    eave_step: Tuple[float, float] = (0.42, 0.06)          # 均值, 标准差
+    main_bay: Tuple[float, float] = (1.20, 0.15)
+    side_taper: Tuple[float, float] = (0.85, 0.97)         # 次间 / 上一间
+    pillar_height_per_bay: Tuple[float, float] = (0.80, 0.06)
+    pillar_height_ratio: float = 10.0                      # 柱高 / 柱径（檐柱径制）
+    annotated_rates: Dict[str, float] = field(default_factory=lambda: {
+        "标注檐柱高": 0.7, "标注柱径": 0.3, "标注台明高": 0.4, "标注上出": 0.1, "标注下出": 0.4,
+    })
+
+
+def read_template(path=TEMPLATE_CSV) -> Tuple[List[str], List[str]]:
+    """真实测绘表的 (表头, 说明行)"""
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        return next(reader), next(reader)
+
+
+def ruled_forms() -> List[Tuple[str, int, str, str, Optional[str]]]:
+    """有规则的形态 → [(形态名, 檩数, 屋脊类型, 等级, 屋顶形式或 None)]"""
+    RuleManager._initialize()
+    grades = {g["name"] for g in RuleManager._rules.get("construction_grades", {})
+              .get("construction_grade", {}).values()}
+    pattern = re.compile(rf"^(.)檩(.+)({'|'.join(map(re.escape, grades))})$")
+
+    ClassRegistry._initialize()
+    # 类映射以 ASCII 标识为键，此处与规则中的中文屋顶名比较
+    roof_forms = {Vocabulary.term(i) for i in ClassRegistry._mapping.get("roof_forms", {})}
+
+    out = []
+    for name, form in RuleManager._rules.get("building_forms", {}).get("building_form", {}).items():
+        match = pattern.match(name) if isinstance(form, dict) else None
+        if match is None or match.group(1) not in _CN_TO_NUM:
+            continue
+        roof = None
+        for ref in form.get("inherit", []):
+            if ref.startswith("roof_types."):
+                roof_name = (RuleManager.resolve_ref(ref) or {}).get("name")
+                roof = roof_name if roof_name in roof_forms else roof
+        out.append((name, _CN_TO_NUM[match.group(1)], match.group(2), match.group(3), roof))
+    return out
+
+
+class SurveyGenerator:
+    """
+    path       : 输出文件，.csv 或 .xlsx（后者需要 openpyxl）
+    rows       : 建筑数
+    seed       : 随机种子
+    error_rate : 注入错误的行比例；error_kinds 为可选错误类型
+    manifest   : 可选 CSV，记录注入的错误（行号从 0 起，对应 DataLoader 行号）
+    """
+
+    def __init__(
+        self,
+        path,
+        rows: int,
+        seed: int = 0,
+        error_rate: float = 0.0,
+        error_kinds: Sequence[str] = ERROR_KINDS,
+        manifest=None,
+        profile: Optional[SurveyProfile] = None,
+        chunk_size: int = 10000,
+        template=TEMPLATE_CSV,
+    ):
+        unknown = set(error_kinds) - set(ERROR_KINDS)
+        if unknown:
+            raise ValueError(f"未知的错误类型：{', '.join(sorted(unknown))}")
+        self.path = Path(path)
+        self.rows = rows
+        self.seed = seed
+        self.error_rate = error_rate
+        self.error_kinds = tuple(error_kinds)
+        self.manifest = Path(manifest) if manifest else None
+        self.profile = profile or SurveyProfile()
+        self.chunk_size = chunk_size
+
+        self.headers, self.description = read_template(template)
+        self._col = {h: i for i, h in enumerate(self.headers)}
+        self.forms = ruled_forms()
+        if not self.forms:
+            raise ValueError("building_forms.toml 中没有可解析的形态")
+
+    # -------------------------------------------------------
+    # 分块抽样（整块向量化，每块 (m, C) 字符串数组）
+    # -------------------------------------------------------
+    def _choice(self, rng, values, weights, m) -> np.ndarray:
+        p = np.asarray(weights, dtype=np.float64)
+        return np.asarray(values)[rng.choice(len(values), size=m, p=p / p.sum())]
+
+    def _chunk(self, start: int, m: int) -> Tuple[np.ndarray, List[Tuple[int, str, str]]]:
+        rng = np.random.default_rng([self.seed, start])
+        prof = self.profile
+        cells = np.full((m, len(self.headers)), "", dtype=object)
+
+        def put(name: str, values):
+            if name in self._col:
+                cells[:, self._col[name]] = values
+
+        # 形态
+        ruled = rng.random(m) < prof.ruled_fraction
+        form_idx = rng.integers(len(self.forms), size=m)
+        num_lin = np.array([f[1] for f in self.forms])[form_idx]
+        ridge = np.array([f[2] for f in self.forms], dtype=object)[form_idx]
+        grade = np.array([f[3] for f in self.forms], dtype=object)[form_idx]
+        form_roof = np.array([f[4] or "" for f in self.forms], dtype=object)[form_idx]
+        roof = self._choice(rng, list(prof.roof_weights), list(prof.roof_weights.values()), m).astype(object)
+        roof = np.where(ruled & (form_roof != ""), form_roof, roof)
+
+        free = ~ruled
+        num_lin[free] = rng.integers(4, 8, size=free.sum())
+        ridge[free] = self._choice(rng, EXTRA_RIDGES, np.ones(len(EXTRA_RIDGES)), free.sum())
+        grade[free] = self._choice(rng, ("大式", "小式"), (0.7, 0.3), free.sum())
+
+        # 开间
+        bay_counts = self._choice(rng, list(prof.bay_count_weights), list(prof.bay_count_weights.values()), m)
+        widths = np.empty((m, len(BAY_FIELDS)))
+        widths[:, 0] = np.clip(rng.normal(*prof.main_bay, size=m), 0.6, 2.5)
+        for k in range(1, len(BAY_FIELDS)):
+            widths[:, k] = widths[:, k - 1] * rng.uniform(*prof.side_taper, size=m)
+        filled = np.arange(len(BAY_FIELDS))[None, :] < ((bay_counts + 1) // 2)[:, None]
+
+        # 进深：depth // step = 檩数 - 2
+        # （先取到两位小数，余量留足，写出时的舍入不会改变商）
+        step = np.round(np.clip(rng.normal(*prof.eave_step, size=m), 0.25, 0.7), 2)
+        depth = step * (num_lin - 2) + step * rng.uniform(0.1, 0.9, size=m)
+
+        # 标注
+        height = widths[:, 0] * rng.normal(*prof.pillar_height_per_bay, size=m)
+        diameter = height / prof.pillar_height_ratio * rng.normal(1.0, 0.05, size=m)
+        annotated = {
+            "标注檐柱高": height,
+            "标注柱径": diameter,
+            "标注台明高": height * rng.uniform(0.15, 0.25, size=m),
+            "标注上出": height * rng.uniform(0.25, 0.35, size=m),
+            "标注下出": height * rng.uniform(0.2, 0.3, size=m),
+        }
+
+        # 写入单元格
+        rows = np.arange(start, start + m)
+        garden = self._choice(rng, GARDENS, np.ones(len(GARDENS)), m)
+        put(self.headers[0], (rows + 1).astype(str))
+        put("园林名称", garden)
+        put("园中园编号", np.char.add(np.char.add(self._choice(rng, ("W", "E", "M"), (1, 1, 1), m),
+                                                  np.char.zfill((rows // 500 % 100).astype(str), 2)), "L_ABC"))
+        put("建筑编号", np.char.add("G", np.char.zfill(rows.astype(str), 7)))
+        put("建筑名称", "-")
+        put("建筑类别", "房屋")
+        put("建筑子类", self._choice(rng, SUB_CATEGORIES, prof.sub_category_weights, m))
+        put("建筑等级", grade)
+        put("屋顶形式", roof)
+        put("屋脊类型", ridge)
+        put("出廊", self._choice(rng, CORRIDORS, prof.corridor_weights, m))
+        put("楹", bay_counts.astype(str))
+        for k, name in enumerate(BAY_FIELDS):
+            put(name, np.where(filled[:, k], format_fixed(widths[:, k]), ""))
+        put("通进深", format_fixed(depth))
+        put("檐步架", format_fixed(step))
+        for name, values in annotated.items():
+            rate = prof.annotated_rates.get(name, 0.0)
+            put(name, np.where(rng.random(m) < rate, format_fixed(values), ""))
+
+        return cells, self._inject(rng, cells, rows)
+
+    def _inject(self, rng, cells: np.ndarray, rows: np.ndarray) -> List[Tuple[int, str, str]]:
+        """就地注入错误，返回 [(行号, 类型, 字段)]"""
+        if self.error_rate <= 0 or not self.error_kinds:
+            return []
+        hit = np.flatnonzero(rng.random(len(rows)) < self.error_rate)
+        kinds = rng.integers(len(self.error_kinds), size=len(hit))
+        dims = [f for f in ("通进深", "檐步架", "明间") if f in self._col]
+        picks = rng.integers(len(dims), size=len(hit))
+
+        injected = []
+        for i, k, p in zip(hit, kinds, picks):
+            kind, name = self.error_kinds[k], dims[p]
+            c = self._col[name]
+            if kind == "missing":
+                cells[i, c] = ""
+            elif kind == "non_numeric":
+                cells[i, c] = f"约{cells[i, c] or '1'}"
+            elif kind == "unknown_term":
+                name = "屋顶形式"
+                cells[i, self._col[name]] = "未知顶"
+            elif kind == "outlier":
+                cells[i, c] = f"{float(cells[i, c] or 1.0) * 10:.2f}"
+            elif kind == "negative":
+                cells[i, c] = f"-{cells[i, c] or '1'}"
+            injected.append((int(rows[i]), kind, name))
+        return injected
+
+    def chunks(self) -> Iterator[Tuple[np.ndarray, List[Tuple[int, str, str]]]]:
+        for start in range(0, self.rows, self.chunk_size):
+            yield self._chunk(start, min(self.chunk_size, self.rows - start))
+
+    # -------------------------------------------------------
+    # 写出
+    # -------------------------------------------------------
+    def _write_csv(self, manifest_writer) -> None:
+        with open(self.path, "w", encoding="utf-8-sig", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(self.headers)
+            writer.writerow(self.description)
+            for cells, injected in self.chunks():
+                writer.writerows(cells.tolist())
+                if manifest_writer is not None:
+                    manifest_writer.writerows(injected)
+
+    def _write_xlsx(self, manifest_writer) -> None:
+        try:
+            from openpyxl import Workbook
+        except ImportError as e:
+            raise ImportError("写出 .xlsx 需要 openpyxl：pip install openpyxl") from e
+
+        # write_only 模式逐行落盘，内存不随行数增长
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("测绘")
+        ws.append(self.headers)
+        ws.append(self.description)
+        for cells, injected in self.chunks():
+            for row in cells.tolist():
+                ws.append(row)
+            if manifest_writer is not None:
+                manifest_writer.writerows(injected)
+        wb.save(self.path)
+
+    def run(self) -> Path:
+        suffix = self.path.suffix.lower()
+        if suffix not in (".csv", ".xlsx"):
+            raise ValueError(f"不支持的格式：{suffix}（可用：.csv, .xlsx）")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        manifest_file = open(self.manifest, "w", encoding="utf-8", newline="") if self.manifest else None
+        try:
+            manifest_writer = csv.writer(manifest_file) if manifest_file else None
+            if manifest_writer is not None:
+                manifest_writer.writerow(("row", "kind", "field"))
+            (self._write_csv if suffix == ".csv" else self._write_xlsx)(manifest_writer)
+        finally:
+            if manifest_file:
+                manifest_file.close()
+        return self.path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="合成测绘表")
+    parser.add_argument("path")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-kinds", nargs="+", default=list(ERROR_KINDS))
+    parser.add_argument("--manifest", default=None)
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    path = SurveyGenerator(
+        args.path, args.rows, args.seed, args.error_rate, args.error_kinds,
+        args.manifest, chunk_size=args.chunk_size,
+    ).run()
+    print(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,2 @@
 from .config_manager import ConfigManager
+from .vocabulary import Vocabulary
@@ -4,6 +4,33 @@ from copy import deepcopy
 
 TOML_CONFIG_DIR = Path("configs/rules/")
 JSON_CONFIG_FILE = Path("configs/class_mapping.json")
+BASE_CONFIG_FILE = Path("configs/base_config.toml")
+
+
+class BaseConfig:
+    """
+    负责 base_config.toml 全局配置加载（全局加载一次）
+    """
+
+    _config = None
+    _toml_file = BASE_CONFIG_FILE
+
+    @classmethod
+    def _initialize(cls, toml_config_file: Path = None):
+        if cls._config is not None:
+            return
+
+        if toml_config_file:
+            cls._toml_file = toml_config_file
+
+        with open(cls._toml_file, "rb") as f:
+            cls._config = tomllib.load(f)
+
+    @classmethod
+    def get(cls, section: str, key: str = None, default=None):
+        cls._initialize()
+        data = cls._config.get(section, {})
+        return data if key is None else data.get(key, default)
 
 
 class ClassRegistry:
@@ -26,15 +53,23 @@ class ClassRegistry:
             cls._mapping = json.load(f)
 
     @classmethod
-    def get_class_mapping(cls, class_type: str) -> str:
+    def get_class_mapping(cls, class_type) -> str:
+        """
+        屋顶形式（中文术语、ASCII 标识或术语编码）→ 计算器类路径。
+        类映射以 ASCII 标识为键；未登记的术语或映射中没有的形式抛出 ValueError。
+        """
+        # vocabulary 依赖本模块的 TOML_CONFIG_DIR，延迟导入
+        from configs.vocabulary import Vocabulary
+
         if cls._mapping is None:
             cls._initialize()
 
+        key = Vocabulary.ascii_id(class_type)
         form_config = cls._mapping.get("roof_forms")
-        if isinstance(form_config, dict):
-            return form_config.get(class_type)
-
-        return cls._mapping.get(class_type)
+        class_path = form_config.get(key) if isinstance(form_config, dict) else cls._mapping.get(key)
+        if not class_path:
+            raise ValueError(f"未找到屋顶形式对应的计算器类：{Vocabulary.term(key)}（{key}）")
+        return class_path
 
 
 class RuleManager:
@@ -111,9 +146,11 @@ class ConfigManager:
     def _initialize(
         toml_config_dir: Path = TOML_CONFIG_DIR,
         json_config_file: Path = JSON_CONFIG_FILE,
+        base_config_file: Path = BASE_CONFIG_FILE,
     ):
         RuleManager._initialize(toml_config_dir)
         ClassRegistry._initialize(json_config_file)
+        BaseConfig._initialize(base_config_file)
 
     # ----- 对外统一调用 API -----
 
@@ -125,9 +162,13 @@ class ConfigManager:
     def get_class_mapping(roof_form_name: str) -> str:
         return ClassRegistry.get_class_mapping(roof_form_name)
 
+    @staticmethod
+    def get_base_config(section: str, key: str = None, default=None):
+        return BaseConfig.get(section, key, default)
+
 
 if __name__ == "__main__":
 
     config_mgr = ConfigManager()
     print(config_mgr.get_building_rules("六檩卷棚大式"))
-    print(config_mgr.get_class_mapping("歇山"))
+    print(config_mgr.get_class_mapping("hip_roof"))
@@ -0,0 +1,202 @@
+# configs/vocabulary.py
+"""
+术语表：中文术语 ⇄ 整数编码 ⇄ ASCII 标识，启动时编译一次（全局唯一）。
+
+来源（先登记者为规范 ASCII 标识，其余作别名）：
+    1. building_forms.toml [building_form] 中的字符串映射   "歇山" = "hip_roof"
+    2. docs/name_trans_to_en.txt 术语词典                 eave_column = None  # 檐柱
+    3. rules/*.toml 各表的键与 name                       [roof_type.roll_shed] name = "卷棚"
+docs/name_rules.txt 只是变量命名约定，没有术语对照，不参与编译。
+
+- 编码 0 保留给空串（缺测）
+- 未登记的术语在入库时追加，ASCII 标识由术语内容哈希得出（与加载次序无关）
+- 编码只在本进程内有效；跨进程 / 对外交换一律用 ASCII 标识
+  （category_info["ids"]、类映射与墙体类表均以 ASCII 标识为键）
+"""
+import hashlib
+import logging
+import re
+import threading
+import tomllib
+from pathlib import Path
+from typing import Dict, List, Union
+
+import numpy as np
+
+from .config_manager import TOML_CONFIG_DIR
+
+logger = logging.getLogger(__name__)
+
+TERM_DICTIONARY_FILE = Path("docs/name_trans_to_en.txt")
+
+_DICT_LINE = re.compile(r"\s*([a-z0-9_]+)\s*=\s*None\s*#\s*(\S+)")
+
+Term = Union[int, str]
+
+
+def fallback_id(term: str) -> str:
+    """未登记术语的稳定 ASCII 标识"""
+    return "term_" + hashlib.blake2s(term.encode("utf-8"), digest_size=4).hexdigest()
+
+
+class Vocabulary:
+    """
+    全局加载一次，缓存到类属性（同 RuleManager）。
+        encode(["歇山", ...]) → int 数组        decode(codes) → 中文数组
+        ascii_ids(codes)      → ASCII 数组      code("hip_roof") / code("歇山") → int
+    """
+
+    _terms: List[str] = []
+    _ids: List[str] = []
+    _index: Dict[str, int] = {}
+    _term_table = None
+    _id_table = None
+    _initialized = False
+    _toml_dir = TOML_CONFIG_DIR
+    _dictionary_file = TERM_DICTIONARY_FILE
+    # 常驻服务多线程计算时，追加术语须互斥（查询不加锁）
+    _lock = threading.RLock()
+
+    @classmethod
+    def _initialize(cls, toml_config_dir: Path = None, dictionary_file: Path = None):
+        if cls._initialized:
+            return
+        with cls._lock:
+            if not cls._initialized:
+                cls._compile(toml_config_dir, dictionary_file)
+
+    @classmethod
+    def _compile(cls, toml_config_dir: Path = None, dictionary_file: Path = None):
+        if toml_config_dir:
+            cls._toml_dir = toml_config_dir
+        if dictionary_file:
+            cls._dictionary_file = dictionary_file
+
+        cls._terms, cls._ids, cls._index = [], [], {}
+        cls._register("", "")
+
+        tables = {}
+        for path in sorted(cls._toml_dir.glob("*.toml")):
+            with open(path, "rb") as f:
+                tables[path.stem] = tomllib.load(f)
+
+        # 1. 形态表中的显式映射
+        forms = tables.get("building_forms", {}).get("building_form", {})
+        for term, ascii_id in forms.items():
+            if isinstance(ascii_id, str):
+                cls._register(term, ascii_id)
+
+        # 2. 术语词典
+        if cls._dictionary_file.exists():
+            with open(cls._dictionary_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    match = _DICT_LINE.match(line)
+                    if match:
+                        cls._register(match.group(2), match.group(1))
+
+        # 3. 规则表的键与 name；形态名本身没有英文，给哈希标识
+        for category, data in tables.items():
+            for key, entry in data.get(category.rstrip("s"), {}).items():
+                if not isinstance(entry, dict):
+                    continue
+                if "name" in entry:
+                    cls._register(entry["name"], key)
+                elif category == "building_forms":
+                    cls._register(key, fallback_id(key))
+
+        cls._initialized = True
+        logger.debug(f"[Vocab] 编译术语 {len(cls._terms)} 条")
+
+    @classmethod
+    def _register(cls, term: str, ascii_id: str) -> int:
+        """登记术语；已有者只把 ascii_id 记为别名"""
+        code = cls._index.get(term)
+        if code is None:
+            if ascii_id in cls._index:
+                # ASCII 标识已被其他术语占用：保留原有，新术语用哈希标识
+                logger.debug(f"[Vocab] 标识 {ascii_id} 已用于 {cls._terms[cls._index[ascii_id]]}，{term} 改用哈希标识")
+                ascii_id = fallback_id(term)
+            code = len(cls._terms)
+            cls._terms.append(term)
+            cls._ids.append(ascii_id)
+            cls._index[term] = code
+            cls._term_table = cls._id_table = None
+        cls._index.setdefault(ascii_id, code)
+        return code
+
+    # ---------------- 标量 API ----------------
+
+    @classmethod
+    def code(cls, term: Term, add: bool = False) -> int:
+        """中文术语 / ASCII 标识 / 编码 → 编码；未登记时 add 则追加，否则报错"""
+        cls._initialize()
+        if isinstance(term, (int, np.integer)):
+            if not 0 <= term < len(cls._terms):
+                raise ValueError(f"无效的术语编码：{term}")
+            return int(term)
+        code = cls._index.get(term)
+        if code is None:
+            if not add:
+                raise ValueError(f"未登记的术语：{term}")
+            with cls._lock:
+                code = cls._register(term, fallback_id(term))
+        return code
+
+    @classmethod
+    def term(cls, term: Term, add: bool = False) -> str:
+        """→ 中文术语（形态规则仍以中文为键）；未登记时 add 则追加，否则报错"""
+        return cls._terms[cls.code(term, add)]
+
+    @classmethod
+    def ascii_id(cls, term: Term, add: bool = False) -> str:
+        code = cls.code(term, add)
+        return cls._ids[code]
+
+    @classmethod
+    def category_id(cls, category: dict, key: str) -> str:
+        """
+        category_info 中某类别字段的 ASCII 标识：优先入库时记下的 ids，
+        手工构造 / JSON 输入只有术语时现查（未登记者追加）
+        """
+        ascii_id = category.get("ids", {}).get(key)
+        return ascii_id if ascii_id else cls.ascii_id(category.get(key, ""), add=True)
+
+    # ---------------- 整列 API ----------------
+
+    @classmethod
+    def encode(cls, values, add: bool = True) -> np.ndarray:
+        """字符串数组 → int32 编码；每个不同值只查一次"""
+        cls._initialize()
+        values = np.asarray(values, dtype=str)
+        uniq, inverse = np.unique(values, return_inverse=True)
+        codes = np.array([cls.code(str(v), add=add) for v in uniq], dtype=np.int32)
+        return codes[inverse].reshape(values.shape)
+
+    @classmethod
+    def term_table(cls) -> np.ndarray:
+        """编码 → 中文（按编码下标取值）"""
+        cls._initialize()
+        if cls._term_table is None or len(cls._term_table) != len(cls._terms):
+            cls._term_table = np.array(cls._terms, dtype=str)
+        return cls._term_table
+
+    @classmethod
+    def id_table(cls) -> np.ndarray:
+        """编码 → ASCII 标识；可直接作 NamingService 的 token_tables"""
+        cls._initialize()
+        if cls._id_table is None or len(cls._id_table) != len(cls._ids):
+            cls._id_table = np.array(cls._ids, dtype=str)
+        return cls._id_table
+
+    @classmethod
+    def decode(cls, codes) -> np.ndarray:
+        return cls.term_table()[np.asarray(codes)]
+
+    @classmethod
+    def ascii_ids(cls, codes) -> np.ndarray:
+        return cls.id_table()[np.asarray(codes)]
+
+    @classmethod
+    def size(cls) -> int:
+        cls._initialize()
+        return len(cls._terms)
@@ -1,6 +1,16 @@
 from .data_loader import DataLoader
 from .form_inferencer import FormInferencer
 from .calculator_factory import CalculatorFactory
+from .survey_checker import SurveyChecker
+from .units import UnitSystem
+from .building_table import BuildingTable
+from .structure_validator import StructureValidator, StructureValidationError, validate_stage
+from .naming_service import NamingService, parse_name, parse_names
+from .scheduler import FormScheduler
+from .pipeline import Pipeline, PipelineConfig
+from .server import BuildingService
+from .memory_trace import MemoryTracer
+from .result_store import ResultStore, ResultReader
 # from calculators import *
 
 # from .components_calculator import FrameGeometryCalculator
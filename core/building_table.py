@@ -0,0 +1,116 @@
+# core/building_table.py
+"""
+BuildingTable：测绘表入库后的列式视图。
+
+- text     全部列的去空白字符串，(N, C)
+- numeric  尺寸列（units.DIMENSION_FIELDS）的浮点数组，已按 UnitSystem 换算、量化，空值为 nan
+- codes    类别列（CATEGORY_FIELDS）的术语编码（configs.Vocabulary），int32；
+           编码仅本进程有效，随 building_data 传出时用 ascii_id()
+- metadata 单位、比例、精度与来源文件
+
+换算与编码只在 from_raw() 中做一次（整块 (N, K) 乘法；每个不同类别值查一次术语表），
+DataLoader 的格式化器与整列读取都从这里取值。
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+from configs.vocabulary import Vocabulary
+
+from .units import DIMENSION_FIELDS, UnitSystem
+
+# 入库时编码为整数的类别列
+CATEGORY_FIELDS = ("建筑类别", "建筑子类", "建筑等级", "屋顶形式", "屋脊类型", "出廊")
+
+
+def parse_floats(cells: np.ndarray) -> np.ndarray:
+    """字符串数组 → 浮点数组；空串与无法解析者为 nan"""
+    cells = np.asarray(cells)
+    out = np.full(cells.shape, np.nan)
+    filled = cells != ""
+    try:
+        out[filled] = cells[filled].astype(np.float64)
+    except ValueError:
+        # 混有说明文字等非数值单元格：逐项转换
+        out[filled] = [_to_float(v) for v in cells[filled]]
+    return out
+
+
+def _to_float(val: str) -> float:
+    try:
+        return float(val)
+    except ValueError:
+        return np.nan
+
+
+@dataclass
+class BuildingTable:
+    headers: List[str]
+    text: np.ndarray
+    numeric: Dict[str, np.ndarray] = field(default_factory=dict)
+    codes: Dict[str, np.ndarray] = field(default_factory=dict)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_raw(
+        cls,
+        headers: Sequence[str],
+        rows: np.ndarray,
+        units: UnitSystem,
+        source: str = "",
+    ) -> "BuildingTable":
+        """rows：去掉表头与说明行后的 (N, C) 字符串数组"""
+        headers = list(headers)
+        text = np.char.strip(np.asarray(rows, dtype=str).reshape(-1, len(headers)))
+
+        fields = [f for f in DIMENSION_FIELDS if f in headers]
+        cols = [headers.index(f) for f in fields]
+        block = units.apply(parse_floats(text[:, cols]))          # (N, K)
+        numeric = {f: block[:, k] for k, f in enumerate(fields)}
+
+        categories = [f for f in CATEGORY_FIELDS if f in headers]
+        if categories:
+            block = Vocabulary.encode(text[:, [headers.index(f) for f in categories]])
+            codes = {f: block[:, k] for k, f in enumerate(categories)}
+        else:
+            codes = {}
+
+        metadata = {**units.metadata(), "source": source, "dimension_fields": fields}
+        return cls(headers, text, numeric, codes, metadata)
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    @property
+    def units(self) -> UnitSystem:
+        m = self.metadata
+        return UnitSystem(m["scale"], m["unit"], m["precision"])
+
+    def column(self, field_name: str, as_float: bool = False, as_code: bool = False) -> np.ndarray:
+        """整列；尺寸列 as_float 时返回已换算值，类别列 as_code 时返回术语编码"""
+        if as_code:
+            if field_name not in self.codes:
+                raise ValueError(f"非类别列：{field_name}")
+            return self.codes[field_name]
+        if as_float and field_name in self.numeric:
+            return self.numeric[field_name]
+        col = self.text[:, self.headers.index(field_name)]
+        return parse_floats(col) if as_float else col
+
+    def ascii_id(self, field_name: str, row: int) -> str:
+        """类别单元格的 ASCII 标识；列不存在时为 "" """
+        if field_name not in self.codes:
+            return ""
+        return str(Vocabulary.id_table()[self.codes[field_name][row]])
+
+    def value(self, field_name: str, row: int, as_float: bool = False) -> Any:
+        """单元格；列不存在时返回 "" / nan"""
+        if as_float and field_name in self.numeric:
+            return float(self.numeric[field_name][row])
+        if field_name not in self.headers:
+            return np.nan if as_float else ""
+        val = str(self.text[row, self.headers.index(field_name)])
+        if as_float:
+            return _to_float(val) if val else np.nan
+        return val
@@ -1,23 +1,31 @@
 import importlib
-from configs import ConfigManager
+from configs import ConfigManager, Vocabulary
 
 
 class CalculatorFactory:
 
+    # 屋顶形式 ASCII 标识 → 计算器类（导入一次）
+    _classes = {}
+
+    @classmethod
+    def resolve_class(cls, roof_form):
+        """屋顶形式（ASCII 标识、术语编码或中文术语）→ 计算器类；类映射以 ASCII 标识为键"""
+        roof_id = Vocabulary.ascii_id(roof_form, add=True)
+        if roof_id not in cls._classes:
+            class_path = ConfigManager.get_class_mapping(roof_id)
+            module, classname = class_path.rsplit(".", 1)
+            cls._classes[roof_id] = getattr(importlib.import_module(module), classname)
+        return cls._classes[roof_id]
+
     @classmethod
     def create_calculator(cls, building_data: dict):
         category = building_data["category_info"]
-        roof_form = category["roof_forms"]
-        form_name = category["form_name"]
-
-        # 1. 查类
-        class_path = ConfigManager.get_class_mapping(roof_form)
 
-        module, classname = class_path.rsplit(".", 1)
-        CalculatorClass = getattr(importlib.import_module(module), classname)
+        # 1. 查类（入库时的 ids；手工构造的数据按术语现查）
+        CalculatorClass = cls.resolve_class(Vocabulary.category_id(category, "roof_forms"))
 
-        # 2. 查规则
-        form_rule = ConfigManager.get_building_rules(form_name)
+        # 2. 查规则（形态规则仍以中文形态名为键）
+        form_rule = ConfigManager.get_building_rules(Vocabulary.term(category["form_name"], add=True))
 
         # 3. 实例化
         return CalculatorClass(building_data, form_rule)
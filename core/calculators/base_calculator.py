@@ -1,10 +1,20 @@
 # calculators/base_calculator.py
 from abc import ABC, abstractmethod
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Sequence
+
+import numpy as np
+
+from .structural_system.frame_member_calculator import build_frame_members
+from .structural_system.platform_calculator import build_platform_batch, column_lines
+from .structural_system.roof_frame_calculator import RoofFrameCalculator
 
 logger = logging.getLogger(__name__)
 
+# 取值来源
+SURVEYED = "surveyed"
+RULE = "rule"
+
 
 class BaseCalculator(ABC):
     """
@@ -27,10 +37,20 @@ class BaseCalculator(ABC):
         self.dim = self.data["dimension_info"]
         self.main_bay = self.dim["bay_widths"][0]
 
+        # 测绘值已在入库时换算；规则中的绝对尺寸（柱径基准、斗口）按同一比例换算
+        self.length_scale = float(self.data.get("unit_info", {}).get("scale", 1.0))
+
+        # 可选空间索引（geometry.SpatialIndex）：_pack 时登记本栋全部构件
+        self.spatial_index = None
+
         # 计算结果
         self.result = {
             "grid": None,
             "heights": None,
+            "roof": None,
+            "roof_frame": None,
+            "frame_members": None,
+            "platform": None,
         }
 
     # -------------------------------------------------------
@@ -42,9 +62,12 @@ class BaseCalculator(ABC):
         bay_widths = self.dim["bay_widths"]
         depth_total = float(self.dim["depth_total"])
 
+        # bay_widths 为 明间 → 尽间 的单侧数据，左右对称展开为全部开间
+        all_bays = list(bay_widths[::-1]) + list(bay_widths[1:])
+
         # 纵向坐标
         x_coords = [0]
-        for w in bay_widths:
+        for w in all_bays:
             x_coords.append(x_coords[-1] + float(w))
 
         grid = {
@@ -56,6 +79,7 @@ class BaseCalculator(ABC):
         }
 
         logger.debug(f"[Grid] num_bays={num_bays}, x_coords={x_coords}")
+        self.result["grid"] = grid
         return grid
 
     # -------------------------------------------------------
@@ -76,33 +100,69 @@ class BaseCalculator(ABC):
     # -------------------------------------------------------
     # 通用方法：举架（柱高 / 梁长 / 构件比例）
     # -------------------------------------------------------
-    def calculate_frame_system(self) -> Dict[str, float]:
+    def rule_length(self, key: str, default: Optional[float] = None) -> Optional[float]:
+        """规则中的绝对长度（测绘单位）→ 模型长度"""
+        value = self.rule.get(key, default)
+        return None if value is None else value * self.length_scale
+
+    def calculate_frame_system(self) -> Dict[str, Any]:
         """
         基于 form_rule 的比例系数计算主要构件高度。
         典型参数：
             - pillar_diameter_base
             - pillar_height_ratio
             - beam_length_ratio
+        标注柱径 / 标注檐柱高存在时覆盖规则值，provenance 记录每项来源
+        （SURVEYED / RULE）。
         """
         rule = self.rule
 
-        d = rule.get("pillar_diameter_base", 0.45)
         h_ratio = rule.get("pillar_height_ratio", 8.0)
         beam_ratio = rule.get("beam_length_ratio", 1.2)
 
-        pillar_height = d * h_ratio
+        d = self.surveyed("pillar_diameter")
+        d_source = SURVEYED if d is not None else RULE
+        if d is None:
+            d = self.rule_length("pillar_diameter_base", 0.45)
+
+        pillar_height = self.surveyed("eave_pillar_height")
+        h_source = SURVEYED if pillar_height is not None else RULE
+        if pillar_height is None:
+            pillar_height = d * h_ratio
+
         beam_length = d * beam_ratio
 
         logger.debug(
-            f"[Frame] d={d}, pillar_height={pillar_height}, beam_length={beam_length}"
+            f"[Frame] d={d} ({d_source}), pillar_height={pillar_height} ({h_source}), "
+            f"beam_length={beam_length}"
         )
 
         return {
             "pillar_diameter": d,
             "pillar_height": pillar_height,
             "beam_length": beam_length,
+            "provenance": {"pillar_diameter": d_source, "pillar_height": h_source},
         }
 
+    def column_y(self) -> np.ndarray:
+        """进深方向柱轴线（前后檐柱，出廊者加廊步金柱）"""
+        return column_lines(
+            float(self.dim["depth_total"]), float(self.dim["eave_step"]),
+            self.data.get("category_info", {}).get("corridor", ""),
+        )
+
+    def calculate_frame_members(self) -> Dict[str, Any]:
+        """柱、枋、梁实例数组：落于 calculate_grid() 柱网，尺寸取 calculate_frame_system()"""
+        grid = self.result["grid"] or self.calculate_grid()
+        frame = self.calculate_frame_system()
+        members = build_frame_members(
+            grid["x_coords"], self.column_y(), frame["pillar_height"], frame["pillar_diameter"],
+            self.rule.get("beam_diameter_ratio", 1.0),
+        )
+        logger.debug(f"[Frame] pillars={len(members['pillars'])}, beams={len(members['beams'])}")
+        self.result["frame_members"] = members
+        return members
+
     # -------------------------------------------------------
     # 通用方法：屋面坡度与典型构造
     # -------------------------------------------------------
@@ -120,6 +180,114 @@ class BaseCalculator(ABC):
 
         return {"slope_angle": slope_angle, "ridge_height": ridge_height}
 
+    # -------------------------------------------------------
+    # 通用方法：屋面核心参数（供 roof_forms.slope_kernel 使用）
+    # -------------------------------------------------------
+    def roof_params(self) -> Dict[str, float]:
+        """
+        width / depth  ：两山、前后檐柱轴线间距
+        eave_z         ：檐檩标高，取檐柱高
+        overhang       ：上出，默认檐柱高 × 3/10（清式小式通则）
+        """
+        grid = self.result["grid"] or self.calculate_grid()
+        frame = self.calculate_frame_system()
+        eave_z = frame["pillar_height"]
+
+        return {
+            "width": float(grid["x_coords"][-1]),
+            "depth": grid["depth_total"],
+            "eave_step": float(self.dim["eave_step"]),
+            "eave_z": eave_z,
+            "overhang": self.eave_overhang(eave_z),
+            "num_bays": grid["num_bays"],
+            "pillar_diameter": frame["pillar_diameter"],
+        }
+
+    def surveyed(self, key: str) -> Optional[float]:
+        """dimension_info 中的标注值；缺测（nan / 缺字段）返回 None"""
+        value = self.dim.get(key)
+        if value is None:
+            return None
+        value = float(value)
+        return None if np.isnan(value) else value
+
+    def eave_overhang(self, eave_z: float) -> float:
+        """上出：优先标注上出，否则檐柱高 × eave_overhang_ratio"""
+        value = self.surveyed("eave_overhang")
+        return value if value is not None else eave_z * self.rule.get("eave_overhang_ratio", 0.3)
+
+    # -------------------------------------------------------
+    # 通用方法：台明（台基、踏跺、柱顶石）
+    # -------------------------------------------------------
+    def platform_params(self) -> Dict[str, Any]:
+        """
+        height   ：标注台明高，否则檐柱高 × platform_height_ratio（默认 1/5）
+        overhang ：标注下出，否则上出 × platform_overhang_ratio（默认 4/5，留出回水）
+        """
+        grid = self.result["grid"] or self.calculate_grid()
+        frame = self.calculate_frame_system()
+        eave_z = frame["pillar_height"]
+
+        height = self.surveyed("platform_height")
+        if height is None:
+            height = eave_z * self.rule.get("platform_height_ratio", 0.2)
+        overhang = self.surveyed("platform_overhang")
+        if overhang is None:
+            overhang = self.eave_overhang(eave_z) * self.rule.get("platform_overhang_ratio", 0.8)
+
+        return {
+            "x_coords": np.asarray(grid["x_coords"], dtype=np.float64),
+            "y_coords": self.column_y(),
+            "height": height,
+            "overhang": overhang,
+            "pillar_diameter": frame["pillar_diameter"],
+            "main_bay": grid["main_bay"],
+            "rule": self.rule,
+        }
+
+    @classmethod
+    def calculate_platform_batch(cls, calcs: Sequence["BaseCalculator"]) -> List[dict]:
+        """多栋台明一次生成，写回各自 result["platform"]"""
+        platforms = build_platform_batch([c.platform_params() for c in calcs])
+        for c, platform in zip(calcs, platforms):
+            c.result["platform"] = platform
+        return platforms
+
+    def calculate_platform(self) -> dict:
+        return self.calculate_platform_batch([self])[0]
+
+    @property
+    def num_lin(self) -> int:
+        return int(self.dim.get("num_lin") or self.rule["purlin_count"])
+
+    @property
+    def lod(self):
+        return self.data.get("precision_info", {}).get("pricision", "")
+
+    # -------------------------------------------------------
+    # 通用方法：檩、椽布置（实例数组）
+    # -------------------------------------------------------
+    def calculate_roof_frame(self, hipped: bool = False, grid: Dict[str, Any] = None,
+                             side_segments: Optional[int] = 0, apex: bool = False) -> Dict[str, Any]:
+        """
+        在 calculate_grid() 与 calculate_roof() 的檩位之上排布檩、椽。
+        hipped：有翼角的屋面，檐步椽子在翼角范围内让位
+        grid  ：默认为本建筑柱网；屋面不落在外圈柱上时（重檐上檐）由子类传入
+        side_segments / apex：屋面轮廓，与 slope_kernel.build_roof_batch 相同
+        """
+        grid = grid or self.result["grid"] or self.calculate_grid()
+        roof = self.result["roof"] or self.calculate_roof()
+
+        frame = RoofFrameCalculator(self.data, self.rule).calculate(
+            grid, roof, self.roof_params(), hipped=hipped, side_segments=side_segments, apex=apex
+        )
+        logger.debug(
+            f"[RoofFrame] purlins={len(frame['purlins'])}, "
+            f"rafters={len(frame['rafters'])}, flying={len(frame['flying_rafters'])}"
+        )
+        self.result["roof_frame"] = frame
+        return frame
+
     # -------------------------------------------------------
     # 屋顶计算（核心差异点）
     # -------------------------------------------------------
@@ -158,7 +326,10 @@ class BaseCalculator(ABC):
     def _pack(self, **kwargs):
         """
         统一的返回格式方法，不同 Calculator 用它来返回结果。
+        设有 spatial_index 时，结果中的构件随即登记（所属为建筑编号）。
         """
+        if self.spatial_index is not None:
+            self.spatial_index.add_components(kwargs, owner=self.data["basic_info"].get("building_id", ""))
         return {
             "basic_info": self.data["basic_info"],
             "category_info": self.data["category_info"],
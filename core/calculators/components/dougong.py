@@ -0,0 +1,207 @@
+# core/calculators/components/dougong.py
+"""
+斗拱（斗口制）构件库：纯 NumPy，不创建 bpy 对象。
+
+- build_bracket()       每种科（平身科 / 柱头科 / 角科）按踩数只生成一次，
+                        以斗口为单位长度（斗口 = 1），结果为合并后的 MeshData
+                        并缓存，顶点数组只读；缓存至多 科 × 踩数 份
+- dougong_placements()  由柱网沿檐口排布全部攒位，输出 (N, 4, 4) 变换矩阵，
+                        斗口作为变换的均匀缩放，重复的斗拱只需一个变换
+
+攒的局部坐标：原点为正心（柱头 / 平板枋顶面中心），+y 指向檐外，z 向上。
+尺寸按清式斗口制（单位：斗口）：坐斗 3 × 3 × 2，正心瓜栱 6.2，正心万栱 9.2，
+单才瓜栱 6.2，单才万栱 9.2，厢栱 7.2，每踩出一拽架 3 斗口，攒当 11 斗口。
+"""
+from functools import lru_cache
+from typing import Dict, Sequence
+
+import numpy as np
+
+from geometry.mesh import MeshData, box, instance_mesh
+from geometry.transforms import compose_transforms, rotation_z
+
+# 科 → 中文名（与 naming_rules.md 中 DOUG_..._TYPE_<科制> 一致）
+DOUGONG_TYPES = {"ping": "平身科", "zhutou": "柱头科", "jiao": "角科"}
+
+TIAO = 3.0              # 拽架
+SPACING = 11.0          # 攒当
+GUA_GONG, WAN_GONG, XIANG_GONG = 6.2, 9.2, 7.2
+ZHENGXIN_WIDTH = 1.24   # 正心栱 / 正心枋厚
+CAI_HEIGHT = 1.4        # 单才栱高
+LEVEL_HEIGHT = 2.0      # 翘、昂、耍头、撑头木各层高
+
+# 各边 / 各角外法向对应的绕 z 转角（局部 +y 转向檐外）
+SIDE_ANGLES = {"front": np.pi, "back": 0.0, "left": np.pi / 2.0, "right": -np.pi / 2.0}
+CORNER_ANGLES = {
+    "front_left": 3.0 * np.pi / 4.0, "front_right": -3.0 * np.pi / 4.0,
+    "back_left": np.pi / 4.0, "back_right": -np.pi / 4.0,
+}
+
+
+def cai_levels(cai: int) -> int:
+    """踩数 → 单侧出踩层数（三踩 1 层，五踩 2 层 …；一斗三升为 0）"""
+    cai = int(cai)
+    if cai < 1 or cai % 2 == 0:
+        raise ValueError(f"踩数应为奇数：{cai}")
+    return (cai - 1) // 2
+
+
+# ================================================================
+# 一、单攒几何（斗口单位的零件表）
+# ================================================================
+def _arm_parts(n: int, width: float, angle: float, length_scale: float = 1.0, with_gong: bool = True):
+    """
+    一个方向上的出踩：翘 / 昂逐层外伸，踩头置十八斗，上承瓜栱、万栱，
+    最外一踩承厢栱与挑檐枋。返回 [(x, y, z0, sx, sy, sz, angle), ...]
+    """
+    parts = []
+    for k in range(1, n + 1):
+        z = LEVEL_HEIGHT * k
+        reach = TIAO * k * length_scale
+        parts.append((0.0, 0.0, z, width, 2.0 * reach + 2.0, LEVEL_HEIGHT, angle))
+        if not with_gong:
+            continue
+        for y in (reach, -reach):
+            parts.append((0.0, y, z + LEVEL_HEIGHT, 1.8, 1.48, 1.0, angle))
+            if k < n:
+                parts.append((0.0, y, z + LEVEL_HEIGHT, GUA_GONG, 1.0, CAI_HEIGHT, angle))
+                parts.append((0.0, y, z + LEVEL_HEIGHT + CAI_HEIGHT, WAN_GONG, 1.0, CAI_HEIGHT, angle))
+            else:
+                parts.append((0.0, y, z + LEVEL_HEIGHT, XIANG_GONG, 1.0, CAI_HEIGHT, angle))
+                parts.append((0.0, y, z + LEVEL_HEIGHT + CAI_HEIGHT, SPACING, 1.0, LEVEL_HEIGHT, angle))
+
+    # 耍头（外伸较长）、撑头木
+    z = LEVEL_HEIGHT * (n + 1)
+    reach = TIAO * n * length_scale
+    parts.append((0.0, 1.5, z, width, 2.0 * reach + 5.0, LEVEL_HEIGHT, angle))
+    parts.append((0.0, 0.0, z + LEVEL_HEIGHT, width, 2.0 * reach + 3.0, LEVEL_HEIGHT, angle))
+    return parts
+
+
+def _zhengxin_parts(n: int, angle: float):
+    """正心：瓜栱、万栱，其上正心枋叠至撑头木顶"""
+    top = LEVEL_HEIGHT * (n + 3)
+    parts = [
+        (0.0, 0.0, LEVEL_HEIGHT, GUA_GONG, ZHENGXIN_WIDTH, LEVEL_HEIGHT, angle),
+        (0.0, 0.0, 2.0 * LEVEL_HEIGHT, WAN_GONG, ZHENGXIN_WIDTH, LEVEL_HEIGHT, angle),
+    ]
+    for z in np.arange(3.0 * LEVEL_HEIGHT, top, LEVEL_HEIGHT):
+        parts.append((0.0, 0.0, float(z), SPACING, 1.25, LEVEL_HEIGHT, angle))
+    return parts
+
+
+def bracket_parts(kind: str, cai: int) -> np.ndarray:
+    """(P, 7) 零件表：中心 x、y，底面 z，尺寸 sx、sy、sz，绕 z 转角（斗口单位）"""
+    n = cai_levels(cai)
+    if kind == "ping":
+        parts = [(0.0, 0.0, 0.0, 3.0, 3.0, 2.0, 0.0)]
+        parts += _zhengxin_parts(n, 0.0) + _arm_parts(n, 1.0, 0.0)
+    elif kind == "zhutou":
+        # 坐斗加宽至 4 斗口，翘、昂加宽至 2 斗口以承梁头
+        parts = [(0.0, 0.0, 0.0, 4.0, 3.0, 2.0, 0.0)]
+        parts += _zhengxin_parts(n, 0.0) + _arm_parts(n, 2.0, 0.0)
+    elif kind == "jiao":
+        # 两向正交出踩（搭交）+ 45° 斜翘 / 斜昂
+        parts = [(0.0, 0.0, 0.0, 3.0, 3.0, 2.0, 0.0)]
+        for a in (np.pi / 4.0, -np.pi / 4.0):
+            parts += _zhengxin_parts(n, a) + _arm_parts(n, 1.0, a)
+        parts += _arm_parts(n, 1.5, 0.0, length_scale=np.sqrt(2.0), with_gong=False)
+    else:
+        raise ValueError(f"未知斗拱类型：{kind}")
+    return np.asarray(parts, dtype=np.float64)
+
+
+@lru_cache(maxsize=len(DOUGONG_TYPES) * 8)
+def _bracket_cached(kind: str, cai: int) -> MeshData:
+    raw = bracket_parts(kind, cai)
+    parts, angles = raw[:, :6], raw[:, 6]
+
+    rot = rotation_z(angles)
+    centers = np.column_stack([parts[:, 0], parts[:, 1], parts[:, 2] + parts[:, 5] / 2.0])
+    locations = np.einsum("nij,nj->ni", rot, centers)
+    matrices = compose_transforms(locations, rot, parts[:, 3:6])
+
+    mesh = instance_mesh(box(), matrices, name=f"DOUG_{kind}_C{cai}")
+    mesh.metadata.update(kind=kind, cai=cai, parts=len(parts))
+    mesh.vertices.flags.writeable = False
+    mesh.faces.flags.writeable = False
+    return mesh
+
+
+def build_bracket(kind: str, cai: int = 5) -> MeshData:
+    """
+    一攒斗拱的合并网格（斗口单位），按（科, 踩数）缓存；实际斗口由
+    dougong_placements() 的变换缩放。返回的网格被所有同规格攒位共享，请勿原地修改。
+    """
+    return _bracket_cached(kind, int(cai))
+
+
+def clear_bracket_cache():
+    _bracket_cached.cache_clear()
+
+
+# ================================================================
+# 二、攒位
+# ================================================================
+def _intercolumn(axis: np.ndarray, pitch: float) -> np.ndarray:
+    """各间内平身科位置：每间 round(间宽 / 攒当) - 1 攒，等分"""
+    widths = np.diff(axis)
+    counts = np.maximum(np.round(widths / pitch).astype(int) - 1, 0)
+    bay = np.repeat(np.arange(len(widths)), counts)
+    k = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + 1
+    return axis[bay] + widths[bay] * k / (counts[bay] + 1)
+
+
+def dougong_placements(
+    x_coords,
+    y_coords,
+    z: float,
+    doukou: float,
+    sides: Sequence[str] = ("front", "back", "left", "right"),
+) -> Dict[str, np.ndarray]:
+    """
+    x_coords : 面阔方向柱轴线（前后檐）
+    y_coords : 进深方向柱轴线（两山），至少含前后檐柱 [0, D]
+    z        : 斗拱底面标高（平板枋顶）
+    doukou   : 斗口，作为每攒的均匀缩放（build_bracket 网格以斗口为单位）
+    sides    : 有斗拱的檐面；四面俱全时四角为角科，否则檐端为柱头科
+    返回 {科: (N, 4, 4)}
+    """
+    x = np.asarray(x_coords, dtype=np.float64)
+    y = np.asarray(y_coords, dtype=np.float64)
+    corners = all(s in sides for s in SIDE_ANGLES)
+    pitch = SPACING * doukou
+
+    loc = {kind: [] for kind in DOUGONG_TYPES}
+    ang = {kind: [] for kind in DOUGONG_TYPES}
+
+    for side in sides:
+        axis = x if side in ("front", "back") else y
+        fixed = {"front": y[0], "back": y[-1], "left": x[0], "right": x[-1]}[side]
+        columns = axis[1:-1] if corners else axis
+
+        for kind, along in (("zhutou", columns), ("ping", _intercolumn(axis, pitch))):
+            pts = np.empty((len(along), 3))
+            if side in ("front", "back"):
+                pts[:, 0], pts[:, 1] = along, fixed
+            else:
+                pts[:, 0], pts[:, 1] = fixed, along
+            pts[:, 2] = z
+            loc[kind].append(pts)
+            ang[kind].append(np.full(len(along), SIDE_ANGLES[side]))
+
+    if corners:
+        for name, angle in CORNER_ANGLES.items():
+            fb, lr = name.split("_")
+            loc["jiao"].append([[x[0] if lr == "left" else x[-1], y[0] if fb == "front" else y[-1], z]])
+            ang["jiao"].append([angle])
+
+    placements = {}
+    for kind in DOUGONG_TYPES:
+        if not loc[kind]:
+            placements[kind] = np.zeros((0, 4, 4))
+            continue
+        points = np.concatenate([np.asarray(p, dtype=np.float64).reshape(-1, 3) for p in loc[kind]])
+        angles = np.concatenate([np.asarray(a, dtype=np.float64) for a in ang[kind]])
+        placements[kind] = compose_transforms(points, rotation_z(angles), np.full(len(points), doukou))
+    return placements
@@ -0,0 +1,158 @@
+# core/calculators/roof_forms/corner_eave.py
+"""
+翼角（角梁 + 翼角椽 / 翘飞椽）计算（纯 NumPy，批量）。
+
+先在「标准角」局部坐标中一次算出全部建筑的角梁曲线与椽子，
+再以镜像矩阵展开到四个角，不对单根椽子做 Python 循环。
+
+标准角局部坐标（前左角）：
+    原点为角柱轴线交点，x 沿前檐向内，y 沿山面向内，z 为绝对标高
+    角梁沿 45° 对角线，由下金檩交点伸出至檐角
+椽数、出冲、起翘按清式通则（以椽径计），可由规则覆盖：
+    rafter_diameter_ratio  椽径 / 檐柱径，默认 1/3
+    corner_rise            起翘，默认 4 椽径
+    corner_extend          出冲，默认 3 椽径
+    flying_ratio           飞椽外露 / 上出，默认 1/3
+"""
+from typing import Dict, List
+
+import numpy as np
+
+from geometry.transforms import segment_transforms
+
+SQRT2 = np.sqrt(2.0)
+
+# 四角镜像：(x 是否镜像, y 是否镜像)，顺序 前左 / 前右 / 后左 / 后右
+CORNERS = (("front_left", False, False), ("front_right", True, False),
+           ("back_left", False, True), ("back_right", True, True))
+
+CORNER_BEAM_SAMPLES = 9
+
+
+def _corner_mirrors(width, depth) -> np.ndarray:
+    """(B, 4, 4, 4) 标准角 → 各角的镜像矩阵"""
+    b = len(width)
+    mats = np.zeros((b, len(CORNERS), 4, 4))
+    for c, (_, mirror_x, mirror_y) in enumerate(CORNERS):
+        mats[:, c, 0, 0] = -1.0 if mirror_x else 1.0
+        mats[:, c, 1, 1] = -1.0 if mirror_y else 1.0
+        mats[:, c, 2, 2] = 1.0
+        mats[:, c, 3, 3] = 1.0
+        mats[:, c, 0, 3] = width if mirror_x else 0.0
+        mats[:, c, 1, 3] = depth if mirror_y else 0.0
+    return mats
+
+
+def _fix_handedness(mirrors: np.ndarray, mats: np.ndarray) -> np.ndarray:
+    """
+    mirrors @ mats，单镜像会翻转手性（截面朝向反向），
+    对行列式为负的角再沿构件局部 Y 轴取反，保持截面为正确的右手系。
+    """
+    out = np.einsum("bcij,bcnjk->bcnik", mirrors, mats)
+    flip = np.linalg.det(mirrors[..., :3, :3]) < 0
+    out[flip, :, :3, 1] *= -1.0
+    return out
+
+
+def corner_params(params: Dict[str, np.ndarray], rule: dict) -> Dict[str, np.ndarray]:
+    """由柱径推出椽径、起翘、出冲、飞椽外露"""
+    rafter_d = params["pillar_diameter"] * rule.get("rafter_diameter_ratio", 1.0 / 3.0)
+    return {
+        "rafter_d": rafter_d,
+        "rise": rafter_d * rule.get("corner_rise", 4.0),
+        "extend": rafter_d * rule.get("corner_extend", 3.0),
+        "flying": params["overhang"] * rule.get("flying_ratio", 1.0 / 3.0),
+    }
+
+
+def build_corners_batch(params: Dict[str, np.ndarray], rule: dict = None) -> List[dict]:
+    """
+    params（均为 (B,)）：width, depth, eave_step, eave_z, overhang, pillar_diameter,
+                        slope（檐步举架，默认 0.5）
+    返回与输入等长的列表，每项：
+        corner_beam     (4, S, 3)     角梁中线曲线
+        rafters         (4, 2n, 4, 4) 翼角椽（前檐 n 根 + 山面 n 根）
+        flying_rafters  (4, 2n, 4, 4) 翘飞椽
+        rafter_count    n（单翼）
+    """
+    rule = rule or {}
+    width = np.asarray(params["width"], dtype=np.float64).reshape(-1)
+    depth = np.asarray(params["depth"], dtype=np.float64).reshape(-1)
+    step = np.asarray(params["eave_step"], dtype=np.float64).reshape(-1)
+    eave_z = np.asarray(params["eave_z"], dtype=np.float64).reshape(-1)
+    o = np.asarray(params["overhang"], dtype=np.float64).reshape(-1)
+    slope = np.asarray(params.get("slope", np.full(len(width), 0.5)), dtype=np.float64).reshape(-1)
+    b = len(width)
+
+    cp = {k: np.asarray(v, dtype=np.float64).reshape(-1) for k, v in corner_params(params, rule).items()}
+    rise, extend, flying, rafter_d = cp["rise"], cp["extend"], cp["flying"], cp["rafter_d"]
+
+    eave_edge_z = eave_z - o * slope          # 檐口（未起翘）标高
+    jin_z = eave_z + step * slope             # 下金檩标高
+    zone = o + step                           # 翼角范围：角端 → 起翘点
+
+    # ---------------- 角梁 ----------------
+    # 后尾在下金檩交点 (step, step)，经檐檩交点 (0, 0)，前端出冲后至角端
+    t = np.linspace(0.0, 1.0, CORNER_BEAM_SAMPLES)
+    d_tail = -step * SQRT2
+    d_tip = (o + extend) * SQRT2
+    d = d_tail[:, None] + (d_tip - d_tail)[:, None] * t               # 沿对角线，外为正
+    outer = np.clip(d / d_tip[:, None], 0.0, 1.0)
+    z_beam = eave_z[:, None] - d * slope[:, None] / SQRT2 + rise[:, None] * outer ** 2
+    beam_local = np.stack([-d / SQRT2, -d / SQRT2, z_beam, np.ones_like(d)], axis=-1)   # (B, S, 4)
+
+    # ---------------- 翼角椽 ----------------
+    # 椽档 = 椽径，间距 2 椽径；批次内补齐至最大根数并以掩码标记
+    counts = np.maximum(np.floor(zone / (2.0 * rafter_d)).astype(int), 1)
+    n_max = int(counts.max())
+    i = np.arange(1, n_max + 1)
+    valid = i[None, :] <= counts[:, None]                             # (B, n)
+
+    alpha = np.where(valid, i[None, :] / (counts[:, None] + 1.0), 1.0)  # 0 起翘点 → 1 角端
+    w = zone[:, None] * (1.0 - alpha)                                  # 椽头距角柱轴线
+    theta = np.radians(45.0) * alpha                                   # 椽子由正交逐渐转为 45°
+
+    out = o[:, None] + extend[:, None] * alpha ** 2
+    head = np.stack([w, -out, eave_edge_z[:, None] + rise[:, None] * alpha ** 2], axis=-1)
+    length = (out + step[:, None]) / np.cos(theta)
+    tail = np.stack([
+        w + length * np.sin(theta),
+        -out + length * np.cos(theta),
+        np.broadcast_to(jin_z[:, None], w.shape),
+    ], axis=-1)
+
+    # 翘飞椽：接椽头继续外挑，起翘更甚
+    fly_dir = np.stack([-np.sin(theta), -np.cos(theta)], axis=-1)
+    fly_len = flying[:, None] * (1.0 + alpha)
+    fly_head = head.copy()
+    fly_head[..., :2] += fly_dir * fly_len[..., None]
+    fly_head[..., 2] += rise[:, None] * alpha ** 2 * 0.5 + fly_len * slope[:, None] * 0.5
+
+    # 前檐一翼 + 沿对角线对称的山面一翼
+    def both_wings(p):
+        return np.concatenate([p, p[..., [1, 0, 2]]], axis=1)          # (B, 2n, 3)
+
+    rafters = segment_transforms(both_wings(tail).reshape(-1, 3), both_wings(head).reshape(-1, 3))
+    flying_rafters = segment_transforms(both_wings(head).reshape(-1, 3), both_wings(fly_head).reshape(-1, 3))
+    rafters = rafters.reshape(b, 1, 2 * n_max, 4, 4)
+    flying_rafters = flying_rafters.reshape(b, 1, 2 * n_max, 4, 4)
+
+    # ---------------- 展开到四角 ----------------
+    mirrors = _corner_mirrors(width, depth)
+    rafters = _fix_handedness(mirrors, np.repeat(rafters, len(CORNERS), axis=1))
+    flying_rafters = _fix_handedness(mirrors, np.repeat(flying_rafters, len(CORNERS), axis=1))
+    beams = np.einsum("bcij,bsj->bcsi", mirrors, beam_local)[..., :3]
+
+    mask = np.concatenate([valid, valid], axis=1)                      # (B, 2n)
+    corners = []
+    for k in range(b):
+        keep = mask[k]
+        corners.append({
+            "corner_names": [name for name, _, _ in CORNERS],
+            "corner_beam": beams[k],
+            "rafters": rafters[k][:, keep],
+            "flying_rafters": flying_rafters[k][:, keep],
+            "rafter_count": int(counts[k]),
+            "rafter_diameter": float(rafter_d[k]),
+        })
+    return corners
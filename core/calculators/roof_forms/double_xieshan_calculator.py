@@ -0,0 +1,117 @@
+# double_xieshan_calculator.py
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from geometry.mesh import MeshData
+from ..base_calculator import BaseCalculator
+from .corner_eave import build_corners_batch
+from .slope_kernel import build_skirt_batch
+from .slope_roof_calculator import _group_indices, stack_params
+from .xieshan_calculator import XieshanCalculator
+
+
+class DoubleXieshanCalculator(XieshanCalculator):
+    """
+    重檐歇山屋顶的计算器。
+    - 下檐：外圈檐柱上一圈腰檐（一步架），四角翼角
+    - 上檐：退进一步架（廊步），落于金柱上的歇山顶，檩数 = 总檩数 - 2
+    上檐檐檩标高 = 檐柱高 + 腰檐举高 + 围脊 / 承椽枋高度（默认 0.3 檐柱高，
+    规则 double_eave_gap_ratio 可覆盖）。
+    """
+
+    ROOF_TYPE = "重檐歇山"
+
+    LOWER_EAVE_SLOPE = 0.5
+
+    # -------------------------------------------------------
+    # 参数：roof_params() 为上檐，lower_roof_params() 为下檐
+    # -------------------------------------------------------
+    @property
+    def num_lin(self) -> int:
+        """上檐檩数 = 总檩数 - 2，至少 3 檩"""
+        total = super().num_lin
+        if total - 2 < 3:
+            raise ValueError(f"重檐歇山上檐檩数不足：总檩数 {total} - 2 < 3，至少需 5 檩")
+        return total - 2
+
+    def lower_roof_params(self) -> Dict[str, float]:
+        params = BaseCalculator.roof_params(self)
+        params["slope"] = self.rule.get("lower_eave_slope", self.LOWER_EAVE_SLOPE)
+        return params
+
+    def roof_params(self) -> Dict[str, float]:
+        lower = self.lower_roof_params()
+        step = lower["eave_step"]
+        gap = lower["eave_z"] * self.rule.get("double_eave_gap_ratio", 0.3)
+
+        params = super().roof_params()
+        params.update(
+            width=lower["width"] - 2.0 * step,
+            depth=lower["depth"] - 2.0 * step,
+            eave_z=lower["eave_z"] + step * lower["slope"] + gap,
+            num_bays=max(lower["num_bays"] - 2, 1),
+        )
+        return params
+
+    def upper_offset(self) -> np.ndarray:
+        step = float(self.dim["eave_step"])
+        return np.array([step, step, 0.0])
+
+    # -------------------------------------------------------
+    # 批量核心
+    # -------------------------------------------------------
+    @classmethod
+    def calculate_roof_batch(cls, calcs: Sequence["DoubleXieshanCalculator"]) -> List[dict]:
+        """上檐走歇山核心后平移到金柱轴线；下檐腰檐按细分数分组批量生成"""
+        super().calculate_roof_batch(calcs)
+        for c in calcs:
+            roof, offset = c.result["roof"], c.upper_offset()
+            roof["purlin_y"] = roof["purlin_y"] + offset[1]
+            roof["meshes"] = {
+                name: MeshData(mesh.vertices + offset, mesh.faces, name=mesh.name)
+                for name, mesh in roof["meshes"].items()
+            }
+
+        for samples, idx in _group_indices([c.samples for c in calcs]).items():
+            params = stack_params([calcs[i].lower_roof_params() for i in idx])
+            skirts = build_skirt_batch(params, samples, slope=float(params["slope"][0]))
+            for i, skirt in zip(idx, skirts):
+                calcs[i].result["lower_roof"] = skirt
+        return [c.result["roof"] for c in calcs]
+
+    @classmethod
+    def calculate_corners_batch(cls, calcs: Sequence["DoubleXieshanCalculator"]) -> List[dict]:
+        """上、下檐各一组翼角"""
+        super().calculate_corners_batch(calcs)
+        hipped = [c for c in calcs if c.hipped]
+        for c in hipped:
+            offset = c.upper_offset()
+            corner = c.result["corners"]
+            corner["corner_beam"] = corner["corner_beam"] + offset
+            for key in ("rafters", "flying_rafters"):
+                corner[key] = corner[key].copy()
+                corner[key][..., :3, 3] += offset
+
+        groups = _group_indices([c.data["category_info"]["form_name"] for c in hipped])
+        for idx in groups.values():
+            params = stack_params([hipped[i].lower_roof_params() for i in idx])
+            lower = build_corners_batch(params, hipped[idx[0]].rule)
+            for i, corner in zip(idx, lower):
+                hipped[i].result["lower_corners"] = corner
+        return [c.result.get("corners") for c in calcs]
+
+    def calculate_roof_frame(self, hipped: bool = False, grid=None, **kwargs):
+        """上檐檩、椽落于金柱之间：柱网裁去前后左右各一步架"""
+        grid = self.result["grid"] or self.calculate_grid()
+        x = np.asarray(grid["x_coords"], dtype=np.float64)
+        step = float(self.dim["eave_step"])
+        inner = {"x_coords": np.unique(np.clip(x, x[0] + step, x[-1] - step))}
+        return super().calculate_roof_frame(hipped=hipped, grid=inner, **kwargs)
+
+    def _pack_all(self):
+        packed = super()._pack_all()
+        packed["results"]["lower_roof"] = self.result["lower_roof"]
+        if self.result.get("lower_corners") is not None:
+            packed["results"]["lower_corners"] = self.result["lower_corners"]
+        return packed
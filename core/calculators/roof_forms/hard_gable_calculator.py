@@ -0,0 +1,14 @@
+# hard_gable_calculator.py
+from .slope_roof_calculator import SlopeRoofCalculator
+
+
+class HardGableCalculator(SlopeRoofCalculator):
+    """
+    硬山屋顶的计算器：前后两坡，两山封于山墙之内，无翼角。
+    前后坡只越过山柱轴线至山墙外皮（默认 1 柱径，规则 gable_overhang_ratio 可覆盖）。
+    """
+
+    ROOF_TYPE = "硬山"
+
+    SIDE_SEGMENTS = 0
+    GABLE_OVERHANG_RATIO = 1.0
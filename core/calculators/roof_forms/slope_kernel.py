@@ -0,0 +1,380 @@
+# core/calculators/roof_forms/slope_kernel.py
+"""
+屋面坡面计算核心（纯 NumPy，批量）。
+
+所有函数的第一维 B 为建筑数，同一批次的檩数 num_lin 相同
+（FormInferencer 推出的形态名已含檩数，按形态分组后天然满足）。
+
+坐标约定：
+    x —— 面阔方向，0 ~ W 为两山柱轴线
+    y —— 进深方向，0 为前檐柱轴线，D 为后檐柱轴线
+    z —— 竖直向上，檐檩高度为 eave_z
+
+流程：
+    purlin_layout()   檩位（步架 + 举架）
+    front_profile()   前坡剖面（檐口 → 正脊中线）
+    sample_profile()  按 LOD 细分剖面
+    slope_grid()      由剖面与每行左右边界生成坡面网格
+    build_roof_batch() 组装前后坡、撒头（山面坡）与山花
+    build_skirt_batch() 重檐下檐（腰檐）一圈单步坡
+"""
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from geometry.mesh import MeshData, cylinder
+
+# 每坡步数 → 各步举架（檐步五举 … 脊步九举）
+JUJIA_RATIOS = {
+    1: (0.5,),
+    2: (0.5, 0.7),
+    3: (0.5, 0.7, 0.9),
+    4: (0.5, 0.6, 0.75, 0.9),
+    5: (0.5, 0.6, 0.7, 0.8, 0.9),
+}
+
+# 攒尖宝顶：半径、高度 / 柱径
+FINIAL_RADIUS_RATIO = 0.75
+FINIAL_HEIGHT_RATIO = 2.5
+
+# 模型精度（LOD） → 每步细分数
+LOD_SAMPLES = {0: 1, 1: 2, 2: 4, 3: 8}
+DEFAULT_LOD = 1
+
+
+def lod_samples(lod) -> int:
+    """模型精度字段可能为空、数字或 "LOD2" 之类字符串"""
+    digits = "".join(ch for ch in str(lod) if ch.isdigit())
+    level = int(digits) if digits else DEFAULT_LOD
+    return LOD_SAMPLES.get(level, LOD_SAMPLES[max(LOD_SAMPLES)])
+
+
+def jujia_ratios(n_steps: int, table: Optional[Dict] = None) -> np.ndarray:
+    """每坡 n_steps 步的举架系数；超出表格时由 0.5 线性增至 0.9"""
+    table = table or JUJIA_RATIOS
+    ratios = table.get(n_steps, table.get(str(n_steps)))
+    if ratios is None:
+        ratios = np.linspace(0.5, 0.9, n_steps)
+    return np.asarray(ratios, dtype=np.float64)
+
+
+def steps_per_side(num_lin: int) -> int:
+    """
+    偶数檩为卷棚（两根脊檩，中间为顶步）；奇数檩为尖山（一根脊檩）。
+    """
+    if num_lin < 3:
+        raise ValueError(f"檩数过少：{num_lin}")
+    return (num_lin - 1) // 2 if num_lin % 2 else (num_lin - 2) // 2
+
+
+# ================================================================
+# 一、檩位
+# ================================================================
+def purlin_layout(depth, eave_step, eave_z, num_lin: int, ratios: Optional[Sequence] = None):
+    """
+    批量计算全部檩的 (y, z)，前檐 → 后檐。
+
+    depth, eave_step, eave_z : (B,)
+    返回 y, z : (B, num_lin)
+
+    - 卷棚（偶数檩）：每步 = 檐步架，顶步 = 进深余量（即 ridge_distance）
+    - 尖山（奇数檩）：进深均分为 2n 步
+    """
+    depth = np.asarray(depth, dtype=np.float64).reshape(-1)
+    eave_step = np.asarray(eave_step, dtype=np.float64).reshape(-1)
+    eave_z = np.asarray(eave_z, dtype=np.float64).reshape(-1)
+    b = len(depth)
+
+    n = steps_per_side(num_lin)
+    ratios = jujia_ratios(n) if ratios is None else np.asarray(ratios, dtype=np.float64)
+
+    if num_lin % 2:
+        steps = np.repeat((depth / (2 * n))[:, None], n, axis=1)
+    else:
+        steps = np.repeat(eave_step[:, None], n, axis=1)
+
+    zeros = np.zeros((b, 1))
+    y_front = np.hstack([zeros, np.cumsum(steps, axis=1)])
+    z_front = eave_z[:, None] + np.hstack([zeros, np.cumsum(steps * ratios[None, :], axis=1)])
+
+    y_back = depth[:, None] - y_front[:, ::-1]
+    z_back = z_front[:, ::-1]
+    if num_lin % 2:
+        y_back, z_back = y_back[:, 1:], z_back[:, 1:]
+
+    return np.hstack([y_front, y_back]), np.hstack([z_front, z_back])
+
+
+# ================================================================
+# 二、剖面
+# ================================================================
+def front_profile(purlin_y, purlin_z, depth, overhang, num_lin: int, roll_arch: float = 0.25):
+    """
+    前坡剖面：s 为自檐口起向内的水平距离，止于进深中线。
+
+    - 檐口：自檐檩外挑 overhang（上出），沿檐步坡度下延
+    - 卷棚：顶步加一中点，拱高 = 顶步宽 × roll_arch（罗锅椽）
+    返回 s, z : (B, P)
+    """
+    depth = np.asarray(depth, dtype=np.float64).reshape(-1)
+    overhang = np.asarray(overhang, dtype=np.float64).reshape(-1)
+
+    n = steps_per_side(num_lin)
+    y_f = purlin_y[:, : n + 1]
+    z_f = purlin_z[:, : n + 1]
+
+    r0 = (z_f[:, 1] - z_f[:, 0]) / (y_f[:, 1] - y_f[:, 0])
+    s = [np.zeros((len(depth), 1)), overhang[:, None] + y_f]
+    z = [(z_f[:, 0] - overhang * r0)[:, None], z_f]
+
+    if num_lin % 2 == 0:
+        gap = depth - 2.0 * y_f[:, -1]
+        s.append((overhang + depth / 2.0)[:, None])
+        z.append((z_f[:, -1] + gap * roll_arch)[:, None])
+
+    return np.hstack(s), np.hstack(z)
+
+
+def sample_profile(s, z, samples: int):
+    """每段线性细分 samples 份（保留全部转折点，举架折线不被抹平）"""
+    t = np.arange(samples) / samples
+    ds, dz = np.diff(s, axis=1), np.diff(z, axis=1)
+
+    rows_s = (s[:, :-1, None] + ds[..., None] * t).reshape(len(s), -1)
+    rows_z = (z[:, :-1, None] + dz[..., None] * t).reshape(len(z), -1)
+    return np.hstack([rows_s, s[:, -1:]]), np.hstack([rows_z, z[:, -1:]])
+
+
+# ================================================================
+# 三、网格
+# ================================================================
+def grid_faces(rows: int, cols: int, flip: bool = False) -> np.ndarray:
+    """rows × cols 规则网格的三角面 (2 (rows-1)(cols-1), 3)"""
+    idx = np.arange(rows * cols).reshape(rows, cols)
+    a, b = idx[:-1, :-1].ravel(), idx[:-1, 1:].ravel()
+    c, d = idx[1:, 1:].ravel(), idx[1:, :-1].ravel()
+    faces = np.concatenate([np.stack([a, b, c], 1), np.stack([a, c, d], 1)])
+    return faces[:, ::-1].copy() if flip else faces
+
+
+def slope_grid(rows_s, rows_z, left, right, cols: int, origin, along, inward):
+    """
+    坡面网格顶点。
+
+    rows_s, rows_z : (B, R) 剖面行
+    left, right    : (B, R) 每行沿檐方向的起止坐标
+    origin         : (B, 3) 檐口基点（s = 0, 沿檐坐标 = 0）
+    along, inward  : (3,) 沿檐 / 向内单位向量
+    返回 (B, R * cols, 3)
+    """
+    u = np.linspace(0.0, 1.0, cols)
+    a = left[..., None] + (right - left)[..., None] * u                 # (B, R, C)
+    s = np.broadcast_to(rows_s[..., None], a.shape)
+    z = np.broadcast_to(rows_z[..., None], a.shape)
+
+    verts = (
+        origin[:, None, None, :]
+        + a[..., None] * np.asarray(along, dtype=np.float64)
+        + s[..., None] * np.asarray(inward, dtype=np.float64)
+    )
+    verts[..., 2] += z
+    return verts.reshape(len(rows_s), -1, 3)
+
+
+def gable_strip(top_y, top_z, base_z, x):
+    """
+    竖直山花面（x 为常量平面）：上沿为剖面折线，下沿为 base_z 水平线。
+    top_y, top_z : (B, K)；返回 verts (B, 2K, 3), faces
+    """
+    b, k = top_y.shape
+    base = np.broadcast_to(base_z[:, None], (b, k))
+    xs = np.broadcast_to(np.asarray(x, dtype=np.float64).reshape(-1, 1), (b, k))
+
+    verts = np.concatenate([
+        np.stack([xs, top_y, base], axis=-1),
+        np.stack([xs, top_y, top_z], axis=-1),
+    ], axis=1)
+    return verts, grid_faces(2, k)
+
+
+# ================================================================
+# 四、组装
+# ================================================================
+def build_roof_batch(
+    params: Dict[str, np.ndarray],
+    num_lin: int,
+    samples: int,
+    side_segments: Optional[int] = 0,
+    with_gables: bool = False,
+    apex: bool = False,
+) -> List[dict]:
+    """
+    批量生成整个屋面。
+
+    params（均为 (B,) 数组）：
+        width, depth, eave_step, eave_z, overhang（上出）, num_bays
+        gable_overhang（可选）：无山面坡时前后坡越过山面轴线的长度（悬山出梢）
+    side_segments：
+        0    —— 无山面坡（硬山 / 悬山）
+        k    —— 山面坡覆盖剖面前 k 段后收于山花（歇山：檐口 → 檐檩 → 下金檩，k = 2）
+        None —— 山面坡直达正脊（庑殿 / 攒尖）
+    with_gables：生成两山山花（歇山）
+    apex：四坡收于平面中心一点（攒尖，须 side_segments=None）。各坡按剖面
+          参数 t = s / s_脊 同步收进，同一 t 的四坡等高，斜脊为檐角 → 中心的
+          直线（方形平面为 45°）；params 含 pillar_diameter 时在顶点加宝顶。
+
+    返回与输入等长的列表，每项含檩位、剖面与 {名称: MeshData}。
+    """
+    width = np.asarray(params["width"], dtype=np.float64).reshape(-1)
+    depth = np.asarray(params["depth"], dtype=np.float64).reshape(-1)
+    overhang = np.asarray(params["overhang"], dtype=np.float64).reshape(-1)
+    b = len(width)
+    gable_overhang = np.asarray(params.get("gable_overhang", np.zeros(b)), dtype=np.float64).reshape(-1)
+
+    purlin_y, purlin_z = purlin_layout(depth, params["eave_step"], params["eave_z"], num_lin)
+    prof_s, prof_z = front_profile(purlin_y, purlin_z, depth, overhang, num_lin)
+    rows_s, rows_z = sample_profile(prof_s, prof_z, samples)
+    n_rows = rows_s.shape[1]
+    cols = samples * int(np.max(params["num_bays"])) + 1
+
+    o = overhang[:, None]
+    zeros = np.zeros(b)
+    if apex and side_segments is not None:
+        raise ValueError("攒尖须山面坡直达顶点（side_segments=None）")
+
+    # ---------- 前后坡每行的两端 ----------
+    if apex:
+        t = rows_s / rows_s[:, -1:]
+        left = -o + t * (width[:, None] / 2.0 + o)
+    elif side_segments == 0:
+        left = np.broadcast_to(-gable_overhang[:, None], rows_s.shape)
+        hip_end = zeros
+    else:
+        hip_end = prof_s[:, -1] if side_segments is None else prof_s[:, side_segments]
+        # 山面坡范围内按 45° 斜脊收进，之上止于山花
+        left = np.where(rows_s <= hip_end[:, None], rows_s - o, (hip_end - overhang)[:, None])
+        left = np.minimum(left, width[:, None] / 2.0)
+    right = width[:, None] - left
+
+    x_axis, y_axis = np.array([1.0, 0.0, 0.0]), np.array([0.0, 1.0, 0.0])
+    slope_faces = grid_faces(n_rows, cols)
+
+    grids = {
+        "front": (slope_grid(rows_s, rows_z, left, right, cols,
+                             np.stack([zeros, -overhang, zeros], 1), x_axis, y_axis), slope_faces),
+        "back": (slope_grid(rows_s, rows_z, left, right, cols,
+                            np.stack([zeros, depth + overhang, zeros], 1), x_axis, -y_axis),
+                 grid_faces(n_rows, cols, flip=True)),
+    }
+
+    # ---------- 山面坡（撒头） ----------
+    if side_segments != 0:
+        k = n_rows if side_segments is None else side_segments * samples + 1
+        side_s, side_z = rows_s[:, :k], rows_z[:, :k]
+        side_left = np.minimum(side_s - o, depth[:, None] / 2.0)
+        if apex:
+            # 山面坡水平进深为 W/2 + 上出，与前后坡同 t 同高
+            side_s = t * (width[:, None] / 2.0 + o)
+        side_right = depth[:, None] - side_left
+
+        grids["left_side"] = (
+            slope_grid(side_s, side_z, side_left, side_right, cols,
+                       np.stack([-overhang, zeros, zeros], 1), y_axis, x_axis),
+            grid_faces(k, cols, flip=True),
+        )
+        grids["right_side"] = (
+            slope_grid(side_s, side_z, side_left, side_right, cols,
+                       np.stack([width + overhang, zeros, zeros], 1), y_axis, -x_axis),
+            grid_faces(k, cols),
+        )
+
+        # ---------- 山花 ----------
+        if with_gables:
+            top_y = rows_s[:, k - 1:] - o
+            top_z = rows_z[:, k - 1:]
+            # 后半与前半镜像，去掉重复的中线点
+            top_y = np.hstack([top_y, depth[:, None] - top_y[:, -2::-1]])
+            top_z = np.hstack([top_z, top_z[:, -2::-1]])
+            base_z = rows_z[:, k - 1]
+            x_gable = hip_end - overhang
+
+            verts, faces = gable_strip(top_y, top_z, base_z, x_gable)
+            grids["left_gable"] = (verts, faces[:, ::-1].copy())
+            verts, faces = gable_strip(top_y, top_z, base_z, width - x_gable)
+            grids["right_gable"] = (verts, faces)
+
+    roofs = []
+    for i in range(b):
+        meshes = {name: MeshData(v[i], f, name=name) for name, (v, f) in grids.items()}
+        if apex and "pillar_diameter" in params:
+            meshes["finial"] = finial_mesh(
+                float(params["pillar_diameter"][i]), (width[i] / 2.0, depth[i] / 2.0, prof_z[i, -1])
+            )
+        roofs.append({
+            "purlin_y": purlin_y[i],
+            "purlin_z": purlin_z[i],
+            "profile_s": prof_s[i],
+            "profile_z": prof_z[i],
+            "eave_z": float(purlin_z[i, 0]),
+            "ridge_z": float(prof_z[i, -1]),
+            "meshes": meshes,
+        })
+    return roofs
+
+
+def finial_mesh(pillar_diameter: float, apex) -> MeshData:
+    """攒尖宝顶：立于顶点的短圆柱，尺寸按柱径比例"""
+    mesh = cylinder(
+        pillar_diameter * FINIAL_RADIUS_RATIO, pillar_diameter * FINIAL_HEIGHT_RATIO, name="finial"
+    )
+    return MeshData(mesh.vertices + np.asarray(apex, dtype=np.float64), mesh.faces, name="finial")
+
+
+def build_skirt_batch(params: Dict[str, np.ndarray], samples: int, slope: float = 0.5) -> List[dict]:
+    """
+    重檐下檐（腰檐）：四面各一步坡，外缘为檐口，内缘退进一步架止于上檐柱，
+    四角以 45° 斜脊相接。
+
+    params 同 build_roof_batch（width, depth, eave_step, eave_z, overhang, num_bays）
+    返回与输入等长的列表，每项含檐口 / 上缘标高与 {名称: MeshData}。
+    """
+    width = np.asarray(params["width"], dtype=np.float64).reshape(-1)
+    depth = np.asarray(params["depth"], dtype=np.float64).reshape(-1)
+    step = np.asarray(params["eave_step"], dtype=np.float64).reshape(-1)
+    eave_z = np.asarray(params["eave_z"], dtype=np.float64).reshape(-1)
+    overhang = np.asarray(params["overhang"], dtype=np.float64).reshape(-1)
+    b = len(width)
+
+    zeros = np.zeros(b)
+    prof_s = np.stack([zeros, overhang, overhang + step], axis=1)
+    prof_z = np.stack([eave_z - overhang * slope, eave_z, eave_z + step * slope], axis=1)
+    rows_s, rows_z = sample_profile(prof_s, prof_z, samples)
+    n_rows = rows_s.shape[1]
+    cols = samples * int(np.max(params["num_bays"])) + 1
+
+    inset = rows_s - overhang[:, None]
+    x_axis, y_axis = np.array([1.0, 0.0, 0.0]), np.array([0.0, 1.0, 0.0])
+
+    grids = {
+        "front": (slope_grid(rows_s, rows_z, inset, width[:, None] - inset, cols,
+                             np.stack([zeros, -overhang, zeros], 1), x_axis, y_axis),
+                  grid_faces(n_rows, cols)),
+        "back": (slope_grid(rows_s, rows_z, inset, width[:, None] - inset, cols,
+                            np.stack([zeros, depth + overhang, zeros], 1), x_axis, -y_axis),
+                 grid_faces(n_rows, cols, flip=True)),
+        "left_side": (slope_grid(rows_s, rows_z, inset, depth[:, None] - inset, cols,
+                                 np.stack([-overhang, zeros, zeros], 1), y_axis, x_axis),
+                      grid_faces(n_rows, cols, flip=True)),
+        "right_side": (slope_grid(rows_s, rows_z, inset, depth[:, None] - inset, cols,
+                                  np.stack([width + overhang, zeros, zeros], 1), y_axis, -x_axis),
+                       grid_faces(n_rows, cols)),
+    }
+
+    return [
+        {
+            "eave_z": float(prof_z[i, 0]),
+            "top_z": float(prof_z[i, -1]),
+            "meshes": {name: MeshData(v[i], f, name=name) for name, (v, f) in grids.items()},
+        }
+        for i in range(b)
+    ]
@@ -0,0 +1,232 @@
+# core/calculators/roof_forms/slope_roof_calculator.py
+"""
+坡屋面计算器公共基类：各屋面形态只声明构造差异（类属性），
+檩位、坡面、翼角全部走 slope_kernel / corner_eave 的批量核心。
+
+    形态        SIDE_SEGMENTS   WITH_GABLES   HAS_CORNERS   出梢
+    硬山              0             否            否          山墙外皮
+    悬山              0             否            否          4 椽径
+    歇山              2             是            是          —
+    庑殿            None            否            是          —
+    攒尖            None            否            是          —（APEX：四坡收于一点）
+
+批量：calculate_all_batch() 对同一计算器类的多栋建筑一次计算，
+内部再按（檩数, 细分数）分组调用核心；混合形态用模块级
+calculate_all_batch()，按类分组后还原输入顺序。
+"""
+from collections import defaultdict
+from typing import Dict, Hashable, List, Sequence
+
+import numpy as np
+
+from ..base_calculator import BaseCalculator
+from ..components.dougong import build_bracket, dougong_placements
+from .corner_eave import build_corners_batch
+from .slope_kernel import build_roof_batch, lod_samples, steps_per_side
+
+
+def _group_indices(keys: Sequence[Hashable]) -> Dict[Hashable, List[int]]:
+    groups = defaultdict(list)
+    for i, key in enumerate(keys):
+        groups[key].append(i)
+    return groups
+
+
+def stack_params(param_list: Sequence[Dict[str, float]]) -> Dict[str, np.ndarray]:
+    """[{name: 标量}, ...] → {name: (B,)}"""
+    return {k: np.array([p[k] for p in param_list], dtype=np.float64) for k in param_list[0]}
+
+
+class SlopeRoofCalculator(BaseCalculator):
+    """
+    子类通过类属性描述屋面：
+        ROOF_TYPE             返回结果中的屋面名称
+        SIDE_SEGMENTS         山面坡覆盖的剖面段数（见 slope_kernel.build_roof_batch）
+        WITH_GABLES           是否生成山花
+        HAS_CORNERS           是否有翼角（规则 has_corner_ridges = false 可关闭）
+        APEX                  四坡收于平面中心一点并加宝顶（攒尖）
+        GABLE_OVERHANG_RATIO  无山面坡时前后坡越过山柱轴线的长度 / 柱径
+    """
+
+    ROOF_TYPE = ""
+    SIDE_SEGMENTS = 0
+    WITH_GABLES = False
+    HAS_CORNERS = False
+    APEX = False
+    GABLE_OVERHANG_RATIO = 0.0
+
+    # -------------------------------------------------------
+    # 参数
+    # -------------------------------------------------------
+    def roof_params(self) -> Dict[str, float]:
+        params = super().roof_params()
+        ratio = self.rule.get("gable_overhang_ratio", self.GABLE_OVERHANG_RATIO)
+        params["gable_overhang"] = params["pillar_diameter"] * ratio if self.SIDE_SEGMENTS == 0 else 0.0
+        return params
+
+    @property
+    def hipped(self) -> bool:
+        return self.HAS_CORNERS and self.rule.get("has_corner_ridges", True)
+
+    @property
+    def samples(self) -> int:
+        return lod_samples(self.lod)
+
+    # -------------------------------------------------------
+    # 批量核心
+    # -------------------------------------------------------
+    @classmethod
+    def calculate_roof_batch(cls, calcs: Sequence["SlopeRoofCalculator"]) -> List[dict]:
+        """同类多栋屋面，按（檩数, 细分数）分组生成，写回各自 result["roof"]"""
+        groups = _group_indices([(c.num_lin, c.samples) for c in calcs])
+        for (num_lin, samples), idx in groups.items():
+            params = stack_params([calcs[i].roof_params() for i in idx])
+            roofs = build_roof_batch(
+                params,
+                num_lin,
+                samples,
+                side_segments=cls.SIDE_SEGMENTS,
+                with_gables=cls.WITH_GABLES,
+                apex=cls.APEX,
+            )
+            for i, roof in zip(idx, roofs):
+                calcs[i].result["roof"] = roof
+        return [c.result["roof"] for c in calcs]
+
+    @classmethod
+    def calculate_corners_batch(cls, calcs: Sequence["SlopeRoofCalculator"]) -> List[dict]:
+        """有翼角者按形态规则分组（椽径、起翘等比例随规则变化）"""
+        hipped = [c for c in calcs if c.hipped]
+        groups = _group_indices([c.data["category_info"]["form_name"] for c in hipped])
+        for idx in groups.values():
+            params = stack_params([hipped[i].roof_params() for i in idx])
+            corners = build_corners_batch(params, hipped[idx[0]].rule)
+            for i, corner in zip(idx, corners):
+                hipped[i].result["corners"] = corner
+        return [c.result.get("corners") for c in calcs]
+
+    @classmethod
+    def calculate_all_batch(cls, calcs: Sequence["SlopeRoofCalculator"]) -> List[dict]:
+        calcs = list(calcs)
+        for c in calcs:
+            c.calculate_grid()
+            c.calculate_heights()
+        cls.calculate_roof_batch(calcs)
+        cls.calculate_corners_batch(calcs)
+        cls.calculate_platform_batch(calcs)
+        return [c._pack_all() for c in calcs]
+
+    # -------------------------------------------------------
+    # 单栋入口（B = 1）
+    # -------------------------------------------------------
+    def calculate_all(self):
+        return self.calculate_all_batch([self])[0]
+
+    def calculate_roof(self):
+        """
+        檩位（步架 + 举架）→ 前后坡、撒头、山花网格。
+        单栋也走批量核心，B = 1。
+        """
+        return self.calculate_roof_batch([self])[0]
+
+    def calculate_corners(self):
+        """四角翼角：角梁曲线 + 翼角椽 / 翘飞椽变换数组"""
+        return self.calculate_corners_batch([self])[0]
+
+    def calculate_dougong(self) -> dict:
+        """
+        斗口制建筑的檐下斗拱：每种科一份缓存网格（斗口单位）+ 攒位变换数组（含斗口缩放）。
+        斗口默认取檐柱径 / 6，踩数默认五踩（规则 doukou / dougong_cai 可覆盖）；
+        有山面坡者四面出斗拱（四角角科），否则仅前后檐。
+        """
+        grid = self.result["grid"] or self.calculate_grid()
+        frame = self.calculate_frame_system()
+        doukou = self.rule_length("doukou") or frame["pillar_diameter"] / 6.0
+        cai = self.rule.get("dougong_cai", 5)
+        sides = ("front", "back") if self.SIDE_SEGMENTS == 0 else ("front", "back", "left", "right")
+
+        placements = dougong_placements(
+            grid["x_coords"], [0.0, grid["depth_total"]], frame["pillar_height"], doukou, sides
+        )
+        dougong = {
+            "doukou": doukou,
+            "cai": cai,
+            "meshes": {kind: build_bracket(kind, cai) for kind, m in placements.items() if len(m)},
+            "placements": placements,
+        }
+        self.result["dougong"] = dougong
+        return dougong
+
+    def _pack_all(self):
+        results = {
+            "grid": self.result["grid"],
+            "heights": self.result["heights"],
+            "frame": self.calculate_frame_system(),
+            "frame_members": self.calculate_frame_members(),
+            "roof": self.result["roof"],
+            "platform": self.result["platform"],
+        }
+        if self.result.get("corners") is not None:
+            results["corners"] = self.result["corners"]
+        results["roof_frame"] = self.calculate_roof_frame(
+            hipped=self.hipped, side_segments=self.SIDE_SEGMENTS, apex=self.APEX
+        )
+        if self.rule.get("has_dougong", False):
+            results["dougong"] = self.calculate_dougong()
+        return self._pack(**results)
+
+    # -----------------------------------------------------
+    # 核心入口
+    # -----------------------------------------------------
+    def calculate(self) -> dict:
+        """
+        主计算流程
+        """
+        dim = self.data["dimension_info"]
+        bay_widths = dim["bay_widths"]
+
+        roof = self.result["roof"] or self.calculate_roof()
+
+        return {
+            "roof_type": self.ROOF_TYPE,
+            "num_bays": dim["num_bays"],
+            "bay_widths": (
+                bay_widths.tolist() if hasattr(bay_widths, "tolist") else bay_widths
+            ),
+            "total_depth": float(dim["depth_total"]),
+            "eave_step": float(dim["eave_step"]),
+            "ridge_height": roof["ridge_z"] - roof["eave_z"],
+            "lin_count": self.num_lin,
+            "slope_info": self._compute_slope_info(roof),
+        }
+
+    # -----------------------------------------------------
+    # 局部计算模块
+    # -----------------------------------------------------
+    def _compute_slope_info(self, roof):
+        """
+        由檩位推出各步坡度（举架）、总举高与檐口高度
+        """
+        n = steps_per_side(len(roof["purlin_y"]))
+        y, z = roof["purlin_y"][: n + 1], roof["purlin_z"][: n + 1]
+        step_angles = np.degrees(np.arctan2(np.diff(z), np.diff(y)))
+
+        return {
+            "slope_angle": float(step_angles[0]),
+            "step_angles": step_angles.tolist(),
+            "jut": float(z[-1] - z[0]),
+            "eave_height": float(roof["profile_z"][0]),
+        }
+
+
+# ================================================================
+# 混合形态批量入口
+# ================================================================
+def calculate_all_batch(calcs: Sequence[SlopeRoofCalculator]) -> List[dict]:
+    """一片园林内不同形态的计算器：按类分组批量计算，结果按输入顺序返回"""
+    calcs = list(calcs)
+    out = [None] * len(calcs)
+    for cls, idx in _group_indices([type(c) for c in calcs]).items():
+        for i, packed in zip(idx, cls.calculate_all_batch([calcs[i] for i in idx])):
+            out[i] = packed
+    return out
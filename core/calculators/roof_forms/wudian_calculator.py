@@ -0,0 +1,13 @@
+# wudian_calculator.py
+from .slope_roof_calculator import SlopeRoofCalculator
+
+
+class WudianCalculator(SlopeRoofCalculator):
+    """
+    庑殿屋顶的计算器：四坡五脊，山面坡直达正脊，四角翼角。
+    """
+
+    ROOF_TYPE = "庑殿"
+
+    SIDE_SEGMENTS = None
+    HAS_CORNERS = True
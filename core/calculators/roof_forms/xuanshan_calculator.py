@@ -1,2 +1,14 @@
-class XuanshanCalculator:
-    print("XuanshanCalculator")
+# xuanshan_calculator.py
+from .slope_roof_calculator import SlopeRoofCalculator
+
+
+class XuanshanCalculator(SlopeRoofCalculator):
+    """
+    悬山屋顶的计算器：前后两坡，檩子挑出山面（出梢），无翼角。
+    出梢默认 4 椽径（= 4/3 柱径），规则 gable_overhang_ratio 可覆盖。
+    """
+
+    ROOF_TYPE = "悬山"
+
+    SIDE_SEGMENTS = 0
+    GABLE_OVERHANG_RATIO = 4.0 / 3.0
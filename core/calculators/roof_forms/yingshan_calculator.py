@@ -1,2 +1,5 @@
-class YingshanCalculator:
-    print("yingshan_calculator.py")
\ No newline at end of file
+# yingshan_calculator.py
+# 硬山（yingshan）旧模块名，保留以兼容既有引用
+from .hard_gable_calculator import HardGableCalculator
+
+YingshanCalculator = HardGableCalculator
@@ -0,0 +1,15 @@
+# zanji_calculator.py
+from .slope_roof_calculator import SlopeRoofCalculator
+
+
+class ZanjiCalculator(SlopeRoofCalculator):
+    """
+    攒尖屋顶的计算器：四坡由檐角沿斜脊收于平面中心一点，顶点立宝顶。
+    与庑殿的区别仅在 APEX —— 庑殿斜脊止于正脊两端，攒尖无正脊。
+    """
+
+    ROOF_TYPE = "攒尖"
+
+    SIDE_SEGMENTS = None
+    HAS_CORNERS = True
+    APEX = True
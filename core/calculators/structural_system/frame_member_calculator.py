@@ -0,0 +1,59 @@
+# calculators/structural/frame_member_calculator.py
+"""
+大木构架：柱、枋、梁（纯 NumPy），输出与檩、椽相同的 MemberArrays。
+
+- 柱：面阔轴线 × 进深轴线（前后檐柱，出廊者加廊步金柱），柱底 0 → 柱顶 柱高
+- 枋：每路进深轴线上逐间一根，面阔向，两端落于柱头
+- 梁：每缝面阔轴线上逐步一根，进深向，两端落于柱头
+枋、梁截面见方 柱径 × beam_diameter_ratio，顶面与柱顶平。
+"""
+import numpy as np
+
+from .roof_frame_calculator import MemberArrays
+
+PILLAR_KINDS = ("yan", "jin")       # 檐柱 / 金柱
+BEAM_KINDS = ("fang", "liang")      # 枋（面阔向） / 梁（进深向）
+
+
+def build_frame_members(x_coords, y_coords, pillar_height: float, pillar_diameter: float,
+                        beam_ratio: float = 1.0) -> dict:
+    """
+    x_coords : 面阔方向柱轴线
+    y_coords : 进深方向柱轴线（升序，首末为前后檐）
+    返回 {"pillars", "beams"}，各为 MemberArrays
+    """
+    x = np.asarray(x_coords, dtype=np.float64)
+    y = np.asarray(y_coords, dtype=np.float64)
+    nx, ny = len(x), len(y)
+
+    # 柱：(x, y) 网格展开，首末进深轴线为檐柱
+    px, py = np.repeat(x, ny), np.tile(y, nx)
+    eave = np.isin(py, y[[0, -1]])
+    pillars = MemberArrays.from_segments(
+        np.column_stack([px, py, np.zeros(nx * ny)]),
+        np.column_stack([px, py, np.full(nx * ny, pillar_height)]),
+        np.where(eave, PILLAR_KINDS.index("yan"), PILLAR_KINDS.index("jin")),
+        PILLAR_KINDS, pillar_diameter, round_section=True,
+    )
+
+    beam_d = pillar_diameter * beam_ratio
+    z = pillar_height - beam_d / 2.0
+
+    # 枋：每路 y 逐间；梁：每缝 x 逐步
+    fang_y, fang_bay = np.repeat(y, nx - 1), np.tile(np.arange(nx - 1), ny)
+    liang_x, liang_step = np.repeat(x, ny - 1), np.tile(np.arange(ny - 1), nx)
+    starts = np.concatenate([
+        np.column_stack([x[fang_bay], fang_y, np.full(len(fang_y), z)]),
+        np.column_stack([liang_x, y[liang_step], np.full(len(liang_x), z)]),
+    ])
+    ends = np.concatenate([
+        np.column_stack([x[fang_bay + 1], fang_y, np.full(len(fang_y), z)]),
+        np.column_stack([liang_x, y[liang_step + 1], np.full(len(liang_x), z)]),
+    ])
+    kinds = np.concatenate([
+        np.full(len(fang_y), BEAM_KINDS.index("fang")),
+        np.full(len(liang_x), BEAM_KINDS.index("liang")),
+    ])
+    beams = MemberArrays.from_segments(starts, ends, kinds, BEAM_KINDS, beam_d)
+
+    return {"pillars": pillars, "beams": beams}
@@ -0,0 +1,112 @@
+# calculators/structural/platform_calculator.py
+"""
+台明（台基）、踏跺、柱顶石（纯 NumPy，批量）。
+
+全部构件以单位立方体原型 + (N, 4, 4) 变换（含缩放）表示，
+即 geometry.mesh.InstanceBatch，可直接交给 BulkWriter / 导出器。
+
+- 台明：柱网外扩下出（台明出），高为台明高
+- 踏跺：前檐明间居中，宽 = 明间面阔；踏步高约半柱径，步深 = 2 × 踏步高
+- 柱顶石：每个柱位一块，见方 2 柱径，露明高 0.2 柱径（古镜）
+"""
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from geometry.mesh import InstanceBatch, box
+from geometry.transforms import compose_transforms
+
+STEP_RISER_RATIO = 0.5          # 踏步高 / 柱径（目标值，按台明高取整步数）
+STEP_TREAD_RATIO = 2.0          # 步深 / 踏步高
+BASE_STONE_SIZE_RATIO = 2.0     # 柱顶石见方 / 柱径
+BASE_STONE_HEIGHT_RATIO = 0.2   # 柱顶石露明高 / 柱径
+
+UNIT_BOX = box(name="platform_unit")
+
+
+def column_lines(depth: float, eave_step: float, corridor: str = "") -> np.ndarray:
+    """进深方向柱轴线：前后檐柱，出廊者加廊步金柱"""
+    lines = [0.0, depth]
+    if "前" in corridor:
+        lines.append(eave_step)
+    if "后" in corridor:
+        lines.append(depth - eave_step)
+    return np.unique(lines)
+
+
+def _boxes(mins: np.ndarray, maxs: np.ndarray) -> np.ndarray:
+    """轴对齐长方体（最小 / 最大角）→ 单位立方体的 (N, 4, 4) 变换"""
+    mins = np.asarray(mins, dtype=np.float64).reshape(-1, 3)
+    maxs = np.asarray(maxs, dtype=np.float64).reshape(-1, 3)
+    return compose_transforms((mins + maxs) / 2.0, scales=maxs - mins)
+
+
+def _split(matrices: np.ndarray, counts: np.ndarray) -> List[np.ndarray]:
+    return np.split(matrices, np.cumsum(counts)[:-1])
+
+
+def build_platform_batch(params: Sequence[Dict]) -> List[Dict[str, InstanceBatch]]:
+    """
+    params：每栋一项
+        x_coords, y_coords : 柱轴线
+        height             : 台明高
+        overhang           : 下出（台明边距檐柱中）
+        pillar_diameter, main_bay
+        rule（可选）        : 覆盖上方比例常量
+    返回与输入等长的列表，每项 {"plinth", "steps", "base_stones": InstanceBatch}
+    """
+    b = len(params)
+    x0 = np.array([p["x_coords"][0] for p in params], dtype=np.float64)
+    x1 = np.array([p["x_coords"][-1] for p in params], dtype=np.float64)
+    y0 = np.array([p["y_coords"][0] for p in params], dtype=np.float64)
+    y1 = np.array([p["y_coords"][-1] for p in params], dtype=np.float64)
+    h = np.array([p["height"] for p in params], dtype=np.float64)
+    o = np.array([p["overhang"] for p in params], dtype=np.float64)
+    d = np.array([p["pillar_diameter"] for p in params], dtype=np.float64)
+    bay = np.array([p["main_bay"] for p in params], dtype=np.float64)
+
+    def ratio(key, default):
+        return np.array([p.get("rule", {}).get(key, default) for p in params], dtype=np.float64)
+
+    zeros = np.zeros(b)
+
+    # ---------------- 台明 ----------------
+    plinth = _boxes(np.stack([x0 - o, y0 - o, zeros], 1), np.stack([x1 + o, y1 + o, h], 1))
+
+    # ---------------- 踏跺 ----------------
+    # n 级踏步高 h / n；台明之下共 n - 1 级实体台阶，第 j 级顶面 h - (j+1)·riser
+    n = np.maximum(np.round(h / (d * ratio("step_riser_ratio", STEP_RISER_RATIO))).astype(int), 1)
+    riser = h / n
+    tread = riser * ratio("step_tread_ratio", STEP_TREAD_RATIO)
+    counts = n - 1
+
+    owner = np.repeat(np.arange(b), counts)
+    j = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    cx = (x0 + x1)[owner] / 2.0
+    front = (y0 - o)[owner]
+    steps = _boxes(
+        np.stack([cx - bay[owner] / 2.0, front - (j + 1) * tread[owner], np.zeros(len(j))], 1),
+        np.stack([cx + bay[owner] / 2.0, front - j * tread[owner], h[owner] - (j + 1) * riser[owner]], 1),
+    )
+
+    # ---------------- 柱顶石 ----------------
+    cols = [np.stack(np.meshgrid(p["x_coords"], p["y_coords"], indexing="ij"), -1).reshape(-1, 2) for p in params]
+    n_cols = np.array([len(c) for c in cols])
+    xy = np.concatenate(cols) if cols else np.zeros((0, 2))
+    stone_owner = np.repeat(np.arange(b), n_cols)
+    half = (d * ratio("base_stone_size_ratio", BASE_STONE_SIZE_RATIO) / 2.0)[stone_owner]
+    top = (h + d * ratio("base_stone_height_ratio", BASE_STONE_HEIGHT_RATIO))[stone_owner]
+    stones = _boxes(
+        np.column_stack([xy - half[:, None], h[stone_owner]]),
+        np.column_stack([xy + half[:, None], top]),
+    )
+
+    out = []
+    for i, (s, c) in enumerate(zip(_split(steps, counts), _split(stones, n_cols))):
+        out.append({
+            "plinth": InstanceBatch("plinth", UNIT_BOX, plinth[i : i + 1], collection="platform"),
+            "steps": InstanceBatch("steps", UNIT_BOX, s, collection="platform"),
+            "base_stones": InstanceBatch("base_stones", UNIT_BOX, c, collection="platform"),
+            "top_z": float(h[i]),
+        })
+    return out
@@ -0,0 +1,363 @@
+# calculators/structural/roof_frame_calculator.py
+"""
+檩、椽布置：输出紧凑的实例数组（起点、方向、长度、编号、类型），
+配合 structure/frames/instancing 与 exporters 直接批量摆放。
+
+- 檩：每步一路，每间一根（檩以间为单位），长度 = 开间
+- 椽：按「椽径 + 椽档」间距（2 椽径）逐间排布、每间居中；
+      每步一段（檐椽含上出，花架椽、脑椽，卷棚顶步为罗锅椽），另加飞椽
+- 有翼角的屋面（歇山 / 庑殿）檐步椽子在翼角范围内让位给 corner_eave
+- 悬山 / 硬山两端檩、椽随出梢（params["gable_overhang"]）越过山柱轴线
+- 有山面坡者（歇山 / 庑殿 / 攒尖）檩、椽按该步屋面轮廓裁切（与
+  slope_kernel.build_roof_batch 的山面坡收进一致）：山面坡范围内的檩
+  四面交圈，山面坡另排沿 ±x 的椽；攒尖脊步收为一点，不出通长脊檩
+"""
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from geometry.transforms import segment_transforms
+from ..roof_forms.slope_kernel import steps_per_side
+
+EPS = 1e-6
+
+PURLIN_KINDS = ("yan", "jin", "ji")                         # 檐檩 / 金檩 / 脊檩
+RAFTER_KINDS = ("yan", "huajia", "nao", "luoguo", "fei")    # 檐椽 / 花架椽 / 脑椽 / 罗锅椽 / 飞椽
+
+
+@dataclass
+class MemberArrays:
+    """线状构件实例数组，N 根"""
+    positions: np.ndarray      # (N, 3) 起点
+    directions: np.ndarray     # (N, 3) 单位方向
+    lengths: np.ndarray        # (N,)
+    ids: np.ndarray            # (N,) 构件内序号
+    kinds: np.ndarray          # (N,) 类型编码，对应 kind_names
+    kind_names: Tuple[str, ...]
+    diameter: float = 0.0
+    round_section: bool = False     # 圆截面（柱）；否则方截面
+
+    @classmethod
+    def from_segments(cls, starts, ends, kinds, kind_names, diameter=0.0, round_section=False):
+        starts = np.asarray(starts, dtype=np.float64).reshape(-1, 3)
+        delta = np.asarray(ends, dtype=np.float64).reshape(-1, 3) - starts
+        lengths = np.linalg.norm(delta, axis=1)
+        directions = delta / np.where(lengths == 0.0, 1.0, lengths)[:, None]
+        return cls(starts, directions, lengths, np.arange(len(starts)),
+                   np.asarray(kinds, dtype=np.int8), kind_names, diameter, round_section)
+
+    def __len__(self):
+        return len(self.lengths)
+
+    @property
+    def ends(self) -> np.ndarray:
+        return self.positions + self.directions * self.lengths[:, None]
+
+    def transforms(self) -> np.ndarray:
+        """单位长度原型（沿局部 X）的 (N, 4, 4) 变换"""
+        return segment_transforms(self.positions, self.ends)
+
+
+# ================================================================
+# 屋面轮廓
+# ================================================================
+def roof_footprint(x0, x1, roof: dict, params: Dict[str, float],
+                   side_segments: Optional[int] = 0, apex: bool = False) -> dict:
+    """
+    屋面平面轮廓（纯标量 + 剖面，可随结果存取）。
+
+    x0, x1    : 两山柱轴线；前后檐柱轴线取 roof["purlin_y"] 首末
+    hip_scale : 山面坡收进 / 前后坡收进；攒尖为 (W/2 + 上出) / (D/2 + 上出)，否则 1
+    hip_y     : 山面坡止于前坡何处（相对前檐柱轴线）；庑殿 / 攒尖为 D/2
+    profile_y / profile_z : 前坡剖面（相对前檐柱轴线，檐口 → 进深中线）
+    """
+    py = np.asarray(roof["purlin_y"], dtype=np.float64)
+    overhang = float(params["overhang"])
+    width, depth = float(x1 - x0), float(py[-1] - py[0])
+    if side_segments is None:
+        hip_y = depth / 2.0
+    else:
+        hip_y = float(py[side_segments - 1] - py[0]) if side_segments > 0 else 0.0
+    hip_scale = (width / 2.0 + overhang) / (depth / 2.0 + overhang) if apex else 1.0
+    return {
+        "x0": float(x0), "x1": float(x1), "y0": float(py[0]), "y1": float(py[-1]),
+        "overhang": overhang,
+        "gable_overhang": float(params.get("gable_overhang", 0.0)),
+        "has_side": side_segments != 0,
+        "hip_scale": hip_scale,
+        "hip_y": hip_y,
+        "profile_y": np.asarray(roof["profile_s"], dtype=np.float64) - overhang,
+        "profile_z": np.asarray(roof["profile_z"], dtype=np.float64),
+    }
+
+
+def side_x(fp: dict, y):
+    """前坡位置 y（相对前檐柱轴线）同高处山面坡的水平位置（相对山柱轴线）"""
+    o = fp["overhang"]
+    return -o + (np.asarray(y, dtype=np.float64) + o) * fp["hip_scale"]
+
+
+def front_inset(fp: dict, y):
+    """前坡位置 y 处前后坡每行的起点（相对山柱轴线）"""
+    y = np.asarray(y, dtype=np.float64)
+    if not fp["has_side"]:
+        return np.full(y.shape, -fp["gable_overhang"])
+    return np.minimum(side_x(fp, np.minimum(y, fp["hip_y"])), (fp["x1"] - fp["x0"]) / 2.0)
+
+
+def front_reach(fp: dict, u):
+    """距较近山柱轴线 u 处前坡向上能到的位置（相对前檐柱轴线）；山面坡之外为 D/2"""
+    u = np.asarray(u, dtype=np.float64)
+    half = (fp["y1"] - fp["y0"]) / 2.0
+    if not fp["has_side"]:
+        return np.full(u.shape, half)
+    o = fp["overhang"]
+    reach = (u + o) / fp["hip_scale"] - o
+    return np.where(u >= side_x(fp, fp["hip_y"]) - EPS, half, np.minimum(reach, half))
+
+
+def roof_surface_z(fp: dict, x, y):
+    """
+    平面点 (x, y) 处屋面标高：前后坡与山面坡取低者（四坡屋面为各坡包络的下缘）。
+    歇山山花以内（山面坡之上）只有前后坡；檐口以外按檐口标高计。
+    """
+    x, y = np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+    prof_y, prof_z = fp["profile_y"], fp["profile_z"]
+    depth = fp["y1"] - fp["y0"]
+
+    yr = y - fp["y0"]
+    z = np.interp(np.minimum(yr, depth - yr), prof_y, prof_z)
+    if fp["has_side"]:
+        xr = x - fp["x0"]
+        u = np.minimum(xr, (fp["x1"] - fp["x0"]) - xr)
+        o = fp["overhang"]
+        ys = (u + o) / fp["hip_scale"] - o
+        z_side = np.interp(ys, prof_y, prof_z)
+        z = np.where(ys < fp["hip_y"] - EPS, np.minimum(z, z_side), z)
+    return z
+
+
+def surface_gaps(fp: dict, members: "MemberArrays") -> np.ndarray:
+    """
+    (N,) 构件两端高出屋面（檩中线所在剖面）的较大值，扣除一构件径
+    （椽压于檩上、飞椽压于檐椽上）；<= 0 为在屋面上或之下。
+    """
+    if len(members) == 0:
+        return np.zeros(0)
+    pts = np.concatenate([members.positions, members.ends])
+    gap = pts[:, 2] - members.diameter - roof_surface_z(fp, pts[:, 0], pts[:, 1])
+    return np.maximum(gap[: len(members)], gap[len(members):])
+
+
+class RoofFrameCalculator:
+    """
+    输入：
+        building_data / rule —— 与其它计算器一致
+    calculate() 参数由上游屋面计算器组织：
+        grid    —— BaseCalculator.calculate_grid()
+        roof    —— slope_kernel.build_roof_batch() 单栋结果（檩位）
+        params  —— BaseCalculator.roof_params()
+        side_segments / apex —— 与 build_roof_batch 相同，决定屋面轮廓
+    """
+
+    def __init__(self, building_data: dict, rule: dict):
+        self.data = building_data
+        self.rule = rule
+
+    # ---------------------------------------------------------
+    # 主入口
+    # ---------------------------------------------------------
+    def calculate(self, grid: dict, roof: dict, params: Dict[str, float], hipped: bool = False,
+                  side_segments: Optional[int] = 0, apex: bool = False):
+        x = np.array(grid["x_coords"], dtype=np.float64)
+        fp = roof_footprint(x[0], x[-1], roof, params, side_segments, apex)
+        gable_overhang = params.get("gable_overhang", 0.0)
+        x[0] -= gable_overhang
+        x[-1] += gable_overhang
+        py = np.asarray(roof["purlin_y"], dtype=np.float64)
+        pz = np.asarray(roof["purlin_z"], dtype=np.float64)
+        num_lin = len(py)
+
+        rafter_d = params["pillar_diameter"] * self.rule.get("rafter_diameter_ratio", 1.0 / 3.0)
+        corner_zone = params["overhang"] + params["eave_step"] if hipped else 0.0
+
+        return {
+            "purlins": self._purlins(x, py, pz, num_lin, params["pillar_diameter"], fp),
+            "rafters": self._rafters(x, py, pz, num_lin, params, rafter_d, corner_zone, fp),
+            "flying_rafters": self._flying_rafters(x, py, pz, params, rafter_d, corner_zone, fp),
+            "rafter_spacing": self._rafter_positions(x, rafter_d)[1],
+            "footprint": fp,
+        }
+
+    # ---------------------------------------------------------
+    # 一、檩：num_lin 路 × num_bays 间，裁至该步屋面；山面坡范围内四面交圈
+    # ---------------------------------------------------------
+    def _purlins(self, x, py, pz, num_lin, diameter, fp):
+        n_bays = len(x) - 1
+
+        kinds = np.full(num_lin, PURLIN_KINDS.index("jin"))
+        kinds[[0, -1]] = PURLIN_KINDS.index("yan")
+        ridge = [num_lin // 2] if num_lin % 2 else [num_lin // 2 - 1, num_lin // 2]
+        kinds[ridge] = PURLIN_KINDS.index("ji")
+
+        # 每路檩所在步的屋面起止（前坡位置取前后对称）
+        yr = py - fp["y0"]
+        yf = np.minimum(yr, (fp["y1"] - fp["y0"]) - yr)
+        inset = front_inset(fp, yf)
+        lo, hi = fp["x0"] + inset, fp["x1"] - inset
+
+        # (num_lin, n_bays) 网格展开，每间一根裁至屋面
+        line = np.repeat(np.arange(num_lin), n_bays)
+        bay = np.tile(np.arange(n_bays), num_lin)
+        x0 = np.maximum(x[bay], lo[line])
+        x1 = np.minimum(x[bay + 1], hi[line])
+        keep = x1 - x0 > EPS
+        line, x0, x1 = line[keep], x0[keep], x1[keep]
+        starts = [np.stack([x0, py[line], pz[line]], axis=1)]
+        ends = [np.stack([x1, py[line], pz[line]], axis=1)]
+        seg_kinds = [kinds[line]]
+
+        # 山面坡：前坡第 j 路檩 → 两山各一根，沿 y 接前后檩端
+        if fp["has_side"]:
+            j = np.flatnonzero((yr <= fp["hip_y"] + EPS) & (np.arange(num_lin) < num_lin - 1 - np.arange(num_lin)))
+            xs = side_x(fp, yr[j])
+            j = j[xs < (fp["x1"] - fp["x0"]) / 2.0 - EPS]
+            xs = side_x(fp, yr[j])
+            y_back = py[num_lin - 1 - j]
+            for sx in (fp["x0"] + xs, fp["x1"] - xs):
+                starts.append(np.stack([sx, py[j], pz[j]], axis=1))
+                ends.append(np.stack([sx, y_back, pz[j]], axis=1))
+                seg_kinds.append(kinds[j])
+
+        return MemberArrays.from_segments(
+            np.concatenate(starts), np.concatenate(ends), np.concatenate(seg_kinds), PURLIN_KINDS, diameter
+        )
+
+    # ---------------------------------------------------------
+    # 二、椽
+    # ---------------------------------------------------------
+    @staticmethod
+    def _rafter_positions(x, rafter_d):
+        """
+        每间椽数 = round(开间 / 2 椽径)，每间内居中排布。
+        返回全部椽子的 x 坐标与各间实际间距。
+        """
+        widths = np.diff(x)
+        counts = np.maximum(np.round(widths / (2.0 * rafter_d)).astype(int), 1)
+        spacing = widths / counts
+
+        bay = np.repeat(np.arange(len(widths)), counts)
+        k = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        return x[bay] + (k + 0.5) * spacing[bay], spacing
+
+    def _rafters(self, x, py, pz, num_lin, params, rafter_d, corner_zone, fp):
+        n = steps_per_side(num_lin)
+        overhang = params["overhang"]
+        depth = fp["y1"] - fp["y0"]
+
+        # 前坡各步：j → j+1（y 相对前檐柱轴线）；檐步向外延伸上出
+        yr = py - fp["y0"]
+        seg_y0, seg_z0 = yr[:n].copy(), pz[:n].copy()
+        seg_y1, seg_z1 = yr[1 : n + 1], pz[1 : n + 1]
+        slope0 = (pz[1] - pz[0]) / (py[1] - py[0])
+        seg_y0[0] -= overhang
+        seg_z0[0] -= overhang * slope0
+
+        kinds = np.full(n, RAFTER_KINDS.index("huajia"))
+        kinds[-1] = RAFTER_KINDS.index("nao")
+        kinds[0] = RAFTER_KINDS.index("yan")
+        seg = {"y0": seg_y0, "y1": seg_y1, "z0": seg_z0, "z1": seg_z1, "kind": kinds}
+
+        # 前后坡：沿 x 排布，上端裁至该处前坡所及
+        xs, _ = self._rafter_positions(x, rafter_d)
+        reach = front_reach(fp, np.minimum(xs - fp["x0"], fp["x1"] - xs))
+        s, xx, y1, z1 = self._clip_rafters(seg, xs, reach, corner_zone, (fp["x0"], fp["x1"]))
+        starts, ends = [], []
+        for y_base, sign in ((fp["y0"], 1.0), (fp["y1"], -1.0)):
+            starts.append(np.stack([xx, y_base + sign * y1, z1], axis=1))
+            ends.append(np.stack([xx, y_base + sign * seg["y0"][s], seg["z0"][s]], axis=1))
+        seg_kinds = [seg["kind"][s]] * 2
+
+        # 卷棚顶步：罗锅椽跨两脊檩，仅在前坡通达进深中线处
+        if num_lin % 2 == 0:
+            top = xs[reach >= depth / 2.0 - EPS]
+            starts.append(np.stack([top, np.full(len(top), py[n]), np.full(len(top), pz[n])], axis=1))
+            ends.append(np.stack([top, np.full(len(top), py[n + 1]), np.full(len(top), pz[n + 1])], axis=1))
+            seg_kinds.append(np.full(len(top), RAFTER_KINDS.index("luoguo")))
+
+        # 山面坡：沿 y 排布、沿 ±x 铺设，仅山面坡覆盖的步
+        if fp["has_side"]:
+            side = {k: v[seg_y1 <= fp["hip_y"] + EPS] for k, v in seg.items()}
+            vs, _ = self._rafter_positions(np.array([fp["y0"], fp["y1"]]), rafter_d)
+            reach = np.minimum(vs - fp["y0"], fp["y1"] - vs)
+            s, vv, y1, z1 = self._clip_rafters(side, vs, reach, corner_zone, (fp["y0"], fp["y1"]))
+            for x_base, sign in ((fp["x0"], 1.0), (fp["x1"], -1.0)):
+                starts.append(np.stack([x_base + sign * side_x(fp, y1), vv, z1], axis=1))
+                ends.append(np.stack([x_base + sign * side_x(fp, side["y0"][s]), vv, side["z0"][s]], axis=1))
+                seg_kinds.append(side["kind"][s])
+
+        return MemberArrays.from_segments(
+            np.concatenate(starts), np.concatenate(ends), np.concatenate(seg_kinds), RAFTER_KINDS, rafter_d
+        )
+
+    @staticmethod
+    def _clip_rafters(seg, positions, reach, corner_zone, span):
+        """
+        (段, 椽位) 网格展开：上端裁至 reach（坡面所及），整段在外者去掉；
+        翼角范围内的檐椽让位给 corner_eave。返回 段号、椽位、裁后上端 y / z。
+        """
+        n_seg, n_pos = len(seg["kind"]), len(positions)
+        s = np.repeat(np.arange(n_seg), n_pos)
+        pos = np.tile(positions, n_seg)
+        lim = np.tile(reach, n_seg)
+
+        y0, y1 = seg["y0"][s], seg["y1"][s]
+        top = np.minimum(y1, lim)
+        keep = top > y0 + EPS
+        if corner_zone > 0:
+            in_corner = (pos < span[0] + corner_zone) | (pos > span[1] - corner_zone)
+            keep &= ~(in_corner & (seg["kind"][s] == RAFTER_KINDS.index("yan")))
+        s, pos, y0, y1, top = s[keep], pos[keep], y0[keep], y1[keep], top[keep]
+
+        z0, z1 = seg["z0"][s], seg["z1"][s]
+        return s, pos, top, z0 + (z1 - z0) * (top - y0) / (y1 - y0)
+
+    def _flying_rafters(self, x, py, pz, params, rafter_d, corner_zone, fp):
+        """飞椽：压于檐椽头，外露 = 上出 × flying_ratio，尾长为外露的 2 倍；山面坡同样出飞椽"""
+        overhang = params["overhang"]
+        exposed = overhang * self.rule.get("flying_ratio", 1.0 / 3.0)
+        slope0 = (pz[1] - pz[0]) / (py[1] - py[0])
+        lift = rafter_d
+
+        # 前坡位置（相对前檐柱轴线）
+        y_tail = -overhang + 2.0 * exposed
+        y_head = -overhang - exposed
+        z_tail = pz[0] - (overhang - 2.0 * exposed) * slope0 + lift
+        z_head = pz[0] - overhang * slope0 + lift
+
+        # 前后坡：沿 x 排布
+        xs, _ = self._rafter_positions(x, rafter_d)
+        if corner_zone > 0:
+            xs = xs[(xs >= fp["x0"] + corner_zone) & (xs <= fp["x1"] - corner_zone)]
+        n_x = len(xs)
+        starts, ends = [], []
+        for y_base, sign in ((fp["y0"], 1.0), (fp["y1"], -1.0)):
+            starts.append(np.stack([xs, np.full(n_x, y_base + sign * y_tail), np.full(n_x, z_tail)], axis=1))
+            ends.append(np.stack([xs, np.full(n_x, y_base + sign * y_head), np.full(n_x, z_head)], axis=1))
+
+        # 山面坡：沿 y 排布
+        if fp["has_side"]:
+            vs, _ = self._rafter_positions(np.array([fp["y0"], fp["y1"]]), rafter_d)
+            if corner_zone > 0:
+                vs = vs[(vs >= fp["y0"] + corner_zone) & (vs <= fp["y1"] - corner_zone)]
+            n_v = len(vs)
+            for x_base, sign in ((fp["x0"], 1.0), (fp["x1"], -1.0)):
+                starts.append(np.stack([np.full(n_v, x_base + sign * side_x(fp, y_tail)), vs,
+                                        np.full(n_v, z_tail)], axis=1))
+                ends.append(np.stack([np.full(n_v, x_base + sign * side_x(fp, y_head)), vs,
+                                      np.full(n_v, z_head)], axis=1))
+
+        starts, ends = np.concatenate(starts), np.concatenate(ends)
+        kinds = np.full(len(starts), RAFTER_KINDS.index("fei"))
+        return MemberArrays.from_segments(starts, ends, kinds, RAFTER_KINDS, rafter_d)
@@ -1,43 +1,35 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import numpy as np
 
+from .building_table import BuildingTable
+from .units import UnitSystem
+
 
 class BaseFormatter(ABC):
     """格式化器基类"""
 
-    def __init__(self, headers: List[str]):
+    def __init__(self, headers: List[str], table: BuildingTable):
         self.headers = headers
+        self.table = table
 
     def _get_header_index(self, field_name: str) -> int:
         """获取字段在CSV中的列索引"""
         return self.headers.index(field_name)
 
-    def _get_value(
-        self, row: np.ndarray, field_name: str, as_float: bool = False
-    ) -> Any:
-        """根据列名获取行中对应值"""
-        try:
-            idx = self._get_header_index(field_name)
-            val = str(row[idx]).strip()
-            if as_float:
-                try:
-                    return float(val) if val else np.nan
-                except ValueError:
-                    return np.nan
-            return val
-        except Exception:
-            return np.nan if as_float else ""
+    def _get_value(self, row: int, field_name: str, as_float: bool = False) -> Any:
+        """根据列名获取第 row 栋建筑的值（尺寸列为已换算值）"""
+        return self.table.value(field_name, row, as_float)
 
     @abstractmethod
-    def format(self, row: np.ndarray) -> Dict[str, Any]:
+    def format(self, row: int) -> Dict[str, Any]:
         pass
 
 
 class BasicInfoFormatter(BaseFormatter):
     """基础信息格式化器"""
 
-    def format(self, row: np.ndarray) -> Dict[str, Any]:
+    def format(self, row: int) -> Dict[str, Any]:
         return {
             "garden_name": self._get_value(row, "园林名称"),
             "garden_id": self._get_value(row, "园中园编号"),
@@ -47,32 +39,44 @@ class BasicInfoFormatter(BaseFormatter):
 
 
 class CategoryInfoFormatter(BaseFormatter):
-    """种类信息格式化器"""
+    """种类信息格式化器：中文术语 + ids（入库编码对应的 ASCII 标识，查表以此为键）"""
 
-    def format(self, row: np.ndarray) -> Dict[str, Any]:
-        return {
-            "building_category": self._get_value(row, "建筑类别"),
-            "sub_category": self._get_value(row, "建筑子类"),
-            "roof_forms": self._get_value(row, "屋顶形式"),
-            "ridge_types": self._get_value(row, "屋脊类型"),
-            "construction_grades": self._get_value(row, "建筑等级"),
-            "corridor": self._get_value(row, "出廊"),
-        }
+    FIELDS = {
+        "building_category": "建筑类别",
+        "sub_category": "建筑子类",
+        "roof_forms": "屋顶形式",
+        "ridge_types": "屋脊类型",
+        "construction_grades": "建筑等级",
+        "corridor": "出廊",
+    }
+
+    def format(self, row: int) -> Dict[str, Any]:
+        info = {key: self._get_value(row, field) for key, field in self.FIELDS.items()}
+        info["ids"] = {key: self.table.ascii_id(field, row) for key, field in self.FIELDS.items()}
+        return info
 
 
 class PrecisionInfoFormatter(BaseFormatter):
     """精度信息格式化器"""
 
-    def format(self, row: np.ndarray) -> Dict[str, Any]:
+    def format(self, row: int) -> Dict[str, Any]:
         return {
             "pricision": self._get_value(row, "模型精度"),
         }
 
 
+class UnitInfoFormatter(BaseFormatter):
+    """单位信息格式化器（整表共用）"""
+
+    def format(self, row: int) -> Dict[str, Any]:
+        m = self.table.metadata
+        return {"unit": m["unit"], "scale": m["scale"], "precision": m["precision"]}
+
+
 class DimensionInfoFormatter(BaseFormatter):
     """尺寸信息格式化器"""
 
-    def format(self, row: np.ndarray) -> Dict[str, Any]:
+    def format(self, row: int) -> Dict[str, Any]:
         # 面阔数据
         all_bays = np.array(
             [
@@ -90,11 +94,25 @@ class DimensionInfoFormatter(BaseFormatter):
         depth_total = np.array(self._get_value(row, "通进深", True))
         eave_step = np.array(self._get_value(row, "檐步架", True))
 
+        # 檐柱（标注值，缺测为 nan，由规则补足）
+        eave_pillar_height = self._get_value(row, "标注檐柱高", True)
+        pillar_diameter = self._get_value(row, "标注柱径", True)
+
+        # 台明与出檐（标注值，缺测为 nan，由规则补足）
+        platform_height = self._get_value(row, "标注台明高", True)
+        eave_overhang = self._get_value(row, "标注上出", True)
+        platform_overhang = self._get_value(row, "标注下出", True)
+
         return {
             "num_bays": bays,
             "bay_widths": bay_widths,
             "depth_total": depth_total,
             "eave_step": eave_step,
+            "eave_pillar_height": eave_pillar_height,
+            "pillar_diameter": pillar_diameter,
+            "platform_height": platform_height,
+            "eave_overhang": eave_overhang,
+            "platform_overhang": platform_overhang,
         }
 
 
@@ -104,12 +122,17 @@ class DataLoader:
     1. 读取CSV数据
     2. 按需提供结构化的建筑数据
     3. 支持批量数据获取
+
+    整表一次读入内存（genfromtxt），不分块；流水线的反压不覆盖这一部分。
     """
 
-    def __init__(self, raw_csv_path: str):
+    def __init__(self, raw_csv_path: str, units: Optional[UnitSystem] = None):
+        """units 缺省读 base_config.toml（UnitSystem.from_config）"""
         self.raw_csv_path = raw_csv_path
+        self.units = units or UnitSystem.from_config()
         self.headers = []
         self.raw_data = None
+        self.table = None
         self._formatters = {}
         self._building_cache = {}  # 缓存格式化的建筑数据
 
@@ -126,6 +149,7 @@ class DataLoader:
             "category_info": CategoryInfoFormatter,
             "precision_info": PrecisionInfoFormatter,
             "dimension_info": DimensionInfoFormatter,
+            "unit_info": UnitInfoFormatter,
         }
 
     def _load_raw_data(self):
@@ -135,9 +159,10 @@ class DataLoader:
         )
         self.headers = self.raw_data[0, :].tolist()
 
-        # 设置格式化器的headers
-        for formatter_class in self._formatters.values():
-            formatter_class.headers = self.headers
+        # 入库：尺寸列整列换算一次
+        self.table = BuildingTable.from_raw(
+            self.headers, self.raw_data[2:], self.units, source=str(self.raw_csv_path)
+        )
 
     def get_building_section(self, row_index: int, section_key: str) -> Dict[str, Any]:
         """获取指定建筑的特定数据段（懒加载）"""
@@ -150,12 +175,19 @@ class DataLoader:
             if not formatter_class:
                 raise ValueError(f"未知的数据段: {section_key}")
 
-            row = self.raw_data[2 + row_index]  # 跳过表头和说明行
-            formatter = formatter_class(self.headers)
-            self._building_cache[cache_key] = formatter.format(row)
+            formatter = formatter_class(self.headers, self.table)
+            self._building_cache[cache_key] = formatter.format(row_index)
 
         return self._building_cache[cache_key]
 
+    def format_building(self, row_index: int) -> Dict[str, Any]:
+        """完整建筑数据，不写缓存（流水线逐块处理大表时用，内存不随行数增长）"""
+        self._validate_row_index(row_index)
+        return {
+            section_key: formatter_class(self.headers, self.table).format(row_index)
+            for section_key, formatter_class in self._formatters.items()
+        }
+
     def get_complete_building_data(self, row_index: int) -> Dict[str, Any]:
         """获取完整的建筑数据（一次性获取所有段）"""
         self._validate_row_index(row_index)
@@ -179,6 +211,15 @@ class DataLoader:
             buildings.append(self.get_complete_building_data(i))
         return buildings
 
+    def get_column(self, field_name: str, as_float: bool = False, as_code: bool = False) -> np.ndarray:
+        """
+        整列读取全部建筑（跳过表头和说明行）；数值列空值为 nan，尺寸列为已换算值，
+        类别列 as_code 时为术语编码（configs.Vocabulary）
+        """
+        if self.table is None:
+            raise ValueError("数据尚未加载")
+        return self.table.column(field_name, as_float, as_code)
+
     def get_building_count(self) -> int:
         """获取建筑数量"""
         return len(self.raw_data) - 2 if self.raw_data is not None else 0
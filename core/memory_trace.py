@@ -0,0 +1,387 @@
+# core/memory_trace.py
+"""
+内存追踪（可选开启）：以 tracemalloc 记录各流水线阶段、计算器与装配函数的分配，
+归属到（模块, 函数），每 report_every 栋输出一次增长最多的来源，并检查跨检查点单调增长（疑似泄漏）。
+
+开启方式（默认关闭，关闭时各钩子只多一次属性判断）：
+    base_config.toml [profiling] memory_trace = true      首次进入钩子时自动开启
+    MemoryTracer.start(report_every=500)                  代码中显式开启
+    python -m core.memtrace_cli data/data.csv --report-every 500     命令行（见 core/memtrace_cli.py）
+
+钩子：
+    with MemoryTracer.region("calculate:XieshanCalculator", items=n): ...
+    @MemoryTracer.traced("assemble")
+
+- 区段（region）：进入 / 退出时的已追踪内存差与区段内峰值；snapshot_regions 时另做快照差，按来源归属
+- 检查点（每 report_every 栋，由 region 的 items 或 tick() 计数）：与上一检查点比较，记录增长前 top 个来源；
+  与开始时比较得到各来源的驻留量，连续 leak_windows 个检查点严格递增且累计超过 leak_min_kb 者记为疑似泄漏
+- 来源：调用栈中最内层位于本仓库内的帧（numpy / 标准库内的分配记到调用它的项目函数），
+  函数名由源码 AST 按行号查得
+- 追踪只覆盖当前进程；Pipeline 在开启时改用线程池计算，以便子任务的分配可见
+"""
+import ast
+import logging
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache, wraps
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from configs import ConfigManager
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# (模块, 函数)
+Site = Tuple[str, str]
+TOTAL: Site = ("<total>", "")
+
+
+# ================================================================
+# 来源归属
+# ================================================================
+@lru_cache(maxsize=None)
+def _function_index(filename: str) -> Tuple[Tuple[int, int, str], ...]:
+    """源文件中各函数的 (起始行, 结束行, 限定名)，按起始行排序"""
+    try:
+        tree = ast.parse(Path(filename).read_text(encoding="utf-8"))
+    except (OSError, SyntaxError, UnicodeDecodeError, ValueError):
+        return ()
+
+    out = []
+
+    def visit(node, prefix: str):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                name = f"{prefix}{child.name}"
+                if not isinstance(child, ast.ClassDef):
+                    out.append((child.lineno, child.end_lineno or child.lineno, name))
+                visit(child, f"{name}.")
+            else:
+                visit(child, prefix)
+
+    visit(tree, "")
+    return tuple(sorted(out))
+
+
+@lru_cache(maxsize=None)
+def _module_name(filename: str) -> Optional[str]:
+    """仓库内文件 → 点分模块名；仓库外（含 <frozen ...> 等伪文件名）返回 None"""
+    if filename.startswith("<"):
+        return None
+    try:
+        rel = Path(filename).resolve().relative_to(PROJECT_ROOT)
+    except ValueError:
+        return None
+    if "site-packages" in rel.parts:
+        return None
+    parts = list(rel.with_suffix("").parts)
+    if parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts) or rel.name
+
+
+def function_at(filename: str, lineno: int) -> str:
+    """包含该行的最内层函数名；模块级代码为 <module>"""
+    found = "<module>"
+    for start, end, name in _function_index(filename):
+        if start > lineno:
+            break
+        if end >= lineno:
+            found = name
+    return found
+
+
+@lru_cache(maxsize=65536)
+def site_of(traceback: tracemalloc.Traceback) -> Site:
+    """调用栈 → 最内层的项目帧；整栈都在仓库外时取最内层帧"""
+    frames = list(traceback)          # 由外到内
+    for frame in reversed(frames):
+        module = _module_name(frame.filename)
+        if module is not None:
+            return module, function_at(frame.filename, frame.lineno)
+    frame = frames[-1]
+    return Path(frame.filename).stem, f"line {frame.lineno}"
+
+
+def sites_of(snapshot: tracemalloc.Snapshot) -> Counter:
+    """快照 → {来源: 驻留字节}；追踪器自身的分配不计"""
+    out = Counter()
+    for stat in snapshot.statistics("traceback"):
+        site = site_of(stat.traceback)
+        if site[0] != __name__ and site[0] != "tracemalloc":
+            out[site] += stat.size
+    return out
+
+
+def diff_sites(after: Counter, before: Counter) -> Counter:
+    """两次 sites_of 之差（保留负值，去掉 0）"""
+    out = Counter({site: size - before.get(site, 0) for site, size in after.items()})
+    for site, size in before.items():
+        if site not in after:
+            out[site] = -size
+    return Counter({site: size for site, size in out.items() if size})
+
+
+def _fmt_site(site: Site) -> str:
+    module, function = site
+    return f"{module}:{function}" if function else module
+
+
+def _fmt_kb(size: float) -> str:
+    return f"{size / 1024.0:+,.1f} KB"
+
+
+# ================================================================
+# 记录
+# ================================================================
+@dataclass
+class RegionStats:
+    calls: int = 0
+    items: int = 0
+    seconds: float = 0.0
+    net_bytes: int = 0            # 各次（退出 - 进入）之和
+    peak_bytes: int = 0           # 单次区段内相对进入时的最大增量
+    sites: Counter = field(default_factory=Counter)
+
+
+@dataclass
+class Checkpoint:
+    buildings: int
+    traced_bytes: int
+    peak_bytes: int
+    top_growth: List[Tuple[Site, int]]
+
+
+@dataclass
+class MemoryReport:
+    regions: Dict[str, RegionStats]
+    checkpoints: List[Checkpoint]
+    leaks: List[Tuple[Site, List[int]]]
+
+    def format(self, top: int = 10) -> str:
+        lines = ["区段：", f"  {'name':<36}{'calls':>8}{'items':>8}{'net':>16}{'peak':>16}"]
+        for name, s in sorted(self.regions.items(), key=lambda kv: -kv[1].net_bytes):
+            lines.append(f"  {name:<36}{s.calls:>8}{s.items:>8}{_fmt_kb(s.net_bytes):>16}{_fmt_kb(s.peak_bytes):>16}")
+            for site, size in s.sites.most_common(3):
+                lines.append(f"      {_fmt_kb(size):>14}  {_fmt_site(site)}")
+        if self.checkpoints:
+            lines.append("检查点：")
+            for c in self.checkpoints:
+                growth = ", ".join(f"{_fmt_site(s)} {_fmt_kb(v)}" for s, v in c.top_growth[:3])
+                lines.append(f"  {c.buildings:>8} 栋  已追踪 {c.traced_bytes / 1048576.0:8.1f} MB  {growth}")
+        if self.leaks:
+            lines.append("疑似泄漏（检查点间单调增长）：")
+            for site, series in self.leaks[:top]:
+                lines.append(f"  {_fmt_site(site)}: " + " → ".join(f"{v / 1024.0:,.0f}" for v in series) + " KB")
+        return "\n".join(lines)
+
+
+# ================================================================
+# 追踪器
+# ================================================================
+class MemoryTracer:
+    _initialized = False
+    _enabled = False
+    _owns_tracemalloc = False
+
+    report_every = 1000
+    top = 10
+    nframes = 8
+    snapshot_regions = False
+    leak_windows = 3
+    leak_min_kb = 64.0
+
+    _regions: Dict[str, RegionStats] = {}
+    _checkpoints: List[Checkpoint] = []
+    _history: Dict[Site, List[int]] = {}       # 各检查点的驻留量（相对开始）
+    _baseline: Counter = Counter()                  # 开始时各来源的驻留量
+    _last: Counter = Counter()                      # 上一检查点各来源的驻留量
+    _count = 0
+    _next_checkpoint = 0
+    _depth = 0
+
+    @classmethod
+    def _initialize(cls):
+        """首次进入钩子时读 [profiling]；memory_trace = true 则开启"""
+        if cls._initialized:
+            return
+        cls._initialized = True
+        section = ConfigManager.get_base_config("profiling")
+        if section and section.get("memory_trace", False):
+            cls.start(
+                report_every=section.get("report_every"),
+                top=section.get("top"),
+                nframes=section.get("nframes"),
+                snapshot_regions=section.get("snapshot_regions"),
+            )
+
+    @classmethod
+    def enabled(cls) -> bool:
+        if not cls._initialized:
+            cls._initialize()
+        return cls._enabled
+
+    @classmethod
+    def start(
+        cls,
+        report_every: Optional[int] = None,
+        top: Optional[int] = None,
+        nframes: Optional[int] = None,
+        snapshot_regions: Optional[bool] = None,
+        leak_windows: Optional[int] = None,
+        leak_min_kb: Optional[float] = None,
+    ):
+        for name, value in (
+            ("report_every", report_every), ("top", top), ("nframes", nframes),
+            ("snapshot_regions", snapshot_regions), ("leak_windows", leak_windows), ("leak_min_kb", leak_min_kb),
+        ):
+            if value is not None:
+                setattr(cls, name, type(getattr(cls, name))(value))
+
+        cls._initialized = True
+        cls._owns_tracemalloc = not tracemalloc.is_tracing()
+        if cls._owns_tracemalloc:
+            tracemalloc.start(cls.nframes)
+        cls._regions = defaultdict(RegionStats)
+        cls._checkpoints, cls._history = [], defaultdict(list)
+        cls._count, cls._next_checkpoint, cls._depth = 0, cls.report_every, 0
+        cls._baseline = cls._last = cls._sites()
+        cls._enabled = True
+        logger.info(f"[MemTrace] 开启：每 {cls.report_every} 栋检查一次，调用栈 {tracemalloc.get_traceback_limit()} 帧")
+
+    @classmethod
+    def stop(cls) -> MemoryReport:
+        """结束追踪并返回报告（未达 report_every 的尾段也做一次检查点）"""
+        if not cls._enabled:
+            return MemoryReport({}, [], [])
+        if cls._count > (cls._checkpoints[-1].buildings if cls._checkpoints else 0):
+            cls.checkpoint()
+        report = cls.report()
+        cls._enabled = False
+        cls._baseline = cls._last = Counter()
+        if cls._owns_tracemalloc:
+            tracemalloc.stop()
+        return report
+
+    @classmethod
+    def report(cls) -> MemoryReport:
+        return MemoryReport(dict(cls._regions), list(cls._checkpoints), cls.leaks())
+
+    # -------------------------------------------------------
+    # 钩子
+    # -------------------------------------------------------
+    @staticmethod
+    def _sites() -> Counter:
+        # 不用 Snapshot.filter_traces：逐条 fnmatch，十万级分配时比取快照本身慢一个量级
+        return sites_of(tracemalloc.take_snapshot())
+
+    @classmethod
+    @contextmanager
+    def region(cls, name: str, items: int = 0) -> Iterator[None]:
+        """
+        记录一段代码的分配。items 为本段处理的栋数，计入检查点计数。
+        嵌套区段各自记录；峰值以最外层为准重置（内层峰值为近似值）。
+        """
+        if not cls.enabled():
+            yield
+            return
+
+        before_sites = cls._sites() if cls.snapshot_regions else None
+        if cls._depth == 0:
+            tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        t = time.perf_counter()
+        cls._depth += 1
+        try:
+            yield
+        finally:
+            cls._depth -= 1
+            current, peak = tracemalloc.get_traced_memory()
+            stats = cls._regions[name]
+            stats.calls += 1
+            stats.items += items
+            stats.seconds += time.perf_counter() - t
+            stats.net_bytes += current - before
+            stats.peak_bytes = max(stats.peak_bytes, peak - before)
+            if before_sites is not None:
+                stats.sites.update(diff_sites(cls._sites(), before_sites))
+            if items:
+                cls.tick(items)
+
+    @classmethod
+    def traced(cls, name: Optional[str] = None):
+        """装饰器形式的 region"""
+        def deco(fn):
+            label = name or f"{fn.__module__}.{fn.__qualname__}"
+
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not cls.enabled():
+                    return fn(*args, **kwargs)
+                with cls.region(label):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return deco
+
+    @classmethod
+    def tick(cls, n: int = 1):
+        """已处理 n 栋；跨过 report_every 的整数倍时做检查点"""
+        if not cls._enabled:
+            return
+        cls._count += n
+        if cls._count >= cls._next_checkpoint:
+            cls.checkpoint()
+            while cls._next_checkpoint <= cls._count:
+                cls._next_checkpoint += cls.report_every
+
+    # -------------------------------------------------------
+    # 检查点与泄漏
+    # -------------------------------------------------------
+    @classmethod
+    def checkpoint(cls) -> Checkpoint:
+        sites = cls._sites()
+        growth = diff_sites(sites, cls._last)
+        retained = diff_sites(sites, cls._baseline)
+        current, peak = tracemalloc.get_traced_memory()
+
+        # 新出现的来源补齐历史（此前驻留量视为 0）
+        retained[TOTAL] = sum(retained.values())
+        n = len(cls._checkpoints)
+        for site in retained:
+            if site not in cls._history:
+                cls._history[site] = [0] * n
+        for site, series in cls._history.items():
+            series.append(retained.get(site, 0))
+
+        top = [(site, size) for site, size in growth.most_common(cls.top) if size > 0]
+        cp = Checkpoint(buildings=cls._count, traced_bytes=current, peak_bytes=peak, top_growth=top)
+        cls._checkpoints.append(cp)
+        cls._last = sites
+
+        logger.info(
+            f"[MemTrace] {cls._count} 栋：已追踪 {current / 1048576.0:.1f} MB，"
+            f"本段增长 {_fmt_kb(sum(growth.values()))}；"
+            + "，".join(f"{_fmt_site(s)} {_fmt_kb(v)}" for s, v in top[:5])
+        )
+        for site, series in cls.leaks():
+            logger.warning(f"[MemTrace] 疑似泄漏 {_fmt_site(site)}：近 {len(series)} 个检查点驻留 "
+                           + " → ".join(f"{v / 1024.0:,.0f}" for v in series) + " KB")
+        return cp
+
+    @classmethod
+    def leaks(cls) -> List[Tuple[Site, List[int]]]:
+        """最近 leak_windows + 1 个检查点驻留量严格递增且累计增长 ≥ leak_min_kb 的来源，按增长量降序"""
+        k = cls.leak_windows + 1
+        out = []
+        for site, series in cls._history.items():
+            tail = series[-k:]
+            if len(tail) < k:
+                continue
+            if all(b > a for a, b in zip(tail, tail[1:])) and tail[-1] - tail[0] >= cls.leak_min_kb * 1024:
+                out.append((site, tail))
+        return sorted(out, key=lambda item: item[1][0] - item[1][-1])
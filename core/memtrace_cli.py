@@ -0,0 +1,43 @@
+# core/memtrace_cli.py
+"""
+内存追踪命令行：对一张测绘表做带追踪的分桶计算，结束时输出报告。
+
+    python -m core.memtrace_cli data/data.csv --report-every 500
+    python -m core.memtrace_cli data/data.csv --rows 2000 --snapshot-regions
+
+与 core.memory_trace 分开，避免 python -m 时追踪模块以 __main__ 身份再加载一份类状态。
+"""
+import argparse
+import logging
+
+from .data_loader import DataLoader
+from .memory_trace import MemoryTracer
+from .scheduler import FormScheduler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="test_arch 内存追踪")
+    parser.add_argument("csv", help="测绘表")
+    parser.add_argument("--rows", type=int, default=None, help="只算前 N 栋")
+    parser.add_argument("--chunk", type=int, default=500, help="每次调度的栋数（模拟批次）")
+    parser.add_argument("--report-every", type=int, default=500)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--nframes", type=int, default=8)
+    parser.add_argument("--snapshot-regions", action="store_true", help="区段也做快照差（慢）")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    MemoryTracer.start(
+        report_every=args.report_every, top=args.top, nframes=args.nframes,
+        snapshot_regions=args.snapshot_regions,
+    )
+    with MemoryTracer.region("load"):
+        loader = DataLoader(args.csv)
+    total = min(loader.get_building_count(), args.rows or loader.get_building_count())
+    for start in range(0, total, args.chunk):
+        FormScheduler(loader).run(range(start, min(start + args.chunk, total)))
+    print(MemoryTracer.stop().format(args.top))
+
+
+if __name__ == "__main__":
+    main()
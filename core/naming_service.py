@@ -0,0 +1,248 @@
+# core/naming_service.py
+"""
+统一命名（docs/naming_rules.md）：整批构件一次生成标识，不逐个调用 format。
+
+    COL_<序号>_H<高度>_D<直径>_STYLE_<体系>      COL_001_H3.20_D0.30_STYLE_qing_small
+    PURL_<序号>_TYPE_<种类>_L<长度>             PURL_002_TYPE_jin_L5.20
+    ...（见 TEMPLATES）
+
+- 序号：按（集合, 前缀）各自计数，三位补零（超过 999 自然加宽），集合内唯一；
+        未显式注入 NamingService 者共用进程内实例 shared_naming()，同一集合
+        多次组装（多个 BulkWriter / 多次 assemble_building）序号连续不重号
+- 参数：定点两位小数，由整数运算拼出，不经浮点格式化；整数字段（ANG、C）四舍五入
+- 类型 / 体系等词元：先整体去重（interned），每个不同词元只转换一次，再按编码取用
+- parse_name() / parse_names() 把名称还原为参数
+"""
+import re
+from collections import defaultdict
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+SEQ_WIDTH = 3
+DEFAULT_STYLE = "qing"
+
+# 字段：(标签, 参数名, 种类)；种类 seq / float / int / token
+TEMPLATES: Dict[str, Tuple[Tuple[str, str, str], ...]] = {
+    "COL": (("", "seq", "seq"), ("H", "height", "float"), ("D", "diameter", "float"), ("STYLE_", "style", "token")),
+    "BEAM": (("", "seq", "seq"), ("L", "length", "float"), ("TYPE_", "type", "token"), ("STYLE_", "style", "token")),
+    "FANG": (("", "seq", "seq"), ("POS_", "position", "token"), ("L", "length", "float")),
+    "PURL": (("", "seq", "seq"), ("TYPE_", "type", "token"), ("L", "length", "float")),
+    "RAFT": (("", "seq", "seq"), ("TYPE_", "type", "token"), ("L", "length", "float")),
+    "ROOF": (("", "seq", "seq"), ("TYPE_", "type", "token"), ("W", "width", "float"), ("D", "depth", "float"),
+             ("STYLE_", "style", "token")),
+    "WING": (("", "seq", "seq"), ("ANG", "angle", "int"), ("STYLE_", "style", "token")),
+    "DOUG": (("", "seq", "seq"), ("TYPE_", "type", "token"), ("C", "cai", "int"), ("STYLE_", "style", "token")),
+    "MODU": (("", "seq", "seq"), ("DOUKOU_", "doukou", "float"), ),
+    "BASE": (("", "seq", "seq"), ("TYPE_", "type", "token"), ("H", "height", "float")),
+    "DECO": (("", "seq", "seq"), ("TYPE_", "type", "token"), ("STYLE_", "style", "token")),
+    "CARV": (("", "seq", "seq"), ("THEME_", "theme", "token")),
+}
+
+_PATTERNS = {
+    "seq": r"(\d+)",
+    "float": r"(-?\d+\.\d+)",
+    "int": r"(-?\d+)",
+    "token": r"(\w+?)",
+}
+
+
+# ================================================================
+# 向量化格式化
+# ================================================================
+def format_seq(seq, width: int = SEQ_WIDTH) -> np.ndarray:
+    """整数数组 → 补零字符串数组"""
+    return np.char.zfill(np.asarray(seq, dtype=np.int64).astype(str), width)
+
+
+def format_fixed(values, decimals: int = 2) -> np.ndarray:
+    """浮点数组 → 定点小数字符串数组（四舍五入），如 3.2 → "3.20" """
+    scale = 10 ** decimals
+    values = np.asarray(values, dtype=np.float64)
+    # np.round 为银行家舍入（2.5 → 2），此处按绝对值 +0.5 取整：逢五进位、远离零
+    units = np.floor(np.abs(values) * scale + 0.5).astype(np.int64)
+    sign = np.where((values < 0) & (units > 0), "-", "")
+    whole = (units // scale).astype(str)
+    if decimals == 0:
+        return np.char.add(sign, whole)
+    frac = np.char.zfill((units % scale).astype(str), decimals)
+    return np.char.add(np.char.add(np.char.add(sign, whole), "."), frac)
+
+
+def intern_tokens(values) -> Tuple[np.ndarray, np.ndarray]:
+    """字符串数组 → (去重词表, 编码)；词表很小，编码为 int"""
+    table, codes = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+    return table, codes.reshape(-1)
+
+
+def _token_strings(values, n: int, table: Optional[Sequence[str]] = None) -> np.ndarray:
+    """
+    词元列：values 为字符串（数组），或 table 给定时为编码数组；
+    每个不同词元只在词表中出现一次，再按编码展开。
+    """
+    if table is not None:
+        return np.asarray(table, dtype=str)[np.broadcast_to(np.asarray(values, dtype=np.int64), (n,))]
+    table, codes = intern_tokens(np.broadcast_to(np.asarray(values, dtype=str), (n,)))
+    return table[codes]
+
+
+# ================================================================
+# 命名服务
+# ================================================================
+class NamingService:
+    """
+    每个集合内按前缀独立计数；同一服务实例生成的名称在集合内唯一。
+    """
+
+    def __init__(self):
+        self._counters: Dict[Tuple[str, str], int] = defaultdict(int)
+
+    def reset(self, collection: Optional[str] = None):
+        if collection is None:
+            self._counters.clear()
+        else:
+            for key in [k for k in self._counters if k[0] == collection]:
+                del self._counters[key]
+
+    def reserve(self, prefix: str, count: int, collection: str = "") -> np.ndarray:
+        """为一批构件领取连续序号（从 1 起）"""
+        key = (collection, prefix)
+        start = self._counters[key] + 1
+        self._counters[key] += count
+        return np.arange(start, start + count)
+
+    def names(
+        self,
+        prefix: str,
+        collection: str = "",
+        count: Optional[int] = None,
+        token_tables: Optional[Dict[str, Sequence[str]]] = None,
+        **params,
+    ) -> np.ndarray:
+        """
+        按模板生成一批名称，返回字符串数组。
+        params       : 模板中除 seq 外各字段，标量或 (N,) 数组
+        count        : 数量；缺省取 params 中最长数组的长度
+        token_tables : {字段: 词表}，此时该字段传入整数编码（如 MemberArrays.kinds）
+        """
+        template = TEMPLATES[prefix]
+        token_tables = token_tables or {}
+        if count is None:
+            sizes = [np.size(v) for v in params.values() if np.ndim(v) > 0]
+            count = max(sizes) if sizes else 1
+
+        out = np.full(count, prefix)
+        for label, key, kind in template:
+            if kind == "seq":
+                text = format_seq(self.reserve(prefix, count, collection))
+            elif kind == "float":
+                text = format_fixed(np.broadcast_to(params[key], (count,)))
+            elif kind == "int":
+                text = format_fixed(np.broadcast_to(params[key], (count,)), 0)
+            else:
+                text = _token_strings(params[key], count, token_tables.get(key))
+            out = np.char.add(np.char.add(out, "_" + label), text)
+        return out
+
+    def name_members(self, members, prefix: str, collection: str = "") -> np.ndarray:
+        """线状构件数组（roof_frame_calculator.MemberArrays）→ PURL / RAFT 名称"""
+        return self.names(
+            prefix,
+            collection,
+            count=len(members),
+            token_tables={"type": members.kind_names},
+            type=members.kinds,
+            length=members.lengths,
+        )
+
+
+_shared_naming = NamingService()
+
+
+def shared_naming() -> NamingService:
+    """进程内共用的命名服务：BulkWriter 缺省使用，序号按集合持续计数"""
+    return _shared_naming
+
+
+def reset_naming(collection: Optional[str] = None):
+    """集合被删除 / 场景重建后，序号从 1 重新计（collection 缺省为全部）"""
+    _shared_naming.reset(collection)
+
+
+def assert_unique(names: np.ndarray):
+    uniq, counts = np.unique(names, return_counts=True)
+    if np.any(counts > 1):
+        raise ValueError(f"名称重复：{uniq[counts > 1][:5].tolist()}")
+
+
+# ================================================================
+# 解析
+# ================================================================
+def _compile(prefix: str):
+    parts = [re.escape(prefix)]
+    for label, _, kind in TEMPLATES[prefix]:
+        parts.append("_" + re.escape(label) + _PATTERNS[kind])
+    return re.compile("".join(parts) + "$")
+
+
+_REGEX = {prefix: _compile(prefix) for prefix in TEMPLATES}
+_CASTS = {"seq": int, "int": int, "float": float, "token": str}
+
+
+def parse_name(name: str) -> dict:
+    """"COL_001_H3.20_D0.30_STYLE_qing_small" → {"prefix", "index", "params"}"""
+    prefix = name.split("_", 1)[0]
+    regex = _REGEX.get(prefix)
+    match = regex.match(name) if regex else None
+    if match is None:
+        raise ValueError(f"无法解析名称：{name}")
+
+    params, index = {}, None
+    for (_, key, kind), value in zip(TEMPLATES[prefix], match.groups()):
+        if kind == "seq":
+            index = int(value)
+        else:
+            params[key] = _CASTS[kind](value)
+    return {"prefix": prefix, "index": index, "params": params}
+
+
+def parse_names(names: Sequence[str]) -> Dict[str, np.ndarray]:
+    """
+    同一前缀的一批名称 → 列数组 {"index": (N,), 参数名: (N,)}；
+    按 "_" 切分后各列整体转换（词元列含 "_" 时退回逐个正则）。
+    """
+    names = np.asarray(names, dtype=str)
+    if len(names) == 0:
+        return {}
+    prefix = str(names[0]).split("_", 1)[0]
+    template = TEMPLATES[prefix]
+    fields = np.char.split(names, "_")
+    widths = np.array([len(f) for f in fields])
+    # 前缀 + 每字段一段；带 "_" 结尾的标签（STYLE_ 等）自成一段
+    expected = 1 + sum(2 if label.endswith("_") else 1 for label, _, _ in template)
+
+    if np.any(widths != expected) or np.any(np.char.partition(names, "_")[:, 0] != prefix):
+        parsed = [parse_name(str(n)) for n in names]
+        out = {"index": np.array([p["index"] for p in parsed])}
+        for _, key, kind in template:
+            if kind != "seq":
+                out[key] = np.array([p["params"][key] for p in parsed])
+        return out
+
+    table = np.array(fields.tolist(), dtype=str)      # (N, expected)
+    out, col = {}, 1
+    for label, key, kind in template:
+        if label.endswith("_"):
+            col += 1
+        # 紧贴数值的标签（H / D / L / ANG）只含字母，lstrip 不会吃掉数值
+        cell = table[:, col] if label.endswith("_") else np.char.lstrip(table[:, col], label)
+        if kind == "seq":
+            out["index"] = cell.astype(np.int64)
+        elif kind == "float":
+            out[key] = cell.astype(np.float64)
+        elif kind == "int":
+            out[key] = cell.astype(np.int64)
+        else:
+            out[key] = cell
+        col += 1
+    return out
@@ -0,0 +1,357 @@
+# core/pipeline.py
+"""
+分阶段异步流水线：读入 → 推断 → 计算 → 导出，阶段之间以有界队列相连。
+
+    load      单协程，按行序切块（DataLoader.format_building，不写缓存）
+    infer     infer_workers 个协程，FormInferencer（线程中执行）
+    calculate calc_workers 个协程，整块交给进程池：块内按（屋顶形式, 形态名）分桶，
+              每桶走 scheduler.run_bucket 的批量路径；整块结果随后做构造校验
+              （structure_validator.validation_errors，PipelineConfig.validate）
+    export    export_workers 个协程，线程池写文件（exporters.export_scene）
+
+- 反压：队列满时上游 await put() 挂起，在途的格式化数据与计算结果最多积压
+  queue_size × chunk_size 栋；但测绘表本身由 DataLoader 整表读入（genfromtxt
+  后按列入库），表的内存随行数线性增长，反压管不到这一部分。超大的表请先分文件
+- 各阶段并发数见 PipelineConfig（base_config.toml [pipeline]）
+- 稳态吞吐取决于最慢的阶段；PipelineReport.stage_seconds 为各阶段累计忙碌时间，
+  在工作线程 / 进程内计时，不含等待池中空闲工位的时间
+- 开启内存追踪（core.memory_trace）时各阶段任务改在同一线程串行执行，
+  计算的分配留在本进程内可见，各区段统计互不重叠
+
+    report = Pipeline("data/data.csv", output_dir="output/").run()
+
+    with ResultStore("output/run.results") as store:      # 结果按列落盘（core.result_store）
+        Pipeline("data/data.csv", store=store).run()
+"""
+import asyncio
+import logging
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from configs import ConfigManager, Vocabulary
+
+from .data_loader import DataLoader
+from .form_inferencer import FormInferencer
+from .memory_trace import MemoryTracer
+from .scheduler import INFER_ERRORS, run_bucket
+from .structure_validator import validation_errors
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("load", "infer", "calculate", "export")
+
+
+@dataclass(frozen=True)
+class PipelineConfig:
+    chunk_size: int = 64
+    queue_size: int = 8
+    infer_workers: int = 1
+    calc_workers: int = 0          # 0 = CPU 核数
+    export_workers: int = 4
+    export_format: str = ".glb"
+    use_processes: bool = True     # False 时计算也用线程池（调试用）
+    validate: bool = True          # 计算后构造校验，未通过者记为失败
+
+    @classmethod
+    def from_config(cls) -> "PipelineConfig":
+        """读 base_config.toml [pipeline]；导出格式取 [output] 中无需 Blender 的 glb / obj"""
+        section = ConfigManager.get_base_config("pipeline")
+        fmt = "." + str(ConfigManager.get_base_config("output", "export_format", "glb")).lstrip(".")
+        return cls(
+            chunk_size=int(section.get("chunk_size", cls.chunk_size)),
+            queue_size=int(section.get("queue_size", cls.queue_size)),
+            infer_workers=int(section.get("infer_workers", cls.infer_workers)),
+            calc_workers=int(section.get("calc_workers", cls.calc_workers)),
+            export_workers=int(section.get("export_workers", cls.export_workers)),
+            export_format=fmt if fmt in (".glb", ".obj") else cls.export_format,
+            validate=bool(section.get("validate", cls.validate)),
+        )
+
+    @property
+    def calc_concurrency(self) -> int:
+        return self.calc_workers or os.cpu_count() or 1
+
+
+@dataclass
+class Chunk:
+    """流水线中的传递单位：连续若干行"""
+    index: int
+    rows: List[int]
+    buildings: Dict[int, dict] = field(default_factory=dict)
+    results: Dict[int, dict] = field(default_factory=dict)
+    errors: Dict[int, str] = field(default_factory=dict)
+
+
+@dataclass
+class PipelineReport:
+    total: int
+    succeeded: int
+    errors: Dict[int, str]
+    exported: List[Path]
+    wall_seconds: float
+    stage_seconds: Dict[str, float]
+    results: Optional[List[Optional[dict]]] = None
+
+    @property
+    def throughput(self) -> float:
+        """栋 / 秒"""
+        return self.total / self.wall_seconds if self.wall_seconds else 0.0
+
+    def format(self) -> str:
+        stages = ", ".join(f"{k} {v:.2f}s" for k, v in self.stage_seconds.items())
+        return (
+            f"{self.total} 栋，成功 {self.succeeded}，失败 {len(self.errors)}，"
+            f"用时 {self.wall_seconds:.2f}s（{self.throughput:.1f} 栋/s）；阶段忙碌：{stages}"
+        )
+
+
+# ================================================================
+# 进程池任务（模块级函数，可 pickle）
+# ================================================================
+def _timed(fn: Callable, *args):
+    """在工位内执行 fn(*args)，返回 (结果, 秒)；排队时间不计入"""
+    t = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - t
+
+
+def calculate_chunk(
+    buildings: Sequence[dict], validate: bool = True
+) -> Tuple[List[Optional[dict]], List[Optional[str]]]:
+    """一块建筑：块内按（屋顶形式, 形态名）分桶计算，整块构造校验，结果按输入顺序返回"""
+    buckets = defaultdict(list)
+    for i, data in enumerate(buildings):
+        cat = data["category_info"]
+        buckets[(Vocabulary.category_id(cat, "roof_forms"), cat["form_name"])].append(i)
+
+    packed: List[Optional[dict]] = [None] * len(buildings)
+    errors: List[Optional[str]] = [None] * len(buildings)
+    for (roof_form, form_name), idx in buckets.items():
+        results, errs = run_bucket(roof_form, form_name, [buildings[i] for i in idx])
+        for i, result, err in zip(idx, results, errs):
+            packed[i], errors[i] = result, err
+
+    if validate:
+        for i, err in enumerate(validation_errors(packed)):
+            if err is not None:
+                packed[i], errors[i] = None, err
+    return packed, errors
+
+
+# ================================================================
+# 流水线
+# ================================================================
+class Pipeline:
+    """
+    raw_csv_path : 测绘表
+    output_dir   : 导出目录；None 时不导出
+    config       : 缺省读 base_config.toml
+    collect      : 是否在报告中保留全部计算结果（大表慎用）
+    on_result    : 可选回调 (row, packed)，在事件循环中逐栋调用
+    store        : 可选 ResultStore，成功的结果逐栋追加（由调用方 close）
+    """
+
+    def __init__(
+        self,
+        raw_csv_path: str,
+        output_dir: Optional[str] = None,
+        config: Optional[PipelineConfig] = None,
+        collect: bool = False,
+        on_result: Optional[Callable[[int, dict], None]] = None,
+        store=None,
+    ):
+        self.raw_csv_path = raw_csv_path
+        self.output_dir = Path(output_dir) if output_dir else None
+        self.config = config or PipelineConfig.from_config()
+        self.collect = collect
+        self.on_result = on_result
+        self.store = store
+
+        self.loader: Optional[DataLoader] = None
+        self._busy: Dict[str, float] = {}
+        self._errors: Dict[int, str] = {}
+        self._results: Dict[int, dict] = {}
+        self._exported: List[Path] = []
+        self._succeeded = 0
+
+    # -------------------------------------------------------
+    # 阶段
+    # -------------------------------------------------------
+    @MemoryTracer.traced("stage:load")
+    def _format_chunk(self, chunk: Chunk) -> Chunk:
+        for row in chunk.rows:
+            chunk.buildings[row] = self.loader.format_building(row)
+        return chunk
+
+    @staticmethod
+    @MemoryTracer.traced("stage:infer")
+    def _infer_chunk(chunk: Chunk) -> Chunk:
+        for row in list(chunk.buildings):
+            try:
+                FormInferencer(chunk.buildings[row]).run()
+            except INFER_ERRORS as e:
+                chunk.errors[row] = f"形态推断失败：{e}"
+                del chunk.buildings[row]
+        return chunk
+
+    @MemoryTracer.traced("stage:export")
+    def _export_chunk(self, chunk: Chunk) -> List[Path]:
+        from exporters import batches_from_packed, export_scene
+
+        paths = []
+        for row, packed in chunk.results.items():
+            # 建筑编号可能重复，文件名带行号
+            name = f"{row}_{packed['basic_info'].get('building_id', '')}".rstrip("_")
+            try:
+                paths.append(export_scene(
+                    batches_from_packed(packed),
+                    self.output_dir / f"{name}{self.config.export_format}",
+                ))
+            except (OSError, ValueError) as e:
+                chunk.errors[row] = f"导出失败：{e}"
+        return paths
+
+    async def _load(self, rows: Sequence[int], outbox: asyncio.Queue, threads: Executor, downstream: int):
+        loop = asyncio.get_running_loop()
+        size = self.config.chunk_size
+        for index, start in enumerate(range(0, len(rows), size)):
+            chunk = Chunk(index, list(rows[start:start + size]))
+            chunk, seconds = await loop.run_in_executor(threads, _timed, self._format_chunk, chunk)
+            self._busy["load"] += seconds
+            await outbox.put(chunk)          # 队列满时在此挂起
+        for _ in range(downstream):
+            await outbox.put(None)
+
+    async def _stage(
+        self,
+        name: str,
+        work: Callable,
+        inbox: asyncio.Queue,
+        outbox: Optional[asyncio.Queue],
+        workers: int,
+        downstream: int = 0,
+    ):
+        """
+        workers 个协程从 inbox 取块、await work(chunk)、放入 outbox；收到 None 退出。
+        忙碌时间由 work 自行累计（见 _timed）。
+        """
+
+        async def worker():
+            while True:
+                chunk = await inbox.get()
+                if chunk is None:
+                    return
+                try:
+                    chunk = await work(chunk)
+                except Exception as e:
+                    logger.exception(f"[Pipeline] {name} 第 {chunk.index} 块失败")
+                    for row in chunk.rows:
+                        if row not in chunk.errors:
+                            chunk.errors[row] = f"{name} 失败：{e}"
+                    chunk.buildings.clear()
+                    chunk.results.clear()
+                if outbox is not None:
+                    await outbox.put(chunk)
+                else:
+                    self._finish(chunk)
+
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        for _ in range(downstream):
+            await outbox.put(None)
+
+    def _finish(self, chunk: Chunk):
+        self._errors.update(chunk.errors)
+        for row, packed in chunk.results.items():
+            if row in chunk.errors:
+                continue
+            self._succeeded += 1
+            if self.collect:
+                self._results[row] = packed
+            if self.on_result is not None:
+                self.on_result(row, packed)
+            if self.store is not None:
+                self.store.append(packed, row)
+
+    # -------------------------------------------------------
+    # 主流程
+    # -------------------------------------------------------
+    async def run_async(self, rows: Optional[Sequence[int]] = None) -> PipelineReport:
+        cfg = self.config
+        started = time.perf_counter()
+        self._busy = {stage: 0.0 for stage in STAGES}
+        self._errors, self._results, self._exported, self._succeeded = {}, {}, [], 0
+
+        loop = asyncio.get_running_loop()
+        if MemoryTracer.enabled():
+            threads = calc_pool = ThreadPoolExecutor(max_workers=1)
+        else:
+            threads = ThreadPoolExecutor(max_workers=max(cfg.infer_workers, cfg.export_workers) + 1)
+            calc_pool = (ProcessPoolExecutor if cfg.use_processes else ThreadPoolExecutor)(
+                max_workers=cfg.calc_concurrency
+            )
+
+        try:
+            self.loader = await loop.run_in_executor(threads, DataLoader, self.raw_csv_path)
+            if rows is None:
+                rows = range(self.loader.get_building_count())
+            rows = list(rows)
+
+            inferred = asyncio.Queue(cfg.queue_size)
+            loaded = asyncio.Queue(cfg.queue_size)
+            calculated = asyncio.Queue(cfg.queue_size)
+
+            async def infer(chunk: Chunk) -> Chunk:
+                chunk, seconds = await loop.run_in_executor(threads, _timed, self._infer_chunk, chunk)
+                self._busy["infer"] += seconds
+                return chunk
+
+            async def calculate(chunk: Chunk) -> Chunk:
+                order = list(chunk.buildings)
+                (packed, errors), seconds = await loop.run_in_executor(
+                    calc_pool, _timed, calculate_chunk, [chunk.buildings[r] for r in order], cfg.validate
+                )
+                self._busy["calculate"] += seconds
+                chunk.buildings.clear()      # 计算后不再需要输入，尽早释放
+                for row, result, error in zip(order, packed, errors):
+                    if result is None:
+                        chunk.errors[row] = error
+                    else:
+                        chunk.results[row] = result
+                return chunk
+
+            async def export(chunk: Chunk) -> Chunk:
+                if self.output_dir is not None and chunk.results:
+                    paths, seconds = await loop.run_in_executor(threads, _timed, self._export_chunk, chunk)
+                    self._exported.extend(paths)
+                    self._busy["export"] += seconds
+                return chunk
+
+            await asyncio.gather(
+                self._load(rows, loaded, threads, cfg.infer_workers),
+                self._stage("infer", infer, loaded, inferred, cfg.infer_workers, cfg.calc_concurrency),
+                self._stage("calculate", calculate, inferred, calculated, cfg.calc_concurrency, cfg.export_workers),
+                self._stage("export", export, calculated, None, cfg.export_workers),
+            )
+        finally:
+            calc_pool.shutdown()
+            threads.shutdown()
+
+        report = PipelineReport(
+            total=len(rows),
+            succeeded=self._succeeded,
+            errors=dict(sorted(self._errors.items())),
+            exported=sorted(self._exported),
+            wall_seconds=time.perf_counter() - started,
+            stage_seconds=dict(self._busy),
+            results=[self._results.get(r) for r in rows] if self.collect else None,
+        )
+        logger.info(f"[Pipeline] {report.format()}")
+        return report
+
+    def run(self, rows: Optional[Sequence[int]] = None) -> PipelineReport:
+        return asyncio.run(self.run_async(rows))
@@ -0,0 +1,484 @@
+# core/result_store.py
+"""
+计算结果存储：每次运行一个文件，只追加写入，按园林分块、按列存放。
+
+_pack() 的结果每栋都带整份 building_data 与 rule；这里把结果展开成列
+（"results.roof.eave_z"、"results.roof_frame.rafters.positions" 等点分路径），
+规则按内容哈希去重、只存一次，各栋只存 rule_id。
+
+    with ResultStore("output/run.results") as store:
+        for row, packed in ...:
+            store.append(packed, row)
+
+    reader = ResultReader("output/run.results")
+    reader.read_columns(["basic_info.building_id", "results.roof.ridge_z"], gardens=["CC"])
+    reader.read_building("11")          # → [packed, ...]（编号可能重复）
+
+文件结构（小端）：
+    b"TARS0001"
+    记录 × N：  u64 头长度 | 头（JSON） | 载荷（各数组原始字节）
+        rule   {"type": "rule", "rule_id", "rule"}            首次出现时写入，先于引用它的块
+        chunk  {"type": "chunk", "garden", "building_ids", "rows", "columns": {列: {kind, parts}}}
+        index  {"type": "index", "chunks": [...], "rules": {...}}    close() 时写入
+    u64 index 记录偏移 | b"TARSIDX1"
+
+- 一块只含一个园林（basic_info.garden_name）的至多 chunk_size 栋；按园林缓冲，满块即写
+- 读列只 seek 到所需块的所需数组，不读其它列；未正常 close 的文件按记录头顺序扫描恢复索引
+- 列的编码按块各自推断：
+    scalar  数值 / 布尔标量         values
+    string  字符串                  values（UTF-8 拼接）+ offsets
+    array   数组及数值列表（读回为 ndarray）  values（展平拼接）+ offsets + shapes
+    json    其它（字符串列表等）     同 string，内容为 JSON
+  有缺失时另存 valid；数据类（MeshData 等）以 "<路径>.__type__" 列记类型名，read_building 时还原
+"""
+import dataclasses
+import hashlib
+import json
+import logging
+import struct
+import time
+from collections import defaultdict
+from itertools import repeat
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from configs import ConfigManager
+
+from .serialization import to_jsonable
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"TARS0001"
+INDEX_MAGIC = b"TARSIDX1"
+_U64 = struct.Struct("<Q")
+
+TYPE_SUFFIX = ".__type__"
+RULE_ID = "rule_id"
+GARDEN_KEY = ("basic_info", "garden_name")
+
+
+# ================================================================
+# 展开 / 还原
+# ================================================================
+def flatten(node: Any, path: str = "", out: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """嵌套 dict / 数据类 → {点分路径: 叶子值}；空 dict 不产生列"""
+    out = {} if out is None else out
+    if dataclasses.is_dataclass(node) and not isinstance(node, type):
+        out[path + TYPE_SUFFIX] = type(node).__name__
+        node = {f.name: getattr(node, f.name) for f in dataclasses.fields(node)}
+    if isinstance(node, dict):
+        for key, value in node.items():
+            flatten(value, f"{path}.{key}" if path else str(key), out)
+    else:
+        out[path] = node
+    return out
+
+
+def _dataclass_types() -> Dict[str, type]:
+    from geometry.mesh import InstanceBatch, MeshData
+
+    from .calculators.structural_system.roof_frame_calculator import MemberArrays
+
+    return {cls.__name__: cls for cls in (MeshData, InstanceBatch, MemberArrays)}
+
+
+def unflatten(flat: Dict[str, Any]) -> dict:
+    """flatten 的逆：按路径重建嵌套 dict，带 __type__ 的节点还原为数据类"""
+    root: dict = {}
+    types = {}
+    for path, value in flat.items():
+        if path.endswith(TYPE_SUFFIX):
+            types[path[: -len(TYPE_SUFFIX)]] = value
+            continue
+        node = root
+        *parents, leaf = path.split(".")
+        for key in parents:
+            node = node.setdefault(key, {})
+        node[leaf] = value
+
+    registry = _dataclass_types() if types else {}
+
+    def build(node: dict, path: str):
+        for key, child in node.items():
+            if isinstance(child, dict):
+                node[key] = build(child, f"{path}.{key}" if path else key)
+        cls = registry.get(types.get(path))
+        return cls(**node) if cls is not None else node
+
+    return build(root, "")
+
+
+def rule_id_of(rule: dict) -> str:
+    text = json.dumps(to_jsonable(rule), sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.blake2s(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+# ================================================================
+# 列编码
+# ================================================================
+def _is_scalar(v) -> bool:
+    return isinstance(v, (bool, int, float, np.bool_, np.integer, np.floating)) or (
+        isinstance(v, np.ndarray) and v.ndim == 0 and v.dtype.kind in "biuf"
+    )
+
+
+def _is_array(v) -> bool:
+    if isinstance(v, np.ndarray):
+        return v.ndim > 0 and v.dtype.kind in "biuf"
+    return isinstance(v, (list, tuple)) and all(_is_scalar(x) for x in v)
+
+
+def _encode_bytes(texts: List[str]) -> Dict[str, np.ndarray]:
+    data = [t.encode("utf-8") for t in texts]
+    offsets = np.zeros(len(data) + 1, dtype=np.int64)
+    np.cumsum([len(d) for d in data], out=offsets[1:])
+    return {"values": np.frombuffer(b"".join(data), dtype=np.uint8), "offsets": offsets}
+
+
+def encode_column(values: List[Any]) -> Tuple[str, Dict[str, np.ndarray]]:
+    """一块中一列的各栋取值（缺失为 _MISSING）→ (kind, {部件名: 数组})"""
+    valid = np.array([v is not _MISSING for v in values], dtype=bool)
+    present = [v for v in values if v is not _MISSING]
+
+    if all(_is_scalar(v) for v in present):
+        kind = "scalar"
+        arr = np.asarray([np.asarray(v).item() for v in present])
+        filled = np.zeros(len(values), dtype=arr.dtype if arr.size else np.float64)
+        filled[valid] = arr
+        parts = {"values": filled}
+    elif all(isinstance(v, str) for v in present):
+        kind = "string"
+        parts = _encode_bytes([v if ok else "" for v, ok in zip(values, valid)])
+    elif all(_is_array(v) for v in present):
+        kind = "array"
+        arrays = [np.asarray(v) if ok else None for v, ok in zip(values, valid)]
+        ndim = max(a.ndim for a in arrays if a is not None)
+        dtype = np.result_type(*[a.dtype for a in arrays if a is not None])
+        shapes = np.zeros((len(values), ndim), dtype=np.int64)
+        for i, a in enumerate(arrays):
+            if a is not None:
+                shapes[i, ndim - a.ndim:] = a.shape
+                shapes[i, :ndim - a.ndim] = 1
+        sizes = shapes.prod(axis=1) * valid
+        offsets = np.zeros(len(values) + 1, dtype=np.int64)
+        np.cumsum(sizes, out=offsets[1:])
+        flat = [a.ravel() for a in arrays if a is not None]
+        parts = {
+            "values": np.concatenate(flat).astype(dtype, copy=False) if flat else np.empty(0, dtype),
+            "offsets": offsets,
+            "shapes": shapes,
+        }
+    else:
+        kind = "json"
+        parts = _encode_bytes([
+            json.dumps(to_jsonable(v), ensure_ascii=False) if ok else "" for v, ok in zip(values, valid)
+        ])
+    if not valid.all():
+        parts["valid"] = valid
+    return kind, parts
+
+
+def decode_column(kind: str, parts: Dict[str, np.ndarray], index: Optional[Sequence[int]] = None) -> List[Any]:
+    """encode_column 的逆；index 给出时只解码这些行。缺失为 None"""
+    n = len(parts["shapes"]) if kind == "array" else (
+        len(parts["values"]) if kind == "scalar" else len(parts["offsets"]) - 1
+    )
+    rows = range(n) if index is None else index
+    valid = parts.get("valid")
+
+    if kind == "scalar":
+        values = parts["values"][list(rows)].tolist()
+    elif kind == "array":
+        flat, offsets, shapes = parts["values"], parts["offsets"], parts["shapes"]
+        values = [flat[offsets[i]:offsets[i + 1]].reshape(shapes[i]) for i in rows]
+    else:
+        offsets, raw = parts["offsets"].tolist(), parts["values"].tobytes()
+        values = [raw[offsets[i]:offsets[i + 1]].decode("utf-8") for i in rows]
+        if kind == "json":
+            values = [json.loads(v) if v else None for v in values]
+    if valid is not None:
+        values = [v if valid[i] else None for v, i in zip(values, rows)]
+    return values
+
+
+class _Missing:
+    def __repr__(self):
+        return "<missing>"
+
+
+_MISSING = _Missing()
+
+
+# ================================================================
+# 写入
+# ================================================================
+class ResultStore:
+    """
+    path       : 输出文件；None 时在 [paths] output_dir 下按时间戳命名
+    chunk_size : 每块栋数（缺省 base_config.toml [store] chunk_size）
+    """
+
+    def __init__(self, path=None, chunk_size: Optional[int] = None):
+        if path is None:
+            out_dir = Path(ConfigManager.get_base_config("paths", "output_dir", "output/"))
+            path = out_dir / f"results_{time.strftime('%Y%m%d_%H%M%S')}.results"
+        self.path = Path(path)
+        self.chunk_size = int(chunk_size or ConfigManager.get_base_config("store", "chunk_size", 256))
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "xb")          # 每次运行一个新文件，不覆盖
+        self._file.write(MAGIC)
+        self._buffers: Dict[str, List[Tuple[Optional[int], dict]]] = defaultdict(list)
+        self._chunks: List[dict] = []
+        self._rules: Dict[str, int] = {}             # rule_id → 记录偏移
+        self._rule_ids: Dict[int, Tuple[dict, str]] = {}   # id(rule) → (rule, rule_id)，同桶共用一份规则对象
+        self.count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -------------------------------------------------------
+    # 记录
+    # -------------------------------------------------------
+    def _write_record(self, header: dict, parts: Sequence[np.ndarray] = ()) -> int:
+        offset = self._file.tell()
+        head = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self._file.write(_U64.pack(len(head)))
+        self._file.write(head)
+        for arr in parts:
+            self._file.write(np.ascontiguousarray(arr).tobytes())
+        return offset
+
+    def _rule_id(self, rule: dict) -> str:
+        cached = self._rule_ids.get(id(rule))
+        if cached is not None and cached[0] is rule:
+            return cached[1]
+        rule_id = rule_id_of(rule)
+        self._rule_ids[id(rule)] = (rule, rule_id)
+        if rule_id not in self._rules:
+            self._rules[rule_id] = self._write_record(
+                {"type": "rule", "rule_id": rule_id, "rule": to_jsonable(rule)}
+            )
+        return rule_id
+
+    # -------------------------------------------------------
+    # 追加
+    # -------------------------------------------------------
+    def append(self, packed: dict, row: Optional[int] = None):
+        """追加一栋的 _pack() 结果；row 为测绘表行号（可选，随块存放）"""
+        garden = str(packed.get(GARDEN_KEY[0], {}).get(GARDEN_KEY[1]) or "")
+        flat = flatten({k: v for k, v in packed.items() if k != "rule"})
+        flat[RULE_ID] = self._rule_id(packed.get("rule") or {})
+        self._buffers[garden].append((row, flat))
+        self.count += 1
+        if len(self._buffers[garden]) >= self.chunk_size:
+            self.flush(garden)
+
+    def extend(self, packed: Iterable[Optional[dict]], rows: Optional[Iterable[int]] = None):
+        """批量追加（如 FormScheduler.run 的结果）；None 跳过"""
+        rows = rows if rows is not None else repeat(None)
+        for row, p in zip(rows, packed):
+            if p is not None:
+                self.append(p, row)
+
+    def flush(self, garden: Optional[str] = None):
+        """把缓冲写成块；garden 为 None 时写出全部园林"""
+        for name in ([garden] if garden is not None else list(self._buffers)):
+            buffered = self._buffers.pop(name, [])
+            if buffered:
+                self._write_chunk(name, buffered)
+
+    def _write_chunk(self, garden: str, buffered: List[Tuple[Optional[int], dict]]):
+        names = list(dict.fromkeys(col for _, flat in buffered for col in flat))
+        columns, arrays, pos = {}, [], 0
+        for col in names:
+            kind, parts = encode_column([flat.get(col, _MISSING) for _, flat in buffered])
+            spec = {}
+            for part, arr in parts.items():
+                arr = np.ascontiguousarray(arr)
+                spec[part] = [pos, arr.dtype.str, list(arr.shape)]
+                pos += arr.nbytes
+                arrays.append(arr)
+            columns[col] = {"kind": kind, "parts": spec}
+
+        building_ids = [str(flat.get("basic_info.building_id", "")) for _, flat in buffered]
+        rows = [row for row, _ in buffered]
+        header = {"type": "chunk", "garden": garden, "building_ids": building_ids, "rows": rows,
+                  "columns": columns, "payload": pos}
+        offset = self._write_record(header, arrays)
+        self._chunks.append({"offset": offset, "garden": garden, "building_ids": building_ids, "rows": rows})
+
+    def close(self):
+        """写出剩余缓冲与索引；之后文件只读"""
+        if self._file.closed:
+            return
+        self.flush()
+        index = self._write_record({"type": "index", "chunks": self._chunks, "rules": self._rules})
+        self._file.write(_U64.pack(index))
+        self._file.write(INDEX_MAGIC)
+        self._file.close()
+        logger.info(f"[Store] {self.path}：{self.count} 栋，{len(self._chunks)} 块，规则 {len(self._rules)} 份")
+
+
+# ================================================================
+# 读取
+# ================================================================
+class ResultReader:
+    """按列 / 按建筑编号选择性读取；只读索引与所需数组"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        if self._file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"不是结果存储文件：{self.path}")
+        self.chunks, self._rule_offsets = self._load_index()
+        self._headers: Dict[int, Tuple[dict, int]] = {}
+        self._rules: Dict[str, dict] = {}
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -------------------------------------------------------
+    # 索引
+    # -------------------------------------------------------
+    def _read_header(self, offset: int) -> Tuple[dict, int]:
+        """→ (头, 载荷起点)"""
+        self._file.seek(offset)
+        size = _U64.unpack(self._file.read(_U64.size))[0]
+        return json.loads(self._file.read(size)), offset + _U64.size + size
+
+    def _load_index(self) -> Tuple[List[dict], Dict[str, int]]:
+        f = self._file
+        end = f.seek(0, 2)
+        if end >= len(MAGIC) + _U64.size + len(INDEX_MAGIC):
+            f.seek(end - len(INDEX_MAGIC))
+            if f.read(len(INDEX_MAGIC)) == INDEX_MAGIC:
+                f.seek(end - len(INDEX_MAGIC) - _U64.size)
+                header, _ = self._read_header(_U64.unpack(f.read(_U64.size))[0])
+                return header["chunks"], header["rules"]
+
+        # 未正常关闭：顺序扫描记录头，丢弃写了一半的尾记录
+        logger.warning(f"[Store] {self.path} 无索引，按记录扫描")
+        chunks, rules, offset = [], {}, len(MAGIC)
+        while offset + _U64.size <= end:
+            try:
+                header, payload = self._read_header(offset)
+            except (ValueError, struct.error):
+                break
+            length = header.get("payload", 0)
+            if payload + length > end:
+                break
+            if header["type"] == "chunk":
+                chunks.append({k: header[k] for k in ("garden", "building_ids", "rows")} | {"offset": offset})
+            elif header["type"] == "rule":
+                rules[header["rule_id"]] = offset
+            offset = payload + length
+        return chunks, rules
+
+    def _chunk_header(self, i: int) -> Tuple[dict, int]:
+        if i not in self._headers:
+            self._headers[i] = self._read_header(self.chunks[i]["offset"])
+        return self._headers[i]
+
+    def _read_parts(self, i: int, column: str) -> Optional[Tuple[str, Dict[str, np.ndarray]]]:
+        header, payload = self._chunk_header(i)
+        spec = header["columns"].get(column)
+        if spec is None:
+            return None
+        parts = {}
+        for part, (pos, dtype, shape) in spec["parts"].items():
+            dtype = np.dtype(dtype)
+            count = int(np.prod(shape)) if shape else 1
+            self._file.seek(payload + pos)
+            parts[part] = np.frombuffer(self._file.read(count * dtype.itemsize), dtype=dtype).reshape(shape)
+        return spec["kind"], parts
+
+    # -------------------------------------------------------
+    # 查询
+    # -------------------------------------------------------
+    def gardens(self) -> List[str]:
+        return list(dict.fromkeys(c["garden"] for c in self.chunks))
+
+    def building_ids(self, gardens: Optional[Sequence[str]] = None) -> List[str]:
+        return [b for c in self._select(gardens) for b in self.chunks[c]["building_ids"]]
+
+    def columns(self) -> List[str]:
+        out = {}
+        for i in range(len(self.chunks)):
+            out.update(dict.fromkeys(self._chunk_header(i)[0]["columns"]))
+        return list(out)
+
+    def __len__(self) -> int:
+        return sum(len(c["building_ids"]) for c in self.chunks)
+
+    def _select(self, gardens: Optional[Sequence[str]]) -> List[int]:
+        return [i for i, c in enumerate(self.chunks) if gardens is None or c["garden"] in gardens]
+
+    def rule(self, rule_id: str) -> dict:
+        if rule_id not in self._rules:
+            if rule_id not in self._rule_offsets:
+                raise ValueError(f"未找到规则：{rule_id}")
+            self._rules[rule_id] = self._read_header(self._rule_offsets[rule_id])[0]["rule"]
+        return self._rules[rule_id]
+
+    def read_columns(
+        self,
+        columns: Sequence[str],
+        building_ids: Optional[Sequence[str]] = None,
+        gardens: Optional[Sequence[str]] = None,
+    ) -> Dict[str, list]:
+        """
+        若干列的取值（按块序，块内按写入序）；building_ids / gardens 给出时只取匹配的建筑。
+        另附 "_garden"、"_row" 两列标明每个值所属园林与测绘表行号。
+        """
+        wanted = None if building_ids is None else {str(b) for b in building_ids}
+        out: Dict[str, list] = {col: [] for col in ("_garden", "_row", *columns)}
+        for i in self._select(gardens):
+            chunk = self.chunks[i]
+            index = None if wanted is None else [
+                k for k, b in enumerate(chunk["building_ids"]) if b in wanted
+            ]
+            if index is not None and not index:
+                continue
+            n = len(chunk["building_ids"]) if index is None else len(index)
+            out["_garden"].extend([chunk["garden"]] * n)
+            rows = chunk["rows"] if index is None else [chunk["rows"][k] for k in index]
+            out["_row"].extend(rows)
+            for col in columns:
+                encoded = self._read_parts(i, col)
+                out[col].extend(decode_column(*encoded, index) if encoded else [None] * n)
+        return out
+
+    def read_column(self, column: str, **kwargs) -> list:
+        return self.read_columns([column], **kwargs)[column]
+
+    def read_building(self, building_id: str, gardens: Optional[Sequence[str]] = None,
+                      with_rule: bool = True) -> List[dict]:
+        """还原为 _pack() 同构的结果（建筑编号可能重复，返回全部匹配）"""
+        building_id = str(building_id)
+        out = []
+        for i in self._select(gardens):
+            index = [k for k, b in enumerate(self.chunks[i]["building_ids"]) if b == building_id]
+            if not index:
+                continue
+            header, _ = self._chunk_header(i)
+            decoded = {col: decode_column(*self._read_parts(i, col), index) for col in header["columns"]}
+            for j in range(len(index)):
+                flat = {col: values[j] for col, values in decoded.items() if values[j] is not None}
+                rule_id = flat.pop(RULE_ID, None)
+                packed = unflatten(flat)
+                if with_rule and rule_id is not None:
+                    packed["rule"] = self.rule(rule_id)
+                out.append(packed)
+        return out
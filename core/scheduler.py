@@ -0,0 +1,174 @@
+# core/scheduler.py
+"""
+按形态分桶调度：入库、推断之后，把全部建筑按（屋顶形式, 形态名）分桶，
+
+    1. 每桶只解析一次计算器类与形态规则（同桶计算器共用同一份只读规则）
+    2. 整桶交给计算器类的批量入口 calculate_all_batch()（无批量入口者逐栋 calculate_all()）
+    3. 结果按原行序还原
+
+混合形态的测绘表逐行跑 Generator 时，每行都要重新查类、查规则、单栋计算；
+分桶后调用次数等于桶数。桶键用入库时的术语编码（configs.Vocabulary），不比较中文串。
+
+某桶解析失败（无计算器 / 无规则）或某栋推断失败时，对应行结果为 None，原因记入 errors；
+整桶批量计算出错时退回逐栋计算，只让出错的那几栋失败。
+全部桶算完后整批做构造校验（structure_validator.validation_errors），
+有 error 级违规的行同样置 None 并记入 errors。
+"""
+import logging
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from configs import ConfigManager, Vocabulary
+
+from .calculator_factory import CalculatorFactory
+from .data_loader import DataLoader
+from .form_inferencer import FormInferencer
+from .memory_trace import MemoryTracer
+from .structure_validator import validation_errors
+
+logger = logging.getLogger(__name__)
+
+BucketKey = Tuple[int, int]
+
+# 缺测行推断时抛出的异常（nan 转 int、空开间等）
+INFER_ERRORS = (ValueError, TypeError, ZeroDivisionError, IndexError)
+
+
+def run_bucket(
+    roof_form: str,
+    form_name: str,
+    buildings: Sequence[dict],
+    spatial_index=None,
+) -> Tuple[List[Optional[dict]], List[Optional[str]]]:
+    """
+    同一（屋顶形式, 形态名）的一桶建筑：解析一次类与规则，整桶批量计算。
+    roof_form 为 ASCII 标识（或术语 / 编码），form_name 为中文形态名（规则键）。
+    返回与 buildings 同序的 (结果, 错误)，每栋二者之一为 None。
+    """
+    n = len(buildings)
+    try:
+        CalculatorClass = CalculatorFactory.resolve_class(roof_form)
+        form_rule = ConfigManager.get_building_rules(form_name)
+    except ValueError as e:
+        logger.warning(f"[Schedule] {roof_form}/{form_name} 跳过 {n} 栋：{e}")
+        return [None] * n, [str(e)] * n
+
+    with MemoryTracer.region(f"calculate:{CalculatorClass.__name__}", items=n):
+        # 计算器自身不登记空间索引：批量失败后逐栋重算时，已算过的构件会被登记两次
+        calcs = [CalculatorClass(data, form_rule) for data in buildings]
+
+        packed = errors = None
+        batch = getattr(CalculatorClass, "calculate_all_batch", None)
+        if batch is not None:
+            try:
+                packed, errors = list(batch(calcs)), [None] * n
+            except Exception as e:
+                logger.warning(f"[Schedule] {roof_form}/{form_name} 批量计算失败，逐栋重算：{e}")
+
+        if packed is None:
+            packed, errors = [], []
+            for calc in calcs:
+                try:
+                    packed.append(calc.calculate_all())
+                    errors.append(None)
+                except Exception as e:
+                    packed.append(None)
+                    errors.append(f"计算失败：{e}")
+
+        # 只登记最终成功的结果，每栋一次
+        if spatial_index is not None:
+            for result in packed:
+                if result is not None:
+                    spatial_index.add_components(result["results"], owner=result["basic_info"].get("building_id", ""))
+        return packed, errors
+
+
+class FormScheduler:
+    """
+    loader        : 已加载的 DataLoader
+    spatial_index : 可选 geometry.SpatialIndex，每桶计算成功后按建筑登记构件
+    validate      : 计算后做构造校验，未通过者记为失败
+    """
+
+    def __init__(self, loader: DataLoader, spatial_index=None, validate: bool = True):
+        self.loader = loader
+        self.spatial_index = spatial_index
+        self.validate = validate
+        self.errors: Dict[int, str] = {}
+        self.buckets: Dict[BucketKey, List[int]] = {}
+
+    # -------------------------------------------------------
+    # 推断与分桶
+    # -------------------------------------------------------
+    def infer(self, rows: Sequence[int]) -> Dict[int, dict]:
+        """逐行推断形态名；缺测等无法推断的行记入 errors"""
+        buildings = {}
+        with MemoryTracer.region("infer"):
+            for row in rows:
+                try:
+                    data = self.loader.get_complete_building_data(row)
+                    buildings[row] = FormInferencer(data).run()
+                except INFER_ERRORS as e:
+                    self.errors[row] = f"形态推断失败：{e}"
+        return buildings
+
+    def partition(self, buildings: Dict[int, dict]) -> Dict[BucketKey, List[int]]:
+        """按（屋顶形式编码, 形态名编码）分桶，桶内保持行序"""
+        rows = np.fromiter(buildings.keys(), dtype=np.int64, count=len(buildings))
+        if len(rows) == 0:
+            return {}
+        roof_codes = self.loader.get_column("屋顶形式", as_code=True)[rows]
+        form_codes = Vocabulary.encode([buildings[r]["category_info"]["form_name"] for r in rows])
+
+        buckets = defaultdict(list)
+        for row, roof, form in zip(rows.tolist(), roof_codes.tolist(), form_codes.tolist()):
+            buckets[(roof, form)].append(row)
+        return dict(buckets)
+
+    # -------------------------------------------------------
+    # 计算
+    # -------------------------------------------------------
+    def _run_bucket(self, key: BucketKey, rows: List[int], buildings: Dict[int, dict]) -> Dict[int, dict]:
+        roof_code, form_code = key
+        packed, errors = run_bucket(
+            Vocabulary.ascii_id(roof_code), Vocabulary.term(form_code), [buildings[row] for row in rows],
+            self.spatial_index,
+        )
+        out = {}
+        for row, result, error in zip(rows, packed, errors):
+            if result is None:
+                self.errors[row] = error
+            else:
+                out[row] = result
+        return out
+
+    def run(self, rows: Optional[Sequence[int]] = None) -> List[Optional[dict]]:
+        """
+        rows 缺省为全部建筑；返回与 rows 同序的结果列表，失败行为 None（原因见 errors）
+        """
+        if rows is None:
+            rows = range(self.loader.get_building_count())
+        rows = list(rows)
+        self.errors = {}
+
+        buildings = self.infer(rows)
+        self.buckets = self.partition(buildings)
+
+        packed = {}
+        for key, bucket_rows in self.buckets.items():
+            packed.update(self._run_bucket(key, bucket_rows, buildings))
+
+        if self.validate and packed:
+            with MemoryTracer.region("validate", items=len(packed)):
+                for row, error in zip(list(packed), validation_errors(list(packed.values()))):
+                    if error is not None:
+                        self.errors[row] = error
+                        del packed[row]
+
+        logger.info(
+            f"[Schedule] {len(rows)} 栋，{len(self.buckets)} 桶，"
+            f"成功 {len(packed)}，失败 {len(self.errors)}"
+        )
+        return [packed.get(row) for row in rows]
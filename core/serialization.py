@@ -0,0 +1,32 @@
+# core/serialization.py
+"""
+计算结果 → JSON 可序列化对象，常驻服务（core.server）与结果库（core.result_store）共用。
+"""
+import dataclasses
+from typing import Any
+
+import numpy as np
+
+
+def to_jsonable(obj: Any, summary: bool = False) -> Any:
+    """计算结果 → JSON 可序列化对象；nan / inf 写为 null；summary 时数组只给形状"""
+    if isinstance(obj, dict):
+        return {str(k): to_jsonable(v, summary) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [to_jsonable(v, summary) for v in obj]
+    if isinstance(obj, np.ndarray):
+        if summary and obj.ndim > 0:
+            return {"shape": list(obj.shape)}
+        if obj.dtype.kind == "f":
+            return np.where(np.isfinite(obj), obj, None).tolist()
+        return obj.tolist()
+    if isinstance(obj, (np.floating, float)):
+        return float(obj) if np.isfinite(obj) else None
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, np.bool_):
+        return bool(obj)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        fields = {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj)}
+        return {"type": type(obj).__name__, **to_jsonable(fields, summary)}
+    return obj
@@ -0,0 +1,322 @@
+# core/server.py
+"""
+常驻服务：规则、术语表、计算器类、斗拱网格缓存与已加载的测绘表常驻内存，
+本地 HTTP（TCP 或 Unix 套接字）接口按需计算，免去每次启动的导入与解析开销。
+
+    python -m core.server --port 8765
+    python -m core.server --socket /tmp/test_arch.sock
+
+接口（JSON）：
+    GET  /health                      状态与缓存命中统计
+    POST /building                    {"building_data": {...}, "detail": "full" | "summary"}
+    POST /batch                       {"buildings": [{...}, ...], "detail": ...}
+    POST /survey                      {"path": "data/data.csv", "rows": [0, 1], "detail": ...}
+                                      path 须在数据目录（[paths] data_dir）之内
+    POST /cache/clear                 清空结果缓存
+
+building_data 与 DataLoader.get_complete_building_data() 同构（数组写作列表，缺测写 null）；
+缺 form_name 时先做形态推断。结果按输入内容的哈希缓存（LRU），命中时直接返回已序列化的字节。
+detail = "summary" 时只返回标量与数组形状，不序列化网格。
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from socketserver import ThreadingMixIn, UnixStreamServer
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from configs import ConfigManager, Vocabulary
+from configs.config_manager import ClassRegistry
+
+from .calculator_factory import CalculatorFactory
+from .data_loader import DataLoader
+from .form_inferencer import FormInferencer
+from .scheduler import INFER_ERRORS, run_bucket
+from .serialization import to_jsonable
+
+logger = logging.getLogger(__name__)
+
+DETAILS = ("full", "summary")
+
+
+# ================================================================
+# 输入
+# ================================================================
+def _from_json(building_data: dict) -> dict:
+    """JSON 输入 → 计算器所需结构：尺寸数组还原为 ndarray，null 还原为 nan"""
+    data = {key: dict(building_data.get(key) or {}) for key in (
+        "basic_info", "category_info", "precision_info", "dimension_info", "unit_info",
+    )}
+    dim = data["dimension_info"]
+    for key, value in dim.items():
+        if value is None:
+            dim[key] = np.nan
+        elif isinstance(value, list):
+            dim[key] = np.array([np.nan if v is None else v for v in value], dtype=np.float64)
+    if "bay_widths" in dim and "num_bays" not in dim:
+        dim["num_bays"] = len(dim["bay_widths"]) * 2 - 1
+    return data
+
+
+def input_hash(building_data: dict, detail: str) -> str:
+    text = json.dumps(building_data, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(f"{detail}\n{text}".encode("utf-8")).hexdigest()
+
+
+# ================================================================
+# 服务
+# ================================================================
+class BuildingService:
+    """
+    常驻状态与计算入口（与传输层无关，可直接在进程内调用）。
+    cache_size : 结果缓存条数（LRU）
+    data_dir   : 允许读取的测绘表目录，缺省读 base_config.toml [paths] data_dir
+    """
+
+    def __init__(self, cache_size: int = 4096, data_dir: Optional[str] = None):
+        self.cache_size = cache_size
+        self.data_dir = Path(data_dir or ConfigManager.get_base_config("paths", "data_dir", "data/")).resolve()
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._surveys: Dict[str, DataLoader] = {}
+        self._lock = threading.RLock()
+        self.stats = defaultdict(int)
+        self.started = time.time()
+
+    def warm_up(self):
+        """加载全部配置、术语表与计算器类"""
+        t = time.perf_counter()
+        ConfigManager._initialize()
+        Vocabulary._initialize()
+        for roof_form in ClassRegistry._mapping.get("roof_forms", {}):
+            try:
+                CalculatorFactory.resolve_class(roof_form)
+            except (ImportError, AttributeError, ValueError) as e:
+                logger.warning(f"[Server] 计算器类 {roof_form} 加载失败：{e}")
+        logger.info(f"[Server] 预热完成 {time.perf_counter() - t:.2f}s")
+
+    # -------------------------------------------------------
+    # 缓存
+    # -------------------------------------------------------
+    def _cache_get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            payload = self._cache.get(key)
+            if payload is not None:
+                self._cache.move_to_end(key)
+                self.stats["cache_hits"] += 1
+            else:
+                self.stats["cache_misses"] += 1
+            return payload
+
+    def _cache_put(self, key: str, payload: bytes):
+        with self._lock:
+            self._cache[key] = payload
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def clear_cache(self) -> int:
+        with self._lock:
+            n = len(self._cache)
+            self._cache.clear()
+            return n
+
+    # -------------------------------------------------------
+    # 计算
+    # -------------------------------------------------------
+    @staticmethod
+    def _encode(packed: Optional[dict], error: Optional[str], detail: str) -> bytes:
+        body = {"ok": packed is not None}
+        if packed is None:
+            body["error"] = error
+        else:
+            body["result"] = to_jsonable(packed, summary=detail == "summary")
+        return json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def _compute(self, datas: List[dict]) -> List[Tuple[Optional[dict], Optional[str]]]:
+        """推断缺失的形态名，按（屋顶形式, 形态名）分桶批量计算"""
+        out: List[Tuple[Optional[dict], Optional[str]]] = [(None, None)] * len(datas)
+        buckets = defaultdict(list)
+        for i, data in enumerate(datas):
+            try:
+                if not data["category_info"].get("form_name"):
+                    FormInferencer(data).run()
+                cat = data["category_info"]
+                buckets[(Vocabulary.category_id(cat, "roof_forms"), Vocabulary.term(cat["form_name"], add=True))].append(i)
+            except INFER_ERRORS + (KeyError,) as e:
+                out[i] = (None, f"形态推断失败：{e}")
+
+        for (roof_form, form_name), idx in buckets.items():
+            packed, errors = run_bucket(roof_form, form_name, [datas[i] for i in idx])
+            for i, result, error in zip(idx, packed, errors):
+                out[i] = (result, error)
+        return out
+
+    def compute_batch(self, buildings: List[dict], detail: str = "full") -> List[bytes]:
+        """
+        每栋返回已序列化的 JSON 字节；命中缓存者不重算。
+        锁只护缓存与测绘表字典，计算本身不持锁，多个请求并行计算。
+        """
+        if detail not in DETAILS:
+            raise ValueError(f"未知的 detail：{detail}（可用：{', '.join(DETAILS)}）")
+        if not isinstance(buildings, list) or not all(isinstance(b, dict) for b in buildings):
+            raise ValueError("buildings 须为 building_data 对象列表")
+        keys = [input_hash(b, detail) for b in buildings]
+        payloads: List[Optional[bytes]] = [self._cache_get(k) for k in keys]
+
+        missing = [i for i, p in enumerate(payloads) if p is None]
+        if missing:
+            results = self._compute([_from_json(buildings[i]) for i in missing])
+            for i, (packed, error) in zip(missing, results):
+                payloads[i] = self._encode(packed, error, detail)
+                if packed is not None:
+                    self._cache_put(keys[i], payloads[i])
+        with self._lock:
+            self.stats["buildings"] += len(buildings)
+        return payloads
+
+    def compute(self, building_data: dict, detail: str = "full") -> bytes:
+        return self.compute_batch([building_data], detail)[0]
+
+    def _survey_path(self, path: str) -> str:
+        """测绘表路径（解析符号链接后）须落在 data_dir 之内"""
+        resolved = Path(path).resolve()
+        if not resolved.is_relative_to(self.data_dir):
+            raise ValueError(f"测绘表须位于数据目录 {self.data_dir} 之内：{path}")
+        return str(resolved)
+
+    def survey(self, path: str, rows: Optional[List[int]] = None, detail: str = "full") -> List[bytes]:
+        """已加载（或首次加载）的测绘表中若干行；读不成测绘表者报 ValueError"""
+        key = self._survey_path(path)
+        with self._lock:
+            loader = self._surveys.get(key)
+            if loader is None:
+                try:
+                    loader = DataLoader(key)
+                except (IndexError, KeyError, TypeError, ValueError, OSError) as e:
+                    raise ValueError(f"无法读取测绘表 {path}：{type(e).__name__}: {e}") from e
+                self._surveys[key] = loader
+        if rows is None:
+            rows = range(loader.get_building_count())
+        elif not isinstance(rows, list) or not all(isinstance(r, int) for r in rows):
+            raise ValueError("rows 须为行号（整数）列表")
+        buildings = [to_jsonable(loader.format_building(r)) for r in rows]
+        return self.compute_batch(buildings, detail)
+
+    def health(self) -> dict:
+        return {
+            "ok": True,
+            "uptime": round(time.time() - self.started, 1),
+            "pid": os.getpid(),
+            "cached_results": len(self._cache),
+            "surveys": list(self._surveys),
+            **self.stats,
+        }
+
+
+# ================================================================
+# HTTP 传输
+# ================================================================
+def _join(payloads: List[bytes]) -> bytes:
+    return b'{"ok":true,"results":[' + b",".join(payloads) + b"]}"
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    service: BuildingService = None
+    protocol_version = "HTTP/1.1"
+
+    def address_string(self) -> str:
+        # Unix 套接字的 client_address 为空串
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format, *args):
+        logger.debug(f"[Server] {self.address_string()} {format % args}")
+
+    def _send(self, status: int, payload: bytes):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _error(self, status: int, message: str):
+        self._send(status, json.dumps({"ok": False, "error": message}, ensure_ascii=False).encode("utf-8"))
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, json.dumps(self.service.health(), ensure_ascii=False).encode("utf-8"))
+        else:
+            self._error(404, f"未知路径：{self.path}")
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(body, dict):
+                return self._error(400, "请求体须为 JSON 对象")
+            detail = body.get("detail", "full")
+            if self.path == "/building":
+                payload = self.service.compute(body["building_data"], detail)
+            elif self.path == "/batch":
+                payload = _join(self.service.compute_batch(body["buildings"], detail))
+            elif self.path == "/survey":
+                payload = _join(self.service.survey(body["path"], body.get("rows"), detail))
+            elif self.path == "/cache/clear":
+                payload = json.dumps({"ok": True, "cleared": self.service.clear_cache()}).encode("utf-8")
+            else:
+                return self._error(404, f"未知路径：{self.path}")
+        except (KeyError, ValueError, OSError) as e:
+            return self._error(400, f"{type(e).__name__}: {e}")
+        self._send(200, payload)
+
+
+class UnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(service: BuildingService, host: str = "127.0.0.1", port: int = 8765, socket_path: str = None):
+    handler = type("BoundHandler", (ServiceHandler,), {"service": service})
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        return UnixHTTPServer(socket_path, handler)
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="test_arch 常驻计算服务")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--socket", default=None, help="Unix 套接字路径（给出时不监听 TCP）")
+    parser.add_argument("--cache-size", type=int, default=4096)
+    parser.add_argument("--data-dir", default=None, help="允许读取的测绘表目录（缺省 [paths] data_dir）")
+    parser.add_argument("--survey", action="append", default=[], help="启动时预加载的测绘表")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=ConfigManager.get_base_config("production", "log_level", "INFO"))
+    service = BuildingService(args.cache_size, args.data_dir)
+    service.warm_up()
+    for path in args.survey:
+        service.survey(path, detail="summary")
+
+    server = make_server(service, args.host, args.port, args.socket)
+    logger.info(f"[Server] 监听 {args.socket or f'{args.host}:{args.port}'}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+
+
+if __name__ == "__main__":
+    main()
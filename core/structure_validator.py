@@ -0,0 +1,425 @@
+# core/structure_validator.py
+"""
+构造校验（纯 NumPy，整批向量化）：在 Blender 组装前检查计算结果是否自洽。
+
+1. StructureArrays 把多栋建筑的结果拼成扁平数组，每行带所属建筑序号：
+       levels   (B,)  base / pillar_top / beam_top / eave / ridge / diameter
+       pillars  (P,)  x / y / top
+       beams    (M,)  两端 x / y，elevation
+       purlins  (L,)  line（檩线）/ x0 / x1（仅面阔向檩）
+       axes     (A,)  开间轴线 x
+       roof_members (R,)  檩、椽两端高出屋面的量（roof_frame_calculator.surface_gaps）
+   可由 ComponentCalcResult（含 Levels）或 calculator.calculate_all() 的返回构造；
+   后者的柱、梁取自 results["frame_members"]，无构件的建筑相应检查不参与。
+2. 每项检查是 CHECKS 中注册的一个谓词：输入 StructureArrays 与容差，
+   返回违规行的 (建筑序号, 偏差) 数组；容差、严重级别来自
+   configs/rules/validations.toml（tolerance_ratio × 檐柱径）。
+3. StructureValidator.run() 汇总为 ValidationReport；validate_stage()
+   作为流水线一步使用，有 error 级违规时抛出 StructureValidationError；
+   validation_errors() 给出逐栋的违规说明（Pipeline / FormScheduler 计算后调用）。
+"""
+import logging
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from configs.config_manager import RuleManager
+
+from .calculators.structural_system.roof_frame_calculator import surface_gaps
+
+logger = logging.getLogger(__name__)
+
+Violations = Tuple[np.ndarray, np.ndarray]
+CHECKS: Dict[str, Callable[["StructureArrays", np.ndarray], Violations]] = {}
+
+
+def register_check(name: str):
+    """注册检查谓词：fn(arrays, tol (B,)) -> (违规建筑序号, 偏差)"""
+    def wrap(fn):
+        CHECKS[name] = fn
+        return fn
+    return wrap
+
+
+class StructureValidationError(ValueError):
+    def __init__(self, report: "ValidationReport"):
+        self.report = report
+        super().__init__(f"构造校验未通过：\n{report.format()}")
+
+
+def _field(obj, key: str, default=None):
+    """兼容 dataclass 与 dict"""
+    if isinstance(obj, dict):
+        return obj.get(key, default)
+    return getattr(obj, key, default)
+
+
+def _table(columns: Dict[str, list]) -> Dict[str, np.ndarray]:
+    return {k: np.asarray(v, dtype=np.int64 if k in ("building", "line") else np.float64) for k, v in columns.items()}
+
+
+# ================================================================
+# 一、扁平数组
+# ================================================================
+@dataclass
+class StructureArrays:
+    building_ids: np.ndarray
+    levels: Dict[str, np.ndarray]
+    pillars: Dict[str, np.ndarray] = field(default_factory=dict)
+    beams: Dict[str, np.ndarray] = field(default_factory=dict)
+    purlins: Dict[str, np.ndarray] = field(default_factory=dict)
+    axes: Dict[str, np.ndarray] = field(default_factory=dict)
+    roof_members: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.building_ids)
+
+    @classmethod
+    def from_component_results(cls, results: Sequence, building_ids: Sequence[str] = None) -> "StructureArrays":
+        """ComponentCalcResult（或同结构 dict）列表"""
+        ids = list(building_ids) if building_ids is not None else [str(i) for i in range(len(results))]
+        lv = {k: [] for k in ("base", "pillar_top", "beam_top", "eave", "ridge", "diameter")}
+        pil = {"building": [], "x": [], "y": [], "top": []}
+        bm = {"building": [], "x0": [], "y0": [], "x1": [], "y1": [], "elevation": []}
+        ax = {"building": [], "x": []}
+
+        for b, res in enumerate(results):
+            levels, roof = _field(res, "levels"), _field(res, "roof")
+            lv["base"].append(_field(levels, "base"))
+            lv["pillar_top"].append(_field(levels, "pillar_top"))
+            lv["beam_top"].append(_field(levels, "beam_top"))
+            lv["eave"].append(_field(roof, "eave_height"))
+            lv["ridge"].append(_field(roof, "ridge_height"))
+            lv["diameter"].append(_field(res, "eave_diameter"))
+
+            for p in _field(res, "pillars") or []:
+                x, y, z = _field(p, "coord")
+                pil["building"].append(b)
+                pil["x"].append(x)
+                pil["y"].append(y)
+                pil["top"].append(z + _field(p, "height"))
+            for m in _field(res, "beams") or []:
+                (x0, y0, _), (x1, y1, _) = _field(m, "start"), _field(m, "end")
+                for k, v in zip(("building", "x0", "y0", "x1", "y1", "elevation"),
+                                (b, x0, y0, x1, y1, _field(m, "elevation"))):
+                    bm[k].append(v)
+            xs = _field(res, "x_grid") or []
+            ax["building"] += [b] * len(xs)
+            ax["x"] += list(xs)
+
+        return cls(np.asarray(ids), _table(lv), _table(pil), _table(bm), {}, _table(ax))
+
+    @classmethod
+    def from_packed(cls, packed_list: Sequence[dict]) -> "StructureArrays":
+        """
+        calculator.calculate_all() 的返回列表。柱底标高取 0；柱顶、梁顶取自
+        results["frame_members"] 的柱、梁（梁顶 = 梁中线 + 半截面），无梁者梁顶为 nan
+        """
+        ids, lv = [], {k: [] for k in ("base", "pillar_top", "beam_top", "eave", "ridge", "diameter")}
+        pil = {"building": [], "x": [], "y": [], "top": []}
+        bm = {"building": [], "x0": [], "y0": [], "x1": [], "y1": [], "elevation": []}
+        starts, ends, owner = [], [], []
+        ax = {"building": [], "x": []}
+        rm = {"building": [], "gap": []}
+
+        for b, packed in enumerate(packed_list):
+            res = packed["results"]
+            frame, roof = res["frame"], res["roof"]
+            ids.append(packed["basic_info"].get("building_id", str(b)))
+            members = res.get("frame_members") or {}
+            pillars, beams = members.get("pillars"), members.get("beams")
+            lv["base"].append(0.0)
+            lv["pillar_top"].append(frame["pillar_height"])
+            if pillars is not None and len(pillars):
+                top = np.maximum(pillars.positions[:, 2], pillars.ends[:, 2])
+                pil["building"].append(np.full(len(pillars), b))
+                pil["x"].append(pillars.positions[:, 0])
+                pil["y"].append(pillars.positions[:, 1])
+                pil["top"].append(top)
+                lv["pillar_top"][-1] = float(np.max(top))
+            if beams is not None and len(beams):
+                elevation = (beams.positions[:, 2] + beams.ends[:, 2]) / 2.0 + beams.diameter / 2.0
+                for k, v in zip(("building", "x0", "y0", "x1", "y1", "elevation"),
+                                (np.full(len(beams), b), beams.positions[:, 0], beams.positions[:, 1],
+                                 beams.ends[:, 0], beams.ends[:, 1], elevation)):
+                    bm[k].append(v)
+                lv["beam_top"].append(float(np.max(elevation)))
+            else:
+                lv["beam_top"].append(np.nan)
+            lv["eave"].append(roof["eave_z"])
+            lv["ridge"].append(roof["ridge_z"])
+            lv["diameter"].append(frame["pillar_diameter"])
+
+            roof_frame = res.get("roof_frame") or {}
+            purlins = roof_frame.get("purlins")
+            if purlins is not None and len(purlins):
+                # 山面交圈的檩沿 y，不参与檩线接缝检查
+                along_x = np.abs(purlins.directions[:, 0]) > 1.0 - 1e-9
+                starts.append(purlins.positions[along_x])
+                ends.append(purlins.ends[along_x])
+                owner.append(np.full(int(along_x.sum()), b))
+            if roof_frame.get("footprint") is not None:
+                for key in ("purlins", "rafters", "flying_rafters"):
+                    members = roof_frame.get(key)
+                    if members is not None and len(members):
+                        gap = surface_gaps(roof_frame["footprint"], members)
+                        rm["building"].append(np.full(len(gap), b))
+                        rm["gap"].append(gap)
+            xs = res["grid"]["x_coords"]
+            ax["building"] += [b] * len(xs)
+            ax["x"] += list(xs)
+
+        purlins = {}
+        if starts:
+            p0, p1, own = np.concatenate(starts), np.concatenate(ends), np.concatenate(owner)
+            # 檩线 = 同一建筑内 (y, z) 相同的檩段
+            key = np.column_stack([own, np.round(p0[:, 1:3], 6)])
+            _, line = np.unique(key, axis=0, return_inverse=True)
+            purlins = {
+                "building": own,
+                "line": line.reshape(-1),
+                "x0": np.minimum(p0[:, 0], p1[:, 0]),
+                "x1": np.maximum(p0[:, 0], p1[:, 0]),
+            }
+        def stacked(columns):
+            return _table({k: np.concatenate(v) if v else [] for k, v in columns.items()})
+
+        return cls(np.asarray(ids), _table(lv), stacked(pil), stacked(bm), purlins, _table(ax), stacked(rm))
+
+
+# ================================================================
+# 二、检查谓词
+# ================================================================
+def _nearest_sorted(keys: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """keys 已排序：每个 value 到 keys 中最近者的距离（keys 为空时 inf）"""
+    if len(keys) == 0:
+        return np.full(len(values), np.inf)
+    i = np.clip(np.searchsorted(keys, values), 1, len(keys) - 1) if len(keys) > 1 else np.zeros(len(values), int)
+    return np.minimum(np.abs(values - keys[i]), np.abs(values - keys[np.maximum(i - 1, 0)]))
+
+
+def _offset(building: np.ndarray, x: np.ndarray, span: float) -> np.ndarray:
+    """把各建筑的坐标错开到互不重叠的区间，便于一次排序 / 查找"""
+    return x + building * span
+
+
+@register_check("level_order")
+def check_level_order(a: StructureArrays, tol: np.ndarray) -> Violations:
+    """台基 < 柱顶 ≤ 梁顶；无梁（梁顶为 nan）者只查前一项"""
+    lv = a.levels
+    beam_gap = np.where(np.isnan(lv["beam_top"]), -np.inf, lv["pillar_top"] - lv["beam_top"] - tol)
+    gap = np.maximum(lv["base"] - lv["pillar_top"] + tol, beam_gap)
+    bad = np.flatnonzero(gap > 0)
+    return bad, gap[bad]
+
+
+@register_check("ridge_above_eave")
+def check_ridge_above_eave(a: StructureArrays, tol: np.ndarray) -> Violations:
+    gap = a.levels["eave"] + tol - a.levels["ridge"]
+    bad = np.flatnonzero(gap > 0)
+    return bad, gap[bad]
+
+
+@register_check("pillar_beam")
+def check_pillar_beam(a: StructureArrays, tol: np.ndarray) -> Violations:
+    """柱顶与同一平面位置上梁端标高之差的最小值超出容差"""
+    pil, bm = a.pillars, a.beams
+    if not pil or len(pil["building"]) == 0:
+        return np.zeros(0, dtype=int), np.zeros(0)
+    has_beams = np.bincount(bm.get("building", np.zeros(0, int)), minlength=len(a)) > 0
+
+    pb = pil["building"]
+    t = tol[pb]
+    # 梁端点表：(建筑, 量化 x, 量化 y) → 标高
+    q = float(np.max(tol)) if len(tol) and np.max(tol) > 0 else 1.0
+    ends_b = np.concatenate([bm["building"], bm["building"]])
+    ends_xy = np.concatenate([np.column_stack([bm["x0"], bm["y0"]]), np.column_stack([bm["x1"], bm["y1"]])])
+    ends_z = np.concatenate([bm["elevation"], bm["elevation"]])
+    cell = np.column_stack([ends_b, np.round(ends_xy / q).astype(np.int64)])
+    order = np.lexsort(cell.T[::-1])
+    cell, ends_z = cell[order], ends_z[order]
+
+    # 柱位及其相邻量化格（容差跨格）
+    best = np.full(len(pb), np.inf)
+    pxy = np.round(np.column_stack([pil["x"], pil["y"]]) / q).astype(np.int64)
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            key = np.column_stack([pb, pxy + (dx, dy)])
+            lo = _lexsearch(cell, key, "left")
+            hi = _lexsearch(cell, key, "right")
+            counts = hi - lo
+            owner = np.repeat(np.arange(len(pb)), counts)
+            idx = np.repeat(lo, counts) + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            diff = np.abs(ends_z[idx] - pil["top"][owner])
+            np.minimum.at(best, owner, diff)
+
+    bad = np.flatnonzero((best > t) & has_beams[pb])
+    return pb[bad], np.where(np.isfinite(best[bad]), best[bad], -1.0)
+
+
+def _lexsearch(sorted_rows: np.ndarray, rows: np.ndarray, side: str) -> np.ndarray:
+    """按行字典序对整数矩阵做 searchsorted（行视为结构化标量）"""
+    dtype = np.dtype([(f"f{i}", np.int64) for i in range(sorted_rows.shape[1])])
+    a = np.ascontiguousarray(sorted_rows).view(dtype).reshape(-1)
+    v = np.ascontiguousarray(rows).view(dtype).reshape(-1)
+    return np.searchsorted(a, v, side=side)
+
+
+@register_check("purlin_support")
+def check_purlin_support(a: StructureArrays, tol: np.ndarray) -> Violations:
+    """同一檩线相邻两段：接缝须落在轴线上、不得留空档"""
+    pu = a.purlins
+    if not pu or len(pu["line"]) == 0:
+        return np.zeros(0, dtype=int), np.zeros(0)
+
+    order = np.lexsort((pu["x0"], pu["line"]))
+    line, b = pu["line"][order], pu["building"][order]
+    x0, x1 = pu["x0"][order], pu["x1"][order]
+    joint = np.flatnonzero(line[1:] == line[:-1])          # 段 joint 与 joint+1 相接
+    jb = b[joint]
+    gap = np.abs(x0[joint + 1] - x1[joint])
+
+    span = 2.0 * max(np.max(np.abs(a.axes["x"])) if len(a.axes.get("x", [])) else 0.0,
+                     np.max(np.abs(np.concatenate([x0, x1])))) + 1.0
+    axes = np.sort(_offset(a.axes["building"], a.axes["x"], span))
+    off_axis = _nearest_sorted(axes, _offset(jb, x1[joint], span))
+
+    worst = np.maximum(gap, off_axis)
+    bad = np.flatnonzero(worst > tol[jb])
+    return jb[bad], worst[bad]
+
+
+@register_check("roof_members")
+def check_roof_members(a: StructureArrays, tol: np.ndarray) -> Violations:
+    """檩、椽、飞椽端点穿出屋面超出容差"""
+    rm = a.roof_members
+    if not rm or len(rm["building"]) == 0:
+        return np.zeros(0, dtype=int), np.zeros(0)
+    bad = np.flatnonzero(rm["gap"] > tol[rm["building"]])
+    return rm["building"][bad], rm["gap"][bad]
+
+
+# ================================================================
+# 三、报告与入口
+# ================================================================
+@dataclass
+class ValidationReport:
+    building_ids: np.ndarray
+    building: np.ndarray                # (V,) 违规所属建筑序号
+    check: np.ndarray                   # (V,) 检查名
+    deviation: np.ndarray               # (V,) 偏差（-1 表示无对应构件）
+    severity: Dict[str, str]
+
+    @property
+    def ok(self) -> bool:
+        return len(self.building) == 0
+
+    @property
+    def has_errors(self) -> bool:
+        return any(self.severity.get(c) == "error" for c in np.unique(self.check))
+
+    def failed_buildings(self) -> np.ndarray:
+        return np.unique(self.building)
+
+    def summary(self) -> Dict[str, Dict[str, Tuple[int, float]]]:
+        """{建筑编号: {检查名: (违规数, 最大偏差)}}"""
+        out: Dict[str, Dict[str, Tuple[int, float]]] = {}
+        if self.ok:
+            return out
+        key = np.column_stack([self.building, np.unique(self.check, return_inverse=True)[1].reshape(-1)])
+        groups, inverse, counts = np.unique(key, axis=0, return_inverse=True, return_counts=True)
+        worst = np.full(len(groups), -np.inf)
+        np.maximum.at(worst, inverse.reshape(-1), self.deviation)
+        names = np.unique(self.check)
+        for (b, c), n, w in zip(groups, counts, worst):
+            out.setdefault(str(self.building_ids[b]), {})[str(names[c])] = (int(n), float(w))
+        return out
+
+    def format(self) -> str:
+        lines = []
+        for bid, checks in self.summary().items():
+            items = ", ".join(f"{c}×{n} (max {w:.4g})" for c, (n, w) in checks.items())
+            lines.append(f"[{bid}] {items}")
+        return "\n".join(lines)
+
+
+class StructureValidator:
+    """
+    checks : 要执行的检查名，缺省为 validations.toml 中全部已注册者
+    """
+
+    def __init__(self, checks: Optional[Sequence[str]] = None):
+        RuleManager._initialize()
+        self.config = RuleManager._rules.get("validations", {}).get("validation", {})
+        self.checks = list(checks) if checks is not None else [c for c in self.config if c in CHECKS]
+
+    def run(self, arrays: StructureArrays) -> ValidationReport:
+        buildings, names, deviations = [], [], []
+        severity = {}
+        for name in self.checks:
+            cfg = self.config.get(name, {})
+            tol = arrays.levels["diameter"] * cfg.get("tolerance_ratio", 0.01)
+            b, dev = CHECKS[name](arrays, tol)
+            buildings.append(np.asarray(b, dtype=np.int64))
+            deviations.append(np.asarray(dev, dtype=np.float64))
+            names.append(np.full(len(b), name, dtype=object))
+            severity[name] = cfg.get("severity", "error")
+
+        report = ValidationReport(
+            arrays.building_ids,
+            np.concatenate(buildings) if buildings else np.zeros(0, dtype=np.int64),
+            np.concatenate(names) if names else np.zeros(0, dtype=object),
+            np.concatenate(deviations) if deviations else np.zeros(0),
+            severity,
+        )
+        logger.info(f"[Validate] {len(report.failed_buildings())}/{len(arrays)} 栋存在违规")
+        return report
+
+
+def validate_stage(packed_list: List[dict], abort: bool = True, checks: Sequence[str] = None) -> List[dict]:
+    """
+    流水线一步：校验 calculate_all() 的结果，原样返回；
+    abort=True 且有 error 级违规时抛出 StructureValidationError（在 Blender 组装之前）。
+    """
+    report = StructureValidator(checks).run(StructureArrays.from_packed(packed_list))
+    if not report.ok:
+        logger.warning(f"[Validate]\n{report.format()}")
+        if abort and report.has_errors:
+            raise StructureValidationError(report)
+    return packed_list
+
+
+def validation_errors(packed_list: Sequence[Optional[dict]], checks: Sequence[str] = None) -> List[Optional[str]]:
+    """
+    逐栋校验结果：与 packed_list 同序，有 error 级违规者为说明文字，否则 None；
+    packed_list 中的 None（计算失败）跳过。整批一次向量化校验。
+    """
+    idx = [i for i, packed in enumerate(packed_list) if packed is not None]
+    out: List[Optional[str]] = [None] * len(packed_list)
+    if not idx:
+        return out
+
+    report = StructureValidator(checks).run(StructureArrays.from_packed([packed_list[i] for i in idx]))
+    if report.ok:
+        return out
+    is_error = np.array([report.severity.get(c) == "error" for c in report.check], dtype=bool)
+    for b in np.unique(report.building[is_error]):
+        rows = is_error & (report.building == b)
+        names = ", ".join(sorted(set(report.check[rows].tolist())))
+        out[idx[b]] = f"构造校验未通过：{names}（最大偏差 {float(np.max(report.deviation[rows])):.4g}）"
+    return out
+
+
+if __name__ == "__main__":
+    from .data_loader import DataLoader
+    from .scheduler import FormScheduler
+
+    packed = [p for p in FormScheduler(DataLoader("data/data.csv")).run() if p is not None]
+    print(StructureValidator().run(StructureArrays.from_packed(packed)).format() or "全部通过")
+
+    # 柱梁交接失败的例子：把第一栋的梁整体压低 0.1 柱高，柱顶处找不到同高的梁端
+    beams = packed[0]["results"]["frame_members"]["beams"]
+    beams.positions[:, 2] -= 0.1 * packed[0]["results"]["frame"]["pillar_height"]
+    report = StructureValidator(["pillar_beam"]).run(StructureArrays.from_packed(packed[:1]))
+    print(report.format())
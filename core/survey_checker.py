@@ -0,0 +1,145 @@
+# core/survey_checker.py
+"""
+测绘数据一致性检查（整表向量化）：标注檐柱径 / 檐柱高与形态规则比较。
+
+对每一行：
+    1. 由 通进深 / 檐步架 / 屋脊类型 / 建筑等级 整列推出形态名（同 FormInferencer），
+       类别列用入库时的术语编码分组
+    2. 每个不同形态只查一次规则，得到 柱径基准 d（按表的 UnitSystem 换算）
+       与 柱高比 ratio = 柱高 / 柱径
+    3. 比较三项相对偏差，超出容差者标记：
+        diameter  |标注柱径 - d| / d
+        height    |标注檐柱高 - 柱径 × ratio| / (柱径 × ratio)，柱径取标注值，缺测取 d
+        ratio     |标注檐柱高 / 标注柱径 - ratio| / ratio（两者均有标注时）
+缺测项、无规则的形态不参与比较，不会被标记。
+"""
+import logging
+from typing import Dict
+
+import numpy as np
+
+from configs.config_manager import RuleManager
+from configs.vocabulary import Vocabulary
+
+from .data_loader import DataLoader
+from .form_inferencer import FormInferencer
+
+logger = logging.getLogger(__name__)
+
+CHECKS = ("diameter", "height", "ratio")
+
+
+class SurveyChecker:
+    """
+    loader    : 已加载的 DataLoader
+    tolerance : 相对偏差容差
+    """
+
+    def __init__(self, loader: DataLoader, tolerance: float = 0.15):
+        self.loader = loader
+        self.tolerance = tolerance
+
+    # -------------------------------------------------------
+    # 整列推断
+    # -------------------------------------------------------
+    def infer_form_names(self) -> np.ndarray:
+        """整列形态名，如 “六檩卷棚大式”；进深 / 檐步缺测者为空串"""
+        depth = self.loader.get_column("通进深", as_float=True)
+        step = self.loader.get_column("檐步架", as_float=True)
+        valid = np.isfinite(depth) & np.isfinite(step) & (step > 0)
+
+        num_lin = np.zeros(len(depth), dtype=int)
+        num_lin[valid] = (depth[valid] // step[valid]).astype(int) + 2
+
+        # 按 (檩数, 屋脊类型, 建筑等级) 编码去重，每个组合只拼一次形态名
+        keys = np.stack([
+            num_lin,
+            self.loader.get_column("屋脊类型", as_code=True),
+            self.loader.get_column("建筑等级", as_code=True),
+        ], axis=1)
+        uniq, inverse = np.unique(keys, axis=0, return_inverse=True)
+        names = np.array([
+            f"{FormInferencer._num_to_cn(int(n))}檩{Vocabulary.term(int(r))}{Vocabulary.term(int(g))}"
+            for n, r, g in uniq
+        ], dtype=str)
+        return np.where(valid, names[inverse.reshape(-1)], "")
+
+    @staticmethod
+    def rule_values(form_names: np.ndarray) -> Dict[str, np.ndarray]:
+        """每个不同形态查一次规则，展开为 {pillar_diameter, pillar_height_ratio}；无规则为 nan"""
+        uniq, inverse = np.unique(form_names, return_inverse=True)
+        d = np.full(len(uniq), np.nan)
+        ratio = np.full(len(uniq), np.nan)
+        for i, name in enumerate(uniq):
+            if not name:
+                continue
+            try:
+                rule = RuleManager.get_building_rules(str(name))
+            except ValueError:
+                logger.debug(f"[Survey] 无形态规则：{name}")
+                continue
+            # 缺省值与 BaseCalculator.calculate_frame_system 一致
+            d[i] = rule.get("pillar_diameter_base", 0.45)
+            ratio[i] = rule.get("pillar_height_ratio", 8.0)
+        return {"pillar_diameter": d[inverse], "pillar_height_ratio": ratio[inverse]}
+
+    # -------------------------------------------------------
+    # 检查
+    # -------------------------------------------------------
+    def run(self) -> Dict[str, np.ndarray]:
+        """
+        返回逐行数组（与 DataLoader 行序一致）：
+            building_id, form_name
+            pillar_height, pillar_diameter        标注值（缺测 nan）
+            rule_diameter, rule_ratio             规则值（无规则 nan）
+            deviation_<check>                     相对偏差（不可比 nan）
+            flag_<check>, flagged                 是否超出容差
+            rows                                  被标记的行号
+        """
+        h = self.loader.get_column("标注檐柱高", as_float=True)
+        d = self.loader.get_column("标注柱径", as_float=True)
+        form_names = self.infer_form_names()
+        rule = self.rule_values(form_names)
+        # 规则柱径为测绘单位，与已换算的标注值比较前同样换算
+        rule_d = self.loader.units.apply(rule["pillar_diameter"])
+        ratio = rule["pillar_height_ratio"]
+
+        expected_h = np.where(np.isfinite(d), d, rule_d) * ratio
+        with np.errstate(divide="ignore", invalid="ignore"):
+            deviation = {
+                "diameter": np.abs(d - rule_d) / rule_d,
+                "height": np.abs(h - expected_h) / expected_h,
+                "ratio": np.abs(h / d - ratio) / ratio,
+            }
+
+        report = {
+            "building_id": self.loader.get_column("建筑编号"),
+            "form_name": form_names,
+            "pillar_height": h,
+            "pillar_diameter": d,
+            "rule_diameter": rule_d,
+            "rule_ratio": ratio,
+        }
+        flagged = np.zeros(len(h), dtype=bool)
+        for check in CHECKS:
+            # nan 比较恒为 False：缺测或无规则者不标记
+            flag = deviation[check] > self.tolerance
+            report[f"deviation_{check}"] = deviation[check]
+            report[f"flag_{check}"] = flag
+            flagged |= flag
+        report["flagged"] = flagged
+        report["rows"] = np.flatnonzero(flagged)
+
+        logger.info(f"[Survey] {len(report['rows'])}/{len(h)} 行超出容差 {self.tolerance:.0%}")
+        return report
+
+    @staticmethod
+    def format_report(report: Dict[str, np.ndarray]) -> str:
+        """被标记行的可读摘要，每行一条"""
+        lines = []
+        for i in report["rows"]:
+            checks = ", ".join(
+                f"{c} {report[f'deviation_{c}'][i]:.0%}" for c in CHECKS if report[f"flag_{c}"][i]
+            )
+            lines.append(f"[{i}] {report['building_id'][i]} {report['form_name'][i]}: {checks}")
+        return "\n".join(lines)
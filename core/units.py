@@ -0,0 +1,76 @@
+# core/units.py
+"""
+单位与比例：测绘表中的尺寸为缩放单位（明间 = 1、通进深 = 1.5 …），
+在入库时按 base_config.toml 的 scale 整列换算一次，并量化到 precision，
+下游构件不再各自乘系数；量化后的数值可直接作为缓存键，避免浮点噪声。
+
+    [common]    scale = 100, unit = "meter"
+    [modeling]  scale = 100, precision = 1e-4
+"""
+from dataclasses import asdict, dataclass
+from typing import Any, Dict
+
+import numpy as np
+
+from configs.config_manager import ConfigManager
+
+# 参与换算的尺寸列（测绘表表头）
+DIMENSION_FIELDS = (
+    "明间", "次间", "二次间", "三次间", "四次间",
+    "通进深", "檐步架",
+    "标注檐柱高", "标注柱径", "标注台明高", "标注上出", "标注下出",
+)
+
+UNIT_TO_METER = {
+    "meter": 1.0, "meters": 1.0, "m": 1.0,
+    "centimeter": 0.01, "centimeters": 0.01, "cm": 0.01,
+    "millimeter": 0.001, "millimeters": 0.001, "mm": 0.001,
+}
+
+
+@dataclass(frozen=True)
+class UnitSystem:
+    """
+    scale     : 测绘值 → 模型长度的倍数
+    unit      : 模型长度单位
+    precision : 量化步长（模型单位）
+    """
+    scale: float = 1.0
+    unit: str = "meter"
+    precision: float = 1e-4
+
+    def __post_init__(self):
+        if self.unit not in UNIT_TO_METER:
+            raise ValueError(f"未知长度单位：{self.unit}")
+        if self.precision <= 0:
+            raise ValueError(f"precision 应为正数：{self.precision}")
+
+    @classmethod
+    def from_config(cls) -> "UnitSystem":
+        """读 base_config.toml：[modeling] 优先，缺省回退 [common]"""
+        common = ConfigManager.get_base_config("common")
+        modeling = ConfigManager.get_base_config("modeling")
+        return cls(
+            scale=float(modeling.get("scale", common.get("scale", 1.0))),
+            unit=common.get("unit", modeling.get("default_unit", "meter")),
+            precision=float(modeling.get("precision", 1e-4)),
+        )
+
+    @property
+    def meters_per_unit(self) -> float:
+        return UNIT_TO_METER[self.unit]
+
+    def quantize(self, values) -> np.ndarray:
+        """就近取整到 precision 的整数倍；nan 保持不变"""
+        values = np.asarray(values, dtype=np.float64)
+        return np.round(values / self.precision) * self.precision
+
+    def apply(self, values) -> np.ndarray:
+        """测绘值 → 模型长度（换算并量化），任意形状数组"""
+        return self.quantize(np.asarray(values, dtype=np.float64) * self.scale)
+
+    def to_meters(self, values) -> np.ndarray:
+        return np.asarray(values, dtype=np.float64) * self.meters_per_unit
+
+    def metadata(self) -> Dict[str, Any]:
+        return asdict(self)
@@ -0,0 +1,4 @@
+from .scene import batches_from_component_result, batches_from_packed
+from .gltf_exporter import export_glb
+from .obj_exporter import export_obj
+from .exporter import export_scene, export_component_result
@@ -0,0 +1,27 @@
+# -----------------------------------------------------------------------------
+# file: exporters/exporter.py
+# -----------------------------------------------------------------------------
+from pathlib import Path
+from typing import List
+
+from geometry.mesh import InstanceBatch
+from .gltf_exporter import export_glb
+from .obj_exporter import export_obj
+from .scene import batches_from_component_result
+
+EXPORTERS = {
+    ".glb": export_glb,
+    ".obj": export_obj,
+}
+
+
+def export_scene(batches: List[InstanceBatch], path) -> Path:
+    """按扩展名分发导出器（不依赖 Blender）"""
+    suffix = Path(path).suffix.lower()
+    if suffix not in EXPORTERS:
+        raise ValueError(f"不支持的导出格式：{suffix}（可用：{', '.join(EXPORTERS)}）")
+    return EXPORTERS[suffix](batches, path)
+
+
+def export_component_result(calc_result, path) -> Path:
+    return export_scene(batches_from_component_result(calc_result), path)
@@ -0,0 +1,128 @@
+# -----------------------------------------------------------------------------
+# file: exporters/gltf_exporter.py
+# -----------------------------------------------------------------------------
+"""
+glTF 2.0 二进制（.glb）导出，纯 NumPy + 标准库。
+
+- 每个 InstanceBatch 只写一份 mesh，每个实例为引用该 mesh 的 node（node 复用）
+- 项目坐标为 Z 向上，根节点旋转为 glTF 的 Y 向上
+"""
+import json
+import struct
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+from geometry.mesh import InstanceBatch
+
+GLB_MAGIC = 0x46546C67      # "glTF"
+CHUNK_JSON = 0x4E4F534A     # "JSON"
+CHUNK_BIN = 0x004E4942      # "BIN\0"
+
+COMPONENT_FLOAT = 5126
+COMPONENT_UINT32 = 5125
+TARGET_ARRAY_BUFFER = 34962
+TARGET_ELEMENT_ARRAY_BUFFER = 34963
+
+# Z-up → Y-up（列主序）
+Z_UP_TO_Y_UP = [1, 0, 0, 0, 0, 0, -1, 0, 0, 1, 0, 0, 0, 0, 0, 1]
+
+
+def _pad4(data: bytes, fill: bytes) -> bytes:
+    return data + fill * (-len(data) % 4)
+
+
+class _BinaryBuffer:
+    """累积 bufferView / accessor，所有二进制数据写入同一个 buffer"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.offset = 0
+        self.buffer_views: List[dict] = []
+        self.accessors: List[dict] = []
+
+    def add(self, array: np.ndarray, component_type: int, accessor_type: str, target: int, with_bounds=False) -> int:
+        data = array.tobytes()
+        self.buffer_views.append({
+            "buffer": 0, "byteOffset": self.offset, "byteLength": len(data), "target": target,
+        })
+        padded = _pad4(data, b"\x00")
+        self.chunks.append(padded)
+        self.offset += len(padded)
+
+        accessor = {
+            "bufferView": len(self.buffer_views) - 1,
+            "componentType": component_type,
+            "count": int(array.shape[0]) if accessor_type != "SCALAR" else int(array.size),
+            "type": accessor_type,
+        }
+        if with_bounds:
+            accessor["min"] = array.min(axis=0).tolist()
+            accessor["max"] = array.max(axis=0).tolist()
+        self.accessors.append(accessor)
+        return len(self.accessors) - 1
+
+    def tobytes(self) -> bytes:
+        return b"".join(self.chunks)
+
+
+def build_gltf(batches: List[InstanceBatch]):
+    """返回 (gltf_json: dict, binary: bytes)"""
+    buffer = _BinaryBuffer()
+    meshes, nodes = [], []
+    root_children = []
+
+    for batch in batches:
+        if batch.count == 0 or batch.mesh.num_faces == 0:
+            continue
+
+        positions = batch.mesh.vertices.astype(np.float32)
+        indices = batch.mesh.faces.astype(np.uint32).ravel()
+        pos_acc = buffer.add(positions, COMPONENT_FLOAT, "VEC3", TARGET_ARRAY_BUFFER, with_bounds=True)
+        idx_acc = buffer.add(indices, COMPONENT_UINT32, "SCALAR", TARGET_ELEMENT_ARRAY_BUFFER)
+
+        mesh_index = len(meshes)
+        meshes.append({
+            "name": batch.name,
+            "primitives": [{"attributes": {"POSITION": pos_acc}, "indices": idx_acc}],
+        })
+
+        # 列主序展开全部实例矩阵
+        flat = batch.matrices.transpose(0, 2, 1).reshape(-1, 16).tolist()
+        first = len(nodes) + 1
+        nodes.append({"name": batch.name, "children": list(range(first, first + batch.count))})
+        root_children.append(first - 1)
+        nodes.extend({"mesh": mesh_index, "matrix": m} for m in flat)
+
+    nodes.append({"name": "root", "matrix": Z_UP_TO_Y_UP, "children": root_children})
+
+    binary = buffer.tobytes()
+    gltf = {
+        "asset": {"version": "2.0", "generator": "test_arch exporters"},
+        "scene": 0,
+        "scenes": [{"nodes": [len(nodes) - 1]}],
+        "nodes": nodes,
+        "meshes": meshes,
+        "accessors": buffer.accessors,
+        "bufferViews": buffer.buffer_views,
+        "buffers": [{"byteLength": len(binary)}],
+    }
+    return gltf, binary
+
+
+def export_glb(batches: List[InstanceBatch], path) -> Path:
+    path = Path(path)
+    gltf, binary = build_gltf(batches)
+
+    json_chunk = _pad4(json.dumps(gltf, separators=(",", ":")).encode("utf-8"), b" ")
+    total = 12 + 8 + len(json_chunk) + 8 + len(binary)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(struct.pack("<III", GLB_MAGIC, 2, total))
+        f.write(struct.pack("<II", len(json_chunk), CHUNK_JSON))
+        f.write(json_chunk)
+        f.write(struct.pack("<II", len(binary), CHUNK_BIN))
+        f.write(binary)
+    return path
@@ -0,0 +1,32 @@
+# -----------------------------------------------------------------------------
+# file: exporters/obj_exporter.py
+# -----------------------------------------------------------------------------
+"""
+Wavefront OBJ 导出。OBJ 无实例化，按批次烘焙为世界坐标后整块写出
+（instance_mesh 对镜像实例反转面绕序）。
+"""
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+from geometry.mesh import InstanceBatch, instance_mesh
+
+
+def export_obj(batches: List[InstanceBatch], path) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    vertex_offset = 1  # OBJ 索引从 1 开始
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("# test_arch exporters\n")
+        for batch in batches:
+            if batch.count == 0:
+                continue
+            baked = instance_mesh(batch.mesh, batch.matrices)
+
+            f.write(f"o {batch.name}\n")
+            np.savetxt(f, baked.vertices, fmt="v %.6f %.6f %.6f")
+            np.savetxt(f, baked.faces + vertex_offset, fmt="f %d %d %d")
+            vertex_offset += baked.num_vertices
+    return path
@@ -0,0 +1,70 @@
+# -----------------------------------------------------------------------------
+# file: exporters/scene.py
+# -----------------------------------------------------------------------------
+"""
+计算结果 → InstanceBatch 列表（纯 NumPy，不依赖 bpy）。
+
+相同规格的柱 / 梁共用一个原型网格：
+- 柱：按 (直径, 高度) 分组，圆柱原型 + 平移矩阵
+- 梁：按 (截面宽, 截面高) 分组，单位长度长方体原型 + segment_transforms
+
+batches_from_packed() 收集屋面计算器 _pack() 结果中的全部构件
+（遍历见 geometry.batches，与 SpatialIndex.add_components 共用）；
+柱、枋、梁来自 results["frame_members"]（BaseCalculator.calculate_frame_members）。
+"""
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from geometry.batches import iter_instance_batches
+from geometry.mesh import InstanceBatch, box, cylinder
+from geometry.transforms import compose_transforms, segment_transforms
+
+PILLAR_SEGMENTS = 16
+
+
+def _field(spec, key: str):
+    """兼容 dataclass 与 dict"""
+    if isinstance(spec, dict):
+        return spec.get(key)
+    return getattr(spec, key, None)
+
+
+def _group_by(specs: list, keys: Tuple[str, ...]) -> Dict[tuple, list]:
+    groups: Dict[tuple, list] = {}
+    for spec in specs:
+        groups.setdefault(tuple(round(float(_field(spec, k)), 4) for k in keys), []).append(spec)
+    return groups
+
+
+def pillar_batches(pillars: list, collection: str = "main_body") -> List[InstanceBatch]:
+    batches = []
+    for (diameter, height), group in _group_by(pillars, ("diameter", "height")).items():
+        name = f"pillar_{diameter:.3f}_{height:.3f}"
+        proto = cylinder(diameter / 2.0, height, PILLAR_SEGMENTS, name=name)
+        coords = np.array([_field(p, "coord") for p in group], dtype=np.float64)
+        batches.append(InstanceBatch(name, proto, compose_transforms(coords), collection))
+    return batches
+
+
+def beam_batches(beams: list, collection: str = "main_body") -> List[InstanceBatch]:
+    batches = []
+    for (width, height), group in _group_by(beams, ("section_width", "section_height")).items():
+        name = f"beam_{width:.3f}_{height:.3f}"
+        proto = box((1.0, width, height), name=name)
+        starts = np.array([_field(b, "start") for b in group], dtype=np.float64)
+        ends = np.array([_field(b, "end") for b in group], dtype=np.float64)
+        batches.append(InstanceBatch(name, proto, segment_transforms(starts, ends), collection))
+    return batches
+
+
+def batches_from_component_result(calc_result) -> List[InstanceBatch]:
+    """ComponentCalcResult 或 dict-like → InstanceBatch 列表"""
+    pillars = _field(calc_result, "pillars") or []
+    beams = _field(calc_result, "beams") or []
+    return pillar_batches(pillars) + beam_batches(beams)
+
+
+def batches_from_packed(packed: dict, collection: str = "main_body") -> List[InstanceBatch]:
+    """BaseCalculator._pack() 的结果 → InstanceBatch 列表（网格以单位矩阵摆放）"""
+    return list(iter_instance_batches(packed.get("results", packed), "", collection))
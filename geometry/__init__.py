@@ -0,0 +1,3 @@
+from .transforms import compose_transforms, decompose_transforms, rotation_z, segment_transforms
+from .batches import iter_instance_batches
+from .spatial_index import SpatialIndex, aabb_distance, instance_aabbs
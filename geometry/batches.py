@@ -0,0 +1,64 @@
+# -----------------------------------------------------------------------------
+# file: geometry/batches.py
+# -----------------------------------------------------------------------------
+"""
+计算结果遍历：屋面计算器 _pack() 的嵌套结果 → InstanceBatch 序列。
+
+exporters.batches_from_packed() 与 SpatialIndex.add_components() 共用这一遍历，
+识别的构件形式：
+    InstanceBatch                         原样产出
+    MeshData                              单位矩阵摆放一次
+    线状构件数组（有 transforms、diameter） 单位长度原型，截面边长 / 直径取构件径
+                                          （round_section 者为圆截面，如柱）
+    {"meshes": {种类: MeshData}, "placements": {种类: (N, 4, 4)}}（斗拱）
+    (…, 4, 4) 单位长度线段变换 + 同级 rafter_diameter（翼角椽）
+其余字典 / 列表逐层递归，名称按路径拼接（"roof_frame.purlins"、"walls[0]"）。
+"""
+from typing import Iterator
+
+import numpy as np
+
+from .mesh import InstanceBatch, MeshData, box, cylinder
+
+IDENTITY = np.eye(4)
+ROUND_SEGMENTS = 16
+
+
+def _rod(diameter: float, name: str) -> MeshData:
+    """以原点为中心、沿 X 的单位长度圆截面原型（cylinder 绕 Y 轴转 90°）"""
+    proto = cylinder(diameter / 2.0, 1.0, ROUND_SEGMENTS, name=name)
+    v = proto.vertices
+    return MeshData(np.column_stack([v[:, 2] - 0.5, v[:, 1], -v[:, 0]]), proto.faces, name=name)
+
+
+def _is_transform_array(value) -> bool:
+    return isinstance(value, np.ndarray) and value.ndim >= 3 and value.shape[-2:] == (4, 4)
+
+
+def iter_instance_batches(components, name: str = "", collection: str = "") -> Iterator[InstanceBatch]:
+    if isinstance(components, InstanceBatch):
+        yield components
+    elif isinstance(components, MeshData):
+        yield InstanceBatch(components.name or name, components, IDENTITY, collection)
+    elif all(hasattr(components, a) for a in ("transforms", "diameter")):
+        if len(components):
+            d = float(components.diameter) or 1.0
+            proto = _rod(d, name) if getattr(components, "round_section", False) else box((1.0, d, d), name=name)
+            yield InstanceBatch(name, proto, components.transforms(), collection)
+    elif isinstance(components, dict):
+        if "meshes" in components and "placements" in components:
+            for kind, matrices in components["placements"].items():
+                mesh = components["meshes"].get(kind)
+                if mesh is not None and len(matrices):
+                    yield InstanceBatch(f"{name}.{kind}" if name else kind, mesh, matrices, collection)
+            return
+        d = float(components.get("rafter_diameter", 0.0)) or 1.0
+        for key, value in components.items():
+            path = f"{name}.{key}" if name else str(key)
+            if _is_transform_array(value):
+                yield InstanceBatch(path, box((1.0, d, d), name=path), value.reshape(-1, 4, 4), collection)
+            else:
+                yield from iter_instance_batches(value, path, collection)
+    elif isinstance(components, (list, tuple)):
+        for i, value in enumerate(components):
+            yield from iter_instance_batches(value, f"{name}[{i}]", collection)
@@ -0,0 +1,133 @@
+# -----------------------------------------------------------------------------
+# file: geometry/mesh.py
+# -----------------------------------------------------------------------------
+"""
+纯数组网格（不依赖 bpy）：
+- MeshData：vertices (N, 3) float64 + faces (M, 3) int64（统一三角面）
+- 基本体：box / cylinder
+- 批量变换与合并：instance_mesh / merge_meshes
+- InstanceBatch：一个原型 + (N, 4, 4) 摆放，供导出 / 写入层复用原型
+"""
+from dataclasses import dataclass, field
+from typing import List
+
+import numpy as np
+
+
+@dataclass
+class MeshData:
+    vertices: np.ndarray
+    faces: np.ndarray
+    name: str = ""
+    metadata: dict = field(default_factory=dict)
+
+    def __post_init__(self):
+        self.vertices = np.asarray(self.vertices, dtype=np.float64).reshape(-1, 3)
+        self.faces = np.asarray(self.faces, dtype=np.int64).reshape(-1, 3)
+
+    @property
+    def num_vertices(self) -> int:
+        return len(self.vertices)
+
+    @property
+    def num_faces(self) -> int:
+        return len(self.faces)
+
+    def transformed(self, matrix: np.ndarray) -> "MeshData":
+        return instance_mesh(self, np.asarray(matrix).reshape(1, 4, 4), name=self.name)
+
+
+@dataclass
+class InstanceBatch:
+    """同一原型的全部摆放"""
+    name: str
+    mesh: MeshData
+    matrices: np.ndarray
+    collection: str = ""
+
+    def __post_init__(self):
+        self.matrices = np.asarray(self.matrices, dtype=np.float64).reshape(-1, 4, 4)
+
+    @property
+    def count(self) -> int:
+        return len(self.matrices)
+
+
+# ================================================================
+# 基本体
+# ================================================================
+def box(size=(1.0, 1.0, 1.0), name: str = "box") -> MeshData:
+    """以原点为中心的长方体"""
+    half = np.asarray(size, dtype=np.float64) / 2.0
+    signs = np.array(
+        [[-1, -1, -1], [1, -1, -1], [1, 1, -1], [-1, 1, -1],
+         [-1, -1, 1], [1, -1, 1], [1, 1, 1], [-1, 1, 1]],
+        dtype=np.float64,
+    )
+    faces = np.array(
+        [[0, 2, 1], [0, 3, 2],      # 底
+         [4, 5, 6], [4, 6, 7],      # 顶
+         [0, 1, 5], [0, 5, 4],      # 前
+         [1, 2, 6], [1, 6, 5],      # 右
+         [2, 3, 7], [2, 7, 6],      # 后
+         [3, 0, 4], [3, 4, 7]],     # 左
+    )
+    return MeshData(signs * half, faces, name=name)
+
+
+def cylinder(radius: float, height: float, segments: int = 16, name: str = "cylinder") -> MeshData:
+    """底面圆心位于原点、沿 +Z 的圆柱（柱子原型）"""
+    theta = np.linspace(0.0, 2.0 * np.pi, segments, endpoint=False)
+    ring = np.stack([radius * np.cos(theta), radius * np.sin(theta)], axis=1)
+
+    bottom = np.column_stack([ring, np.zeros(segments)])
+    top = np.column_stack([ring, np.full(segments, float(height))])
+    centers = np.array([[0.0, 0.0, 0.0], [0.0, 0.0, float(height)]])
+    vertices = np.vstack([bottom, top, centers])
+
+    i = np.arange(segments)
+    j = (i + 1) % segments
+    cb, ct = 2 * segments, 2 * segments + 1
+    side = np.concatenate([
+        np.stack([i, j, j + segments], axis=1),
+        np.stack([i, j + segments, i + segments], axis=1),
+    ])
+    caps = np.concatenate([
+        np.stack([np.full(segments, cb), j, i], axis=1),
+        np.stack([np.full(segments, ct), i + segments, j + segments], axis=1),
+    ])
+    return MeshData(vertices, np.concatenate([side, caps]), name=name)
+
+
+# ================================================================
+# 批量变换 / 合并
+# ================================================================
+def instance_mesh(mesh: MeshData, matrices: np.ndarray, name: str = "") -> MeshData:
+    """
+    将一个网格按 (N, 4, 4) 矩阵复制为一个合并网格（一次 einsum）。
+    镜像矩阵（det < 0，如对角翼角）的副本反转面绕序，法线仍朝外。
+    """
+    m = np.asarray(matrices, dtype=np.float64).reshape(-1, 4, 4)
+    n, nv = len(m), mesh.num_vertices
+
+    verts = np.einsum("nij,vj->nvi", m[:, :3, :3], mesh.vertices) + m[:, None, :3, 3]
+    offsets = (np.arange(n) * nv)[:, None, None]
+    faces = np.repeat(mesh.faces[None, :, :], n, axis=0)
+    mirrored = np.linalg.det(m[:, :3, :3]) < 0.0
+    faces[mirrored] = faces[mirrored][:, :, ::-1]
+    faces = faces + offsets
+
+    return MeshData(verts.reshape(-1, 3), faces.reshape(-1, 3), name=name or mesh.name)
+
+
+def merge_meshes(meshes: List[MeshData], name: str = "") -> MeshData:
+    """多个网格合并为一个（面索引按顶点偏移）"""
+    if not meshes:
+        return MeshData(np.zeros((0, 3)), np.zeros((0, 3)), name=name)
+
+    counts = np.array([m.num_vertices for m in meshes])
+    offsets = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+    vertices = np.concatenate([m.vertices for m in meshes])
+    faces = np.concatenate([m.faces + off for m, off in zip(meshes, offsets)])
+    return MeshData(vertices, faces, name=name)
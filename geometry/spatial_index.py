@@ -0,0 +1,363 @@
+# -----------------------------------------------------------------------------
+# file: geometry/spatial_index.py
+# -----------------------------------------------------------------------------
+"""
+构件包围盒（AABB）空间索引（纯 NumPy，均匀网格）。
+
+- 每个构件一条 AABB：(mins, maxs)，附 名称 / 所属（建筑编号等）/ 批内序号
+- 逐批追加（add_*）；查询前只把新增批次展开为 (单元键, 构件) 对，
+  再与已有各批合并排序，索引不必整体重建
+- 查询全部批量：overlapping_pairs()、query_region()、nearest()
+
+网格单元边长缺省取首次查询时全部构件尺寸的中位数，此后固定。跨越单元过多的大构件
+（台明、屋面整片网格等）不进网格，单独与候选逐一比较。
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .batches import iter_instance_batches
+from .mesh import InstanceBatch, MeshData
+
+MAX_CELLS_PER_BOX = 64
+BRUTE_FORCE_BLOCK = 1 << 20     # 直接比较时每块 点数 × 构件数 上限
+_BITS = 21
+_OFFSET = 1 << (_BITS - 1)
+
+
+def _cell_keys(cells: np.ndarray) -> np.ndarray:
+    """(N, 3) 整数单元坐标 → int64 键"""
+    c = (cells.astype(np.int64) + _OFFSET) & ((1 << _BITS) - 1)
+    return (c[:, 0] << (2 * _BITS)) | (c[:, 1] << _BITS) | c[:, 2]
+
+
+def _ragged_arange(counts: np.ndarray) -> np.ndarray:
+    """[0..c0), [0..c1), … 首尾相接"""
+    return np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+
+def instance_aabbs(local_min, local_max, matrices) -> Tuple[np.ndarray, np.ndarray]:
+    """原型局部 AABB 经 (N, 4, 4) 变换后的世界 AABB（中心 / 半尺寸法，无需逐角变换）"""
+    m = np.asarray(matrices, dtype=np.float64).reshape(-1, 4, 4)
+    lo, hi = np.asarray(local_min, dtype=np.float64), np.asarray(local_max, dtype=np.float64)
+    center = (lo + hi) / 2.0
+    half = (hi - lo) / 2.0
+    c = np.einsum("nij,j->ni", m[:, :3, :3], center) + m[:, :3, 3]
+    h = np.einsum("nij,j->ni", np.abs(m[:, :3, :3]), half)
+    return c - h, c + h
+
+
+def aabb_distance(points: np.ndarray, mins: np.ndarray, maxs: np.ndarray) -> np.ndarray:
+    """点到 AABB 的欧氏距离（盒内为 0），逐项广播"""
+    d = np.maximum(np.maximum(mins - points, points - maxs), 0.0)
+    return np.linalg.norm(d, axis=-1)
+
+
+class SpatialIndex:
+    """
+    cell_size : 网格单元边长；None 时按首次查询时构件尺寸中位数确定
+    """
+
+    def __init__(self, cell_size: Optional[float] = None):
+        self.cell_size = cell_size
+        self._mins: List[np.ndarray] = []
+        self._maxs: List[np.ndarray] = []
+        self._names: List[np.ndarray] = []
+        self._owners: List[np.ndarray] = []
+        self._local: List[np.ndarray] = []
+        self._pairs: List[Tuple[np.ndarray, np.ndarray]] = []   # 各批 (单元键, 构件序号)
+        self._large: List[np.ndarray] = []
+        self._count = 0
+        self._cache = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    # -------------------------------------------------------
+    # 追加
+    # -------------------------------------------------------
+    def add_boxes(self, mins, maxs, name: str = "", owner: str = "") -> np.ndarray:
+        """追加一批 AABB，返回其全局序号"""
+        mins = np.asarray(mins, dtype=np.float64).reshape(-1, 3)
+        maxs = np.asarray(maxs, dtype=np.float64).reshape(-1, 3)
+        n = len(mins)
+        ids = np.arange(self._count, self._count + n)
+        if n == 0:
+            return ids
+
+        self._mins.append(mins)
+        self._maxs.append(maxs)
+        self._names.append(np.full(n, name, dtype=object))
+        self._owners.append(np.full(n, owner, dtype=object))
+        self._local.append(np.arange(n))
+        self._count += n
+        self._cache = None
+        return ids
+
+    def _grid_pending(self):
+        """尚未入网格的批次逐批展开为 (单元键, 构件) 对；已入网格者不再重算"""
+        if self.cell_size is None:
+            extent = np.concatenate(self._maxs) - np.concatenate(self._mins)
+            size = np.median(np.max(extent, axis=1))
+            self.cell_size = float(size) if size > 0 else 1.0
+
+        first = sum(len(m) for m in self._mins[: len(self._pairs)])
+        for mins, maxs in zip(self._mins[len(self._pairs):], self._maxs[len(self._pairs):]):
+            ids = np.arange(first, first + len(mins))
+            first += len(mins)
+
+            lo = np.floor(mins / self.cell_size).astype(np.int64)
+            hi = np.floor(maxs / self.cell_size).astype(np.int64)
+            span = hi - lo + 1
+            n_cells = span.prod(axis=1)
+            large = n_cells > MAX_CELLS_PER_BOX
+
+            # 每个盒子展开为所占全部单元：(盒, 单元) 对
+            small = np.flatnonzero(~large)
+            counts = n_cells[small]
+            owner_idx = np.repeat(small, counts)
+            k = _ragged_arange(counts)
+            sy, sz = span[owner_idx, 1], span[owner_idx, 2]
+            offset = np.stack([k // (sy * sz), (k // sz) % sy, k % sz], axis=1)
+            self._pairs.append((_cell_keys(lo[owner_idx] + offset), ids[owner_idx]))
+            self._large.append(ids[large])
+
+    def add_instances(self, batch: InstanceBatch, owner: str = "", name: str = None) -> np.ndarray:
+        verts = batch.mesh.vertices
+        mins, maxs = instance_aabbs(verts.min(axis=0), verts.max(axis=0), batch.matrices)
+        return self.add_boxes(mins, maxs, name or batch.name, owner)
+
+    def add_mesh(self, mesh: MeshData, owner: str = "", name: str = None) -> np.ndarray:
+        if mesh.num_vertices == 0:
+            return np.zeros(0, dtype=int)
+        return self.add_boxes(mesh.vertices.min(axis=0), mesh.vertices.max(axis=0), name or mesh.name, owner)
+
+    def add_segments(self, starts, ends, diameter: float, owner: str = "", name: str = "") -> np.ndarray:
+        """线状构件（檩、椽）：两端点外扩半径"""
+        starts = np.asarray(starts, dtype=np.float64).reshape(-1, 3)
+        ends = np.asarray(ends, dtype=np.float64).reshape(-1, 3)
+        r = diameter / 2.0
+        return self.add_boxes(np.minimum(starts, ends) - r, np.maximum(starts, ends) + r, name, owner)
+
+    def add_components(self, components, owner: str = "", prefix: str = "") -> int:
+        """
+        递归登记计算结果中的构件（遍历见 geometry.batches.iter_instance_batches），
+        每批按原型包围盒 × 摆放矩阵入索引，返回登记数
+        """
+        before = self._count
+        for batch in iter_instance_batches(components, prefix):
+            self.add_instances(batch, owner)
+        return self._count - before
+
+    # -------------------------------------------------------
+    # 合并
+    # -------------------------------------------------------
+    def _arrays(self) -> Dict[str, np.ndarray]:
+        if self._cache is None:
+            if self._count:
+                self._grid_pending()
+            keys = np.concatenate([k for k, _ in self._pairs]) if self._pairs else np.zeros(0, np.int64)
+            items = np.concatenate([i for _, i in self._pairs]) if self._pairs else np.zeros(0, int)
+            order = np.argsort(keys, kind="stable")
+            self._cache = {
+                "mins": np.concatenate(self._mins) if self._mins else np.zeros((0, 3)),
+                "maxs": np.concatenate(self._maxs) if self._maxs else np.zeros((0, 3)),
+                "keys": keys[order],
+                "items": items[order],
+                "large": np.concatenate(self._large) if self._large else np.zeros(0, int),
+            }
+        return self._cache
+
+    @property
+    def mins(self) -> np.ndarray:
+        return self._arrays()["mins"]
+
+    @property
+    def maxs(self) -> np.ndarray:
+        return self._arrays()["maxs"]
+
+    @property
+    def names(self) -> np.ndarray:
+        return np.concatenate(self._names) if self._names else np.zeros(0, dtype=object)
+
+    @property
+    def owners(self) -> np.ndarray:
+        return np.concatenate(self._owners) if self._owners else np.zeros(0, dtype=object)
+
+    @property
+    def local_ids(self) -> np.ndarray:
+        """构件在其所属批内的序号"""
+        return np.concatenate(self._local) if self._local else np.zeros(0, dtype=int)
+
+    # -------------------------------------------------------
+    # 查询
+    # -------------------------------------------------------
+    def overlapping_pairs(self, tolerance: float = 0.0, same_owner: bool = False) -> np.ndarray:
+        """
+        全部相交的 AABB 对 (P, 2)，i < j；tolerance > 0 时相距不超过该值也算相交。
+        same_owner=True 只返回同一所属内的对。
+        """
+        a = self._arrays()
+        keys, items = a["keys"], a["items"]
+        owner_codes = None
+        if same_owner:
+            # 按（所属, 单元）分组，不同所属的构件不成对
+            owner_codes = np.unique(self.owners.astype(str), return_inverse=True)[1]
+            order = np.lexsort((keys, owner_codes[items]))
+            keys, items = keys[order], items[order]
+            group = owner_codes[items]
+            boundary = (keys[1:] != keys[:-1]) | (group[1:] != group[:-1])
+        else:
+            boundary = keys[1:] != keys[:-1]
+
+        # 同一单元内两两成对
+        starts = np.flatnonzero(np.r_[True, boundary])
+        counts = np.diff(np.r_[starts, len(keys)])
+        multi = counts > 1
+        starts, counts = starts[multi], counts[multi]
+        pair_counts = counts * (counts - 1) // 2
+        cell = np.repeat(np.arange(len(counts)), pair_counts)
+        k = _ragged_arange(pair_counts)
+        n = counts[cell]
+        # 第 k 对 → 上三角 (p, q)
+        p = (n - 2 - np.floor(np.sqrt(-8 * k + 4 * n * (n - 1) - 7) / 2.0 - 0.5)).astype(np.int64)
+        q = k + p + 1 - n * (n - 1) // 2 + (n - p) * ((n - p) - 1) // 2
+        i, j = items[starts[cell] + p], items[starts[cell] + q]
+
+        mins, maxs = a["mins"], a["maxs"]
+
+        def overlap(u, v):
+            return np.all((mins[u] <= maxs[v] + tolerance) & (mins[v] <= maxs[u] + tolerance), axis=1)
+
+        # 先做盒测试再去重（同一对可能同处多个单元）
+        hit = (i != j) & overlap(i, j)
+        i, j = [i[hit]], [j[hit]]
+
+        # 大构件：逐个与全部构件整列比较
+        everything = np.arange(self._count)
+        for big in a["large"]:
+            pool = everything if owner_codes is None else np.flatnonzero(owner_codes == owner_codes[big])
+            others = pool[overlap(np.full(len(pool), big), pool)]
+            others = others[others != big]
+            i.append(np.full(len(others), big))
+            j.append(others)
+
+        i, j = np.concatenate(i), np.concatenate(j)
+        if len(i) == 0:
+            return np.zeros((0, 2), dtype=int)
+        return np.unique(np.stack([np.minimum(i, j), np.maximum(i, j)], axis=1), axis=0)
+
+    def _candidates(self, lo: np.ndarray, hi: np.ndarray, with_large: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+        """(Q, 3) 查询盒 → 网格候选 (查询序号, 构件序号)，未去重"""
+        a = self._arrays()
+        q = len(lo)
+        # 裁到全体包围盒：盒外单元必然为空
+        lo = np.maximum(lo, a["mins"].min(axis=0))
+        hi = np.minimum(hi, a["maxs"].max(axis=0))
+        empty = np.any(lo > hi, axis=1)
+        hi = np.where(empty[:, None], lo, hi)
+        clo = np.floor(lo / self.cell_size).astype(np.int64)
+        chi = np.floor(hi / self.cell_size).astype(np.int64)
+        span = chi - clo + 1
+        n_cells = np.where(empty, 0, span.prod(axis=1))
+
+        qi = np.repeat(np.arange(q), n_cells)
+        k = _ragged_arange(n_cells)
+        sy, sz = span[qi, 1], span[qi, 2]
+        cells = clo[qi] + np.stack([k // (sy * sz), (k // sz) % sy, k % sz], axis=1)
+        keys = _cell_keys(cells)
+
+        left = np.searchsorted(a["keys"], keys, side="left")
+        right = np.searchsorted(a["keys"], keys, side="right")
+        hits = right - left
+        cq = np.repeat(qi, hits)
+        ci = a["items"][np.repeat(left, hits) + _ragged_arange(hits)]
+
+        large = a["large"]
+        if with_large and len(large):
+            cq = np.concatenate([cq, np.repeat(np.arange(q), len(large))])
+            ci = np.concatenate([ci, np.tile(large, q)])
+        return cq, ci
+
+    def query_region(self, mins, maxs) -> List[np.ndarray]:
+        """(Q, 3) 查询盒 → 每个查询相交的构件序号（升序）"""
+        lo = np.asarray(mins, dtype=np.float64).reshape(-1, 3)
+        hi = np.asarray(maxs, dtype=np.float64).reshape(-1, 3)
+        q = len(lo)
+        if self._count == 0:
+            return [np.zeros(0, dtype=int) for _ in range(q)]
+
+        cq, ci = self._candidates(lo, hi)
+        a = self._arrays()
+        hit = np.all((a["mins"][ci] <= hi[cq]) & (lo[cq] <= a["maxs"][ci]), axis=1)
+        found = np.unique(np.stack([cq[hit], ci[hit]], axis=1), axis=0)
+        return np.split(found[:, 1], np.searchsorted(found[:, 0], np.arange(1, q)))
+
+    def _cell_count(self, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+        span = np.floor(hi / self.cell_size) - np.floor(lo / self.cell_size) + 1
+        return np.prod(np.maximum(span, 0), axis=-1)
+
+    def nearest(self, points) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (Q, 3) 点 → (最近构件序号 (Q,), 距离 (Q,))，距离为点到 AABB 的距离。
+        以点为中心的立方体逐次加倍搜索：立方体内最近者距离不超过半边长即为全局最近。
+        """
+        pts = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        q = len(pts)
+        best = np.full(q, -1, dtype=int)
+        dist = np.full(q, np.inf)
+        if self._count == 0:
+            return best, dist
+
+        a = self._arrays()
+        mins, maxs = a["mins"], a["maxs"]
+
+        # 大构件不在网格中：先整体比较，作为各点初值
+        large = a["large"]
+        if len(large):
+            d = aabb_distance(pts[:, None, :], mins[large][None], maxs[large][None])
+            best, dist = large[np.argmin(d, axis=1)], np.min(d, axis=1)
+
+        world_lo, world_hi = mins.min(axis=0), maxs.max(axis=0)
+        # 各点初始半边长：不小于单元边长与点到全体包围盒的距离；
+        # 立方体（裁到全体包围盒后）已占全部单元一半以上的点改为直接比较
+        r = np.maximum(aabb_distance(pts, world_lo, world_hi), self.cell_size)
+        world_cells = self._cell_count(world_lo, world_hi)
+        todo = np.arange(q)
+
+        while len(todo):
+            p, rr = pts[todo], r[todo][:, None]
+            wide = 2 * self._cell_count(np.maximum(p - rr, world_lo), np.minimum(p + rr, world_hi)) >= world_cells
+            brute = todo[wide]
+            rows = max(1, BRUTE_FORCE_BLOCK // self._count)
+            for k in range(0, len(brute), rows):
+                chunk = brute[k : k + rows]
+                d = aabb_distance(pts[chunk][:, None, :], mins[None], maxs[None])
+                best[chunk], dist[chunk] = np.argmin(d, axis=1), np.min(d, axis=1)
+            todo = todo[~wide]
+            if not len(todo):
+                break
+
+            p, rr = pts[todo], r[todo][:, None]
+            cq, ci = self._candidates(p - rr, p + rr, with_large=False)
+            d = aabb_distance(p[cq], mins[ci], maxs[ci])
+            if len(cq):
+                # cq 已按查询序号分段：段内取最小
+                starts = np.flatnonzero(np.r_[True, cq[1:] != cq[:-1]])
+                seg_min = np.minimum.reduceat(d, starts)
+                is_min = d == np.repeat(seg_min, np.diff(np.r_[starts, len(cq)]))
+                _, pick = np.unique(cq[is_min], return_index=True)
+                pick = np.flatnonzero(is_min)[pick]
+                cq, ci, d = cq[pick], ci[pick], d[pick]
+
+            better = d < dist[todo[cq]]
+            best[todo[cq[better]]], dist[todo[cq[better]]] = ci[better], d[better]
+            todo = todo[dist[todo] > r[todo]]
+            r[todo] *= 2.0
+        return best, dist
+
+    def describe(self, ids) -> List[str]:
+        """构件序号 → "所属:名称#批内序号" """
+        ids = np.asarray(ids, dtype=int).reshape(-1)
+        names, owners, local = self.names, self.owners, self.local_ids
+        return [f"{owners[i]}:{names[i]}#{local[i]}" for i in ids]
@@ -0,0 +1,139 @@
+# -----------------------------------------------------------------------------
+# file: geometry/transforms.py
+# -----------------------------------------------------------------------------
+"""
+批量 4x4 变换矩阵工具（纯 NumPy，不依赖 bpy）。
+
+约定：
+- 矩阵形状 (N, 4, 4)，列向量约定（与 Blender matrix_world 一致），平移位于 [:, :3, 3]
+- 欧拉角顺序为 Blender 默认的 XYZ，即 R = Rz @ Ry @ Rx
+"""
+import numpy as np
+
+
+def compose_transforms(locations, rotations=None, scales=None) -> np.ndarray:
+    """
+    由位置 / 旋转 / 缩放批量组合变换矩阵。
+
+    locations : (N, 3) 位置
+    rotations : (N, 3, 3) 旋转矩阵，缺省为单位阵
+    scales    : (N, 3) 或 (N,) 缩放，缺省为 1
+    返回       : (N, 4, 4)
+    """
+    loc = np.asarray(locations, dtype=np.float64).reshape(-1, 3)
+    n = len(loc)
+
+    if rotations is None:
+        basis = np.broadcast_to(np.eye(3), (n, 3, 3)).copy()
+    else:
+        basis = np.array(rotations, dtype=np.float64).reshape(n, 3, 3)
+
+    if scales is not None:
+        s = np.asarray(scales, dtype=np.float64)
+        if s.ndim == 1:
+            s = np.repeat(s[:, None], 3, axis=1)
+        # 缩放作用于局部轴 → 按列缩放
+        basis = basis * s.reshape(n, 1, 3)
+
+    matrices = np.zeros((n, 4, 4))
+    matrices[:, :3, :3] = basis
+    matrices[:, :3, 3] = loc
+    matrices[:, 3, 3] = 1.0
+    return matrices
+
+
+def rotation_z(angles) -> np.ndarray:
+    """绕 Z 轴旋转 angles（弧度）的 (N, 3, 3) 旋转矩阵"""
+    a = np.asarray(angles, dtype=np.float64).reshape(-1)
+    c, s = np.cos(a), np.sin(a)
+    rot = np.zeros((len(a), 3, 3))
+    rot[:, 0, 0], rot[:, 0, 1] = c, -s
+    rot[:, 1, 0], rot[:, 1, 1] = s, c
+    rot[:, 2, 2] = 1.0
+    return rot
+
+
+def matrix_to_euler_xyz(rotations: np.ndarray) -> np.ndarray:
+    """
+    (N, 3, 3) 纯旋转矩阵 → (N, 3) XYZ 欧拉角（弧度）。
+    万向锁（cos(y)≈0）时令 z = 0。
+    """
+    r = np.asarray(rotations, dtype=np.float64).reshape(-1, 3, 3)
+
+    y = np.arcsin(np.clip(-r[:, 2, 0], -1.0, 1.0))
+    cy = np.cos(y)
+    locked = np.abs(cy) < 1e-9
+
+    x = np.where(
+        locked,
+        np.arctan2(-r[:, 1, 2], r[:, 1, 1]),
+        np.arctan2(r[:, 2, 1], r[:, 2, 2]),
+    )
+    z = np.where(locked, 0.0, np.arctan2(r[:, 1, 0], r[:, 0, 0]))
+
+    return np.stack([x, y, z], axis=1)
+
+
+def decompose_transforms(matrices: np.ndarray):
+    """
+    (N, 4, 4) → (locations (N, 3), euler_xyz (N, 3), scales (N, 3))。
+    仅支持无切变的 TRS 矩阵。
+    """
+    m = np.asarray(matrices, dtype=np.float64).reshape(-1, 4, 4)
+
+    locations = m[:, :3, 3].copy()
+    basis = m[:, :3, :3]
+
+    scales = np.linalg.norm(basis, axis=1)
+    safe = np.where(scales == 0.0, 1.0, scales)
+    rotations = basis / safe[:, None, :]
+
+    return locations, matrix_to_euler_xyz(rotations), scales
+
+
+def segment_transforms(starts, ends, axis: int = 0, section_scales=None) -> np.ndarray:
+    """
+    起止点 → 变换矩阵（批量）。用于梁、檩、椽等线状构件。
+
+    约定原型为单位长度、以原点为中心、沿局部第 axis 轴（0=X, 1=Y, 2=Z）。
+    - 旋转：局部 axis 轴对齐构件方向，截面保持竖直（不产生扭转）
+    - 缩放：axis 轴方向缩放为构件长度；section_scales (N, 2) 可选，
+            依次缩放另外两个局部轴（截面宽、高）
+    - 平移：起止点中点
+
+    starts, ends : (N, 3)
+    返回          : (N, 4, 4)
+    """
+    p0 = np.asarray(starts, dtype=np.float64).reshape(-1, 3)
+    p1 = np.asarray(ends, dtype=np.float64).reshape(-1, 3)
+    n = len(p0)
+
+    delta = p1 - p0
+    lengths = np.linalg.norm(delta, axis=1)
+    safe_len = np.where(lengths == 0.0, 1.0, lengths)
+    primary = delta / safe_len[:, None]
+    primary[lengths == 0.0] = np.eye(3)[axis]
+
+    # 参考上方向取世界 Z；构件竖直时改用世界 Y
+    up = np.broadcast_to(np.array([0.0, 0.0, 1.0]), (n, 3)).copy()
+    vertical = np.abs(primary[:, 2]) > 1.0 - 1e-9
+    up[vertical] = (0.0, 1.0, 0.0)
+
+    secondary = np.cross(up, primary)
+    secondary /= np.linalg.norm(secondary, axis=1)[:, None]
+    tertiary = np.cross(primary, secondary)
+
+    # 轮换排列保持右手系：col[axis] = primary
+    basis = np.empty((n, 3, 3))
+    basis[:, :, axis] = primary
+    basis[:, :, (axis + 1) % 3] = secondary
+    basis[:, :, (axis + 2) % 3] = tertiary
+
+    scales = np.ones((n, 3))
+    scales[:, axis] = lengths
+    if section_scales is not None:
+        sec = np.asarray(section_scales, dtype=np.float64).reshape(n, 2)
+        scales[:, (axis + 1) % 3] = sec[:, 0]
+        scales[:, (axis + 2) % 3] = sec[:, 1]
+
+    return compose_transforms((p0 + p1) / 2.0, basis, scales)
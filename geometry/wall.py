@@ -0,0 +1,198 @@
+# -----------------------------------------------------------------------------
+# file: geometry/wall.py
+# -----------------------------------------------------------------------------
+"""
+墙体几何（纯 NumPy，不依赖 bpy）：立面轮廓 → 二维开洞 → 沿墙厚拉伸。
+
+立面坐标 (u, z)：u 为自墙起点沿墙长的距离，z 为绝对标高。
+轮廓下沿水平、上沿为 u 单调的折线（平顶墙、山尖、山花均满足），门窗洞为矩形。
+
+开洞在二维完成：以轮廓折点与全部洞口边把立面切成竖条，
+每条内自下沿起减去覆盖该条的洞口区间，得到若干梯形块；
+每块再拉伸为六面体。整个过程只有数组运算，无需三维布尔。
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from .mesh import MeshData, merge_meshes
+
+EPS = 1e-9
+
+
+@dataclass
+class WallSegment:
+    """
+    一段直墙。
+    start, end : 墙中线起止点 (x, y)
+    thickness  : 墙厚（沿中线两侧各一半）
+    bottom     : 下沿标高
+    top_u/top_z: 上沿折线，top_u 单调递增，覆盖 [0, 墙长]
+    openings   : (H, 4) 洞口 [u0, u1, z0, z1]
+    """
+    name: str
+    start: np.ndarray
+    end: np.ndarray
+    thickness: float
+    bottom: float
+    top_u: np.ndarray
+    top_z: np.ndarray
+    openings: np.ndarray = field(default_factory=lambda: np.zeros((0, 4)))
+
+    def __post_init__(self):
+        self.start = np.asarray(self.start, dtype=np.float64)[:2]
+        self.end = np.asarray(self.end, dtype=np.float64)[:2]
+        self.top_u = np.asarray(self.top_u, dtype=np.float64).reshape(-1)
+        self.top_z = np.asarray(self.top_z, dtype=np.float64).reshape(-1)
+        self.openings = np.asarray(self.openings, dtype=np.float64).reshape(-1, 4)
+
+    @property
+    def length(self) -> float:
+        return float(np.linalg.norm(self.end - self.start))
+
+    @classmethod
+    def flat(cls, name, start, end, thickness, bottom, top, openings=None):
+        """平顶墙（下碱、檐墙上身）"""
+        length = float(np.linalg.norm(np.asarray(end, dtype=np.float64)[:2] - np.asarray(start, dtype=np.float64)[:2]))
+        return cls(name, start, end, thickness, bottom, [0.0, length], [top, top],
+                   openings if openings is not None else np.zeros((0, 4)))
+
+
+# ================================================================
+# 一、二维开洞
+# ================================================================
+def elevation_pieces(top_u, top_z, bottom: float, openings=None) -> np.ndarray:
+    """
+    立面减去洞口后的梯形块。
+
+    返回 (Q, 4, 2)，每块四角按 (u, z) 逆时针：
+        (ua, 下), (ub, 下), (ub, 上b), (ua, 上a)
+    洞口之间互不重叠；高出上沿的部分被截去。
+    """
+    top_u = np.asarray(top_u, dtype=np.float64)
+    top_z = np.asarray(top_z, dtype=np.float64)
+    holes = np.zeros((0, 4)) if openings is None else np.asarray(openings, dtype=np.float64).reshape(-1, 4)
+
+    u_min, u_max = top_u[0], top_u[-1]
+    cuts = np.concatenate([top_u, np.clip(holes[:, :2].ravel(), u_min, u_max)])
+    breaks = np.unique(cuts)
+    ua, ub = breaks[:-1], breaks[1:]
+    top_a, top_b = np.interp(ua, top_u, top_z), np.interp(ub, top_u, top_z)
+    s, h = len(ua), len(holes)
+
+    # (S, H) 洞口是否覆盖整条；未覆盖者排到末尾
+    cover = (holes[None, :, 0] <= ua[:, None] + EPS) & (holes[None, :, 1] >= ub[:, None] - EPS)
+    z0 = np.where(cover, holes[None, :, 2], np.inf)
+    z1 = np.where(cover, holes[None, :, 3], np.inf)
+    order = np.argsort(z0, axis=1)
+    z0 = np.take_along_axis(z0, order, axis=1)
+    z1 = np.take_along_axis(z1, order, axis=1)
+    n_cover = cover.sum(axis=1)
+
+    # 第 j 块：下 = 第 j-1 个洞顶（j = 0 为墙底），上 = 第 j 个洞底；第 n_cover 块上至墙顶
+    lower = np.maximum(np.hstack([np.full((s, 1), float(bottom)), z1]), bottom)  # (S, H+1)
+    upper = np.hstack([z0, np.full((s, 1), np.inf)])
+    is_top = np.arange(h + 1)[None, :] == n_cover[:, None]
+
+    cap = np.minimum(top_a, top_b)[:, None]
+    upper_a = np.where(is_top, top_a[:, None], np.minimum(upper, cap))
+    upper_b = np.where(is_top, top_b[:, None], np.minimum(upper, cap))
+
+    valid = np.isfinite(lower) & ((upper_a > lower + EPS) | (upper_b > lower + EPS))
+    valid &= np.arange(h + 1)[None, :] <= n_cover[:, None]
+
+    strip = np.broadcast_to(np.arange(s)[:, None], valid.shape)[valid]
+    lo, ta, tb = lower[valid], upper_a[valid], upper_b[valid]
+    a, b = ua[strip], ub[strip]
+
+    return np.stack([
+        np.stack([a, lo], axis=1),
+        np.stack([b, lo], axis=1),
+        np.stack([b, tb], axis=1),
+        np.stack([a, ta], axis=1),
+    ], axis=1)
+
+
+# ================================================================
+# 二、拉伸
+# ================================================================
+# 六面体：0-3 为 -n 侧（立面逆时针），4-7 为 +n 侧
+_HEX_FACES = np.array(
+    [[0, 1, 2], [0, 2, 3],
+     [4, 6, 5], [4, 7, 6]]
+    + [f for i in range(4) for f in ([i, (i + 1) % 4 + 4, (i + 1) % 4], [i, i + 4, (i + 1) % 4 + 4])]
+)
+
+
+def _wall_frame(start, end):
+    """墙中线方向 d 与水平法向 n（d 逆时针转 90°）"""
+    d = np.asarray(end, dtype=np.float64) - np.asarray(start, dtype=np.float64)
+    d = d / max(np.linalg.norm(d), EPS)
+    return d, np.array([-d[1], d[0]])
+
+
+def extrude_pieces(quads: np.ndarray, start, end, thickness: float, name: str = "") -> MeshData:
+    """(Q, 4, 2) 立面块 → 沿墙厚拉伸的六面体合并网格"""
+    quads = np.asarray(quads, dtype=np.float64).reshape(-1, 4, 2)
+    q = len(quads)
+    d, n = _wall_frame(start, end)
+    start = np.asarray(start, dtype=np.float64)
+
+    half = np.array([-0.5, 0.5]) * thickness
+    u = np.concatenate([quads[:, :, 0], quads[:, :, 0]], axis=1)                # (Q, 8)
+    z = np.concatenate([quads[:, :, 1], quads[:, :, 1]], axis=1)
+    w = np.repeat(half, 4)[None, :]
+
+    xy = start + u[..., None] * d + w[..., None] * n                             # (Q, 8, 2)
+    verts = np.concatenate([xy, z[..., None]], axis=-1).reshape(-1, 3)
+    faces = (_HEX_FACES[None, :, :] + (np.arange(q) * 8)[:, None, None]).reshape(-1, 3)
+    return MeshData(verts, faces, name=name)
+
+
+def build_segment(segment: WallSegment) -> MeshData:
+    quads = elevation_pieces(segment.top_u, segment.top_z, segment.bottom, segment.openings)
+    return extrude_pieces(quads, segment.start, segment.end, segment.thickness, name=segment.name)
+
+
+def coping_prism(start, end, width: float, z: float, height: float, name: str = "") -> MeshData:
+    """签尖：沿墙顶的三角截面棱柱，底宽 width、高 height"""
+    d, n = _wall_frame(start, end)
+    ends = np.stack([np.asarray(start, dtype=np.float64), np.asarray(end, dtype=np.float64)])
+
+    section = np.array([[-0.5 * width, 0.0], [0.5 * width, 0.0], [0.0, height]])
+    xy = ends[:, None, :] + section[None, :, 0, None] * n                       # (2, 3, 2)
+    zs = np.broadcast_to(z + section[None, :, 1], (2, 3))
+    verts = np.concatenate([xy, zs[..., None]], axis=-1).reshape(-1, 3)
+
+    faces = np.array([
+        [0, 2, 1], [3, 4, 5],                    # 两端
+        [0, 1, 4], [0, 4, 3],                    # 底
+        [1, 2, 5], [1, 5, 4],                    # +n 坡
+        [2, 0, 3], [2, 3, 5],                    # -n 坡
+    ])
+    return MeshData(verts, faces, name=name)
+
+
+# ================================================================
+# 三、墙体系统 → 网格
+# ================================================================
+class WallGeometry:
+    """把墙体系统各部分（下碱 / 上身 / 山花 / 签尖）的墙段生成合并网格"""
+
+    def __init__(self, params: dict):
+        self.params = params
+
+    @staticmethod
+    def _merge(name: str, items: Sequence) -> MeshData:
+        meshes = [build_segment(s) if isinstance(s, WallSegment) else s for s in items]
+        return merge_meshes(meshes, name=name)
+
+    def build(self, base: List, body: List, roofjoint: Dict[str, List]) -> Dict[str, MeshData]:
+        """
+        base / body ：WallSegment 列表
+        roofjoint   ：{部件名: WallSegment 或 MeshData 列表}，如 {"gable": [...], "coping": [...]}
+        返回 {部件名: MeshData}，空部件略去
+        """
+        parts = {"base": base, "body": body, **roofjoint}
+        return {name: self._merge(name, items) for name, items in parts.items() if items}
@@ -1,5 +1,8 @@
-from .assembler import Assembler
-from .utils import Collection
+from .assembler import assemble_building
+from .utils import ensure_collection, ensure_hierarchy_from_data
+from .writer import BulkWriter
 from structure.frames import build_pillar_frame
 from structure.frames import build_beam_frame
-from structure.frames import build_roof_system
\ No newline at end of file
+from structure.frames import build_roof_system
+from structure.frames import build_wall_frame
+from structure.frames import build_platform_frame
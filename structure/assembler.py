@@ -2,18 +2,25 @@
 # file: structure/assembler.py
 # -----------------------------------------------------------------------------
 from typing import Dict, Any
+from core.memory_trace import MemoryTracer
+from core.naming_service import DEFAULT_STYLE
 from structure.utils import ensure_collection
 from structure.frames import build_pillar_frame
 from structure.frames import build_beam_frame
 from structure.frames import build_roof_system
+from structure.writer import BulkWriter
 
 
-def assemble_building(calc_result, components_objs: Dict[str, object], description_info: Dict[str, Any], name: str = None):
+@MemoryTracer.traced("assemble:building")
+def assemble_building(calc_result, components_objs: Dict[str, object], description_info: Dict[str, Any], name: str = None, instanced: bool = False):
     """主组合函数：将 components 放置并按照 description_info 进行排列。
     calc_result: ComponentCalcResult 或 dict-like
     components_objs: {'pillar': obj, 'beam': obj, 'roof': obj}
     description_info: placement info
     name: collection name
+    instanced: 柱 / 梁按原型合并为实例化对象（见 frames/instancing.py）；
+               否则柱 / 梁经同一个 BulkWriter 登记，最后一次 commit()，每类构件一个对象；
+               各构件名（COL_… / BEAM_…，体系取 description_info['style']）记于对象 member_names
     """
     collection_name = name or description_info.get('name') or 'building'
     coll = ensure_collection(collection_name)
@@ -27,8 +34,12 @@ def assemble_building(calc_result, components_objs: Dict[str, object], descripti
     beam_proto = components_objs['beam']
     roof_proto = components_objs['roof']
 
-    created_pillars = build_pillar_frame(pillars, pillar_proto, coll)
-    created_beams = build_beam_frame(beams, beam_proto, coll)
+    style = description_info.get('style', DEFAULT_STYLE)
+    writer = BulkWriter()
+    created_pillars = build_pillar_frame(pillars, pillar_proto, coll, instanced=instanced, writer=writer, style=style)
+    created_beams = build_beam_frame(beams, beam_proto, coll, instanced=instanced, writer=writer, style=style)
+    for obj_name, obj in writer.commit().items():
+        (created_pillars if obj_name.endswith("_pillar") else created_beams).append(obj)
     created_roof = build_roof_system(roof, roof_proto, coll)
 
     # TODO: 根据 description_info 做更复杂的偏移、旋转和合并
@@ -113,17 +113,43 @@ except Exception:
         def __init__(self, name):
             self.name = name
 
+        def from_pydata(self, vertices, edges, faces):
+            self.vertices = vertices
+            self.edges = edges
+            self.faces = faces
+
+    class MockLinkList(list):
+        def link(self, item):
+            self.append(item)
+
     class MockCollection:
         def __init__(self, name):
             self.name = name
-            self.objects = []
+            self.objects = MockLinkList()
+            self.children = MockLinkList()
 
         def objects_link(self, obj):
             self.objects.append(obj)
 
+    class MockDataBlocks(dict):
+        """bpy.data.meshes / objects / collections 的 Mock：dict + new()"""
+        def __init__(self, factory):
+            super().__init__()
+            self._factory = factory
+
+        def new(self, name, *args):
+            block = self._factory(name, *args)
+            self[name] = block
+            return block
+
     class MockBpy:
-        data = type('d', (), {'meshes': {}, 'objects': {}, 'collections': {}})()
+        data = type('d', (), {
+            'meshes': MockDataBlocks(MockMesh),
+            'objects': MockDataBlocks(MockObject),
+            'collections': MockDataBlocks(MockCollection),
+        })()
         context = type('c', (), {'scene': type('s', (), {'collection': None})()})()
+        types = type('t', (), {'Object': MockObject, 'Mesh': MockMesh, 'Collection': MockCollection})
 
         @staticmethod
         def data_meshes_get(name):
@@ -181,7 +207,7 @@ def example():
     from structure.components.roof import create_roof
 
     pillar_proto = create_pillar(0.32, 3.6)
-    beam_proto = create_beam(0.2, 0.25, 2.0)
+    beam_proto = create_beam(0.2, 0.25)
     roof_proto = create_roof('roll_shed', {'num_purlins':5})
 
     from structure.assembler import assemble_building
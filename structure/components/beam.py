@@ -1,27 +1,20 @@
 # -----------------------------------------------------------------------------
 # file: structure/components/beam.py
 # -----------------------------------------------------------------------------
-import bpy
-from structure.utils import get_or_create_mesh
+from structure.component_calculator_schema import bpy
+from geometry.mesh import box
+from structure.utils import register_prototype
+from structure.writer import create_mesh_object
 
 
-def _build_beam_mesh(width: float, height: float, length: float):
-    mesh_name = f"mesh_beam_{width:.3f}_{height:.3f}_{length:.3f}"
-    m = getattr(bpy.data, 'meshes', {}).get(mesh_name)
-    if m:
-        return m
-    m = type('M', (), {'name': mesh_name})()
-    bpy.data.meshes[mesh_name] = m
-    return m
-
-
-def create_beam(width: float, height: float, length: float):
+def create_beam(width: float, height: float, length: float = 1.0):
+    """
+    梁原型沿局部 X 轴、以原点为中心；缺省返回单位长度原型，同一截面的所有梁共用
+    （由变换矩阵缩放到实际长度，见 frames/beam_frame.py）。
+    """
     mesh_key = f"beam_{width:.3f}_{height:.3f}_{length:.3f}"
-    mesh = get_or_create_mesh(mesh_key, lambda: _build_beam_mesh(width, height, length))
-    try:
-        obj = bpy.data_objects_new(mesh_key, mesh)
-    except Exception:
-        obj = type('O', (), {})()
-        obj.name = mesh_key
-        obj.data = mesh
-    return obj
\ No newline at end of file
+    mesh = box((length, width, height), name=mesh_key)
+    register_prototype(mesh_key, mesh)
+    if mesh_key in bpy.data.objects:
+        return bpy.data.objects[mesh_key]
+    return create_mesh_object(mesh_key, mesh)
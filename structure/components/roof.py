@@ -1,7 +1,7 @@
 # -----------------------------------------------------------------------------
 # file: structure/components/roof.py
 # -----------------------------------------------------------------------------
-import bpy
+from structure.component_calculator_schema import bpy
 from structure.utils import get_or_create_mesh
 
 
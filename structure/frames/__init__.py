@@ -1,3 +1,5 @@
 from .pillar_frame import build_pillar_frame
 from .beam_frame import build_beam_frame
-from .roof_system import build_roof_system
\ No newline at end of file
+from .roof_system import build_roof_system
+from .wall_frame import build_wall_frame
+from .platform_frame import build_platform_frame
@@ -1,26 +1,43 @@
 # -----------------------------------------------------------------------------
 # file: structure/frame/beam_frame.py
 # -----------------------------------------------------------------------------
-from typing import List
-
-
-def build_beam_frame(beams: List[dict], beam_proto, collection):
-    created = []
-    for b in beams:
-        start = getattr(b, 'start', None) or b.get('start')
-        end = getattr(b, 'end', None) or b.get('end')
-        inst = None
-        try:
-            inst = beam_proto.copy()
-        except Exception:
-            inst = type('O', (), {})()
-            inst.name = beam_proto.name + "_inst"
-            inst.data = beam_proto.data
-        # 设定位置/长度/方向: 真实环境需计算变换矩阵
-        inst.location = ((start[0]+end[0])/2.0, (start[1]+end[1])/2.0, (start[2]+end[2])/2.0)
-        try:
-            collection.objects_link(inst)
-        except Exception:
-            getattr(collection, 'objects', []).append(inst)
-        created.append(inst)
-    return created
\ No newline at end of file
+from typing import List, Optional
+
+import numpy as np
+
+from core.naming_service import DEFAULT_STYLE
+from structure.utils import prototype_mesh
+from structure.writer import BulkWriter, collection_name
+
+from .instancing import beam_transforms, build_instancer, spec_value
+
+
+def build_beam_frame(beams: List[dict], beam_proto, collection, instanced: bool = False,
+                     writer: Optional[BulkWriter] = None, style: str = DEFAULT_STYLE):
+    """beam_proto: 单位长度梁原型（components.create_beam 缺省 length=1，或 MeshData 原型）
+    instanced: 为 True 时全部梁合并为一个实例化对象，不支持时回退批量写入
+    writer: 传入时只登记、由调用方统一 commit()；否则立即写入并返回创建的对象
+    style: 命名中的体系词元（BEAM_<序号>_L<长度>_TYPE_<角色>_STYLE_<体系>）
+    """
+    if not beams:
+        return []
+
+    # 全部梁的方向 / 长度 / 位置一次算完
+    matrices = beam_transforms(beams)
+
+    if instanced:
+        inst = build_instancer(f"{beam_proto.name}_instances", beam_proto, matrices, collection)
+        if inst is not None:
+            return [inst]
+
+    own = writer is None
+    writer = writer or BulkWriter(name_prefix="BEAM")
+    names = writer.naming.names(
+        "BEAM",
+        collection_name(collection),
+        length=np.linalg.norm(matrices[:, :3, 0], axis=1),    # 原型沿 X 为单位长，X 列模长即梁长
+        type=[spec_value(b, "role") or "beam" for b in beams],
+        style=style,
+    )
+    writer.add("beam", prototype_mesh(beam_proto), collection, matrices, names)
+    return list(writer.commit().values()) if own else []
@@ -0,0 +1,129 @@
+# -----------------------------------------------------------------------------
+# file: structure/frame/instancing.py
+# -----------------------------------------------------------------------------
+"""
+实例化摆放：将同一原型的全部摆放收集为 (N, 4, 4) 变换数组，
+再以单个点云对象 + Geometry Nodes「Instance on Points」一次性实现。
+
+场景慢的根源在于对象数量而非几何量：2000 根柱子只产生 1 个对象。
+不支持 Geometry Nodes 的环境（如 Mock）返回 None，由调用方回退 BulkWriter 批量写入。
+"""
+from typing import List
+
+from structure.component_calculator_schema import bpy
+import numpy as np
+
+from geometry.transforms import compose_transforms, decompose_transforms, segment_transforms
+
+INSTANCE_ROTATION_ATTR = "instance_rotation"
+INSTANCE_SCALE_ATTR = "instance_scale"
+
+
+def spec_value(spec, key: str):
+    """兼容 dataclass 与 dict 两种 spec（dataclass 字段值为 None 时照样返回 None）"""
+    if isinstance(spec, dict):
+        return spec.get(key)
+    return getattr(spec, key, None)
+
+
+# ================================================================
+# 变换收集（纯 NumPy）
+# ================================================================
+def pillar_transforms(pillars: List[dict]) -> np.ndarray:
+    """柱：仅平移，(N, 4, 4)"""
+    coords = np.array([spec_value(p, "coord") for p in pillars], dtype=np.float64)
+    return compose_transforms(coords.reshape(-1, 3))
+
+
+def beam_transforms(beams: List[dict]) -> np.ndarray:
+    """
+    梁：完整变换（方向 + 长度 + 中点），(N, 4, 4)。
+    要求梁原型为单位长度、沿局部 X 轴（见 components/beam.create_beam）。
+    """
+    starts = np.array([spec_value(b, "start") for b in beams], dtype=np.float64)
+    ends = np.array([spec_value(b, "end") for b in beams], dtype=np.float64)
+    return segment_transforms(starts, ends, axis=0)
+
+
+# ================================================================
+# Geometry Nodes 实例化
+# ================================================================
+def supports_instancing() -> bool:
+    return hasattr(bpy.data, "node_groups") and hasattr(bpy.data.meshes, "new")
+
+
+def _new_group_socket(tree, name: str, in_out: str):
+    # Blender 4.x 使用 interface，3.x 使用 inputs / outputs
+    if hasattr(tree, "interface"):
+        tree.interface.new_socket(name, in_out=in_out, socket_type="NodeSocketGeometry")
+    elif in_out == "INPUT":
+        tree.inputs.new("NodeSocketGeometry", name)
+    else:
+        tree.outputs.new("NodeSocketGeometry", name)
+
+
+def _get_instancer_node_group(proto):
+    """每个原型一个节点组：点 → Instance on Points(原型, 旋转, 缩放)"""
+    group_name = f"instancer_{proto.name}"
+    if group_name in bpy.data.node_groups:
+        return bpy.data.node_groups[group_name]
+
+    tree = bpy.data.node_groups.new(group_name, "GeometryNodeTree")
+    _new_group_socket(tree, "Geometry", "INPUT")
+    _new_group_socket(tree, "Geometry", "OUTPUT")
+
+    nodes, links = tree.nodes, tree.links
+    group_in = nodes.new("NodeGroupInput")
+    group_out = nodes.new("NodeGroupOutput")
+
+    obj_info = nodes.new("GeometryNodeObjectInfo")
+    obj_info.inputs["Object"].default_value = proto
+
+    rotation = nodes.new("GeometryNodeInputNamedAttribute")
+    rotation.data_type = "FLOAT_VECTOR"
+    rotation.inputs["Name"].default_value = INSTANCE_ROTATION_ATTR
+
+    scale = nodes.new("GeometryNodeInputNamedAttribute")
+    scale.data_type = "FLOAT_VECTOR"
+    scale.inputs["Name"].default_value = INSTANCE_SCALE_ATTR
+
+    instancer = nodes.new("GeometryNodeInstanceOnPoints")
+    links.new(group_in.outputs["Geometry"], instancer.inputs["Points"])
+    links.new(obj_info.outputs["Geometry"], instancer.inputs["Instance"])
+    links.new(rotation.outputs["Attribute"], instancer.inputs["Rotation"])
+    links.new(scale.outputs["Attribute"], instancer.inputs["Scale"])
+    links.new(instancer.outputs["Instances"], group_out.inputs["Geometry"])
+
+    return tree
+
+
+def build_instancer(name: str, proto, matrices: np.ndarray, collection):
+    """
+    用一个点云对象承载全部实例。
+    顶点坐标 / 旋转 / 缩放均通过 foreach_set 一次写入。
+    返回实例化对象；环境不支持、或 proto 不是真实对象（Object Info 节点无法引用）时返回 None，
+    由调用方回退批量写入。
+    """
+    if not supports_instancing() or not isinstance(proto, bpy.types.Object):
+        return None
+
+    locations, rotations, scales = decompose_transforms(matrices)
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(locations))
+    mesh.vertices.foreach_set("co", locations.astype(np.float32).ravel())
+
+    for attr_name, values in (
+        (INSTANCE_ROTATION_ATTR, rotations),
+        (INSTANCE_SCALE_ATTR, scales),
+    ):
+        attr = mesh.attributes.new(attr_name, "FLOAT_VECTOR", "POINT")
+        attr.data.foreach_set("vector", values.astype(np.float32).ravel())
+    mesh.update()
+
+    obj = bpy.data.objects.new(name, mesh)
+    modifier = obj.modifiers.new("instancer", "NODES")
+    modifier.node_group = _get_instancer_node_group(proto)
+
+    collection.objects.link(obj)
+    return obj
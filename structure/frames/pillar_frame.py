@@ -1,34 +1,41 @@
 # -----------------------------------------------------------------------------
 # file: structure/frame/pillar_frame.py
 # -----------------------------------------------------------------------------
-from typing import List
+from typing import List, Optional
 
+from core.naming_service import DEFAULT_STYLE
+from structure.utils import prototype_mesh
+from structure.writer import BulkWriter, collection_name
 
-def build_pillar_frame(pillars: List[dict], pillar_proto, collection):
+from .instancing import build_instancer, pillar_transforms, spec_value
+
+
+def build_pillar_frame(pillars: List[dict], pillar_proto, collection, instanced: bool = False,
+                       writer: Optional[BulkWriter] = None, style: str = DEFAULT_STYLE):
     """pillars: list of PillarSpec-like dict or dataclass with .coord
-    pillar_proto: object returned by components.create_pillar
+    pillar_proto: object returned by components.create_pillar（或 MeshData 原型）
     collection: bpy collection-like
+    instanced: 为 True 时全部柱子合并为一个实例化对象，不支持时回退批量写入
+    writer: 传入时只登记、由调用方统一 commit()；否则立即写入并返回创建的对象
+    style: 命名中的体系词元（COL_<序号>_H<高度>_D<直径>_STYLE_<体系>）
     """
-    created = []
-    for p in pillars:
-        coord = getattr(p, 'coord', None) or p.get('coord')
-        inst = None
-        try:
-            inst = pillar_proto.copy()
-        except Exception:
-            inst = type('O', (), {})()
-            inst.name = pillar_proto.name + "_inst"
-            inst.data = pillar_proto.data
-        # 设定位置
-        try:
-            inst.location = coord
-        except Exception:
-            inst.location = coord
-        # 链接集合
-        try:
-            collection.objects_link(inst)
-        except Exception:
-            # Mock: append
-            getattr(collection, 'objects', []).append(inst)
-        created.append(inst)
-    return created
\ No newline at end of file
+    if not pillars:
+        return []
+    matrices = pillar_transforms(pillars)
+
+    if instanced:
+        inst = build_instancer(f"{pillar_proto.name}_instances", pillar_proto, matrices, collection)
+        if inst is not None:
+            return [inst]
+
+    own = writer is None
+    writer = writer or BulkWriter(name_prefix="COL")
+    names = writer.naming.names(
+        "COL",
+        collection_name(collection),
+        height=[spec_value(p, "height") for p in pillars],
+        diameter=[spec_value(p, "diameter") for p in pillars],
+        style=style,
+    )
+    writer.add("pillar", prototype_mesh(pillar_proto), collection, matrices, names)
+    return list(writer.commit().values()) if own else []
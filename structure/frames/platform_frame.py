@@ -0,0 +1,20 @@
+# -----------------------------------------------------------------------------
+# file: structure/frame/platform_frame.py
+# -----------------------------------------------------------------------------
+from typing import Dict, Optional
+
+from geometry.mesh import InstanceBatch
+from structure.writer import BulkWriter
+
+
+def build_platform_frame(platform: Dict[str, InstanceBatch], collection, writer: Optional[BulkWriter] = None):
+    """platform: calculator 结果中的 results["platform"]（台明 / 踏跺 / 柱顶石）
+    collection: 建筑的 platform（台明）子集合，见 utils.ensure_sub_collections
+    writer: 传入时只登记、由调用方统一 commit()；否则立即写入并返回 {对象名: 对象}
+    """
+    own = writer is None
+    writer = writer or BulkWriter(name_prefix="BASE")
+    for batch in platform.values():
+        if isinstance(batch, InstanceBatch) and batch.count:
+            writer.add(batch.name, batch.mesh, collection, batch.matrices)
+    return writer.commit() if own else {}
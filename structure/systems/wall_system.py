@@ -1,5 +1,49 @@
 # wall_system.py
-from geometry.wall import WallGeometry
+"""
+墙体系统（纯 NumPy，无需 Blender）：由屋面计算结果推出各墙段，
+经 geometry.wall 在二维立面上开洞后拉伸为网格。
+
+墙段布置（墙中线落在柱轴线上）：
+    后檐墙    y = D，上至檐枋下皮，顶为签尖
+    两山墙    x = 0 / W，硬山、悬山上至山尖，歇山同檐墙平顶加签尖
+    山花      硬山 / 悬山为山尖部分；歇山为退进一步架的山花板
+各部分竖向：下碱（0 ~ 檐柱高 × 3/10）→ 上身 → 山花 / 签尖。
+
+params（见 wall_params()）：
+    x_coords, depth, pillar_height, pillar_diameter, purlin_y, purlin_z
+    openings : [{"wall": "back" | "left" | "right", "u": 中心距墙起点,
+                 "width", "sill": 洞底标高, "height"}]
+"""
+from typing import Dict, List
+
+import numpy as np
+
+from configs.vocabulary import Vocabulary
+from geometry.mesh import MeshData
+from geometry.wall import WallGeometry, WallSegment, coping_prism
+
+# 墙厚 / 柱径
+GABLE_THICKNESS_RATIO = 2.0
+EAVE_THICKNESS_RATIO = 1.5
+# 下碱高 / 檐柱高，上身较下碱每侧退进（花碱）/ 墙厚
+BASE_HEIGHT_RATIO = 0.3
+BODY_INSET_RATIO = 0.03
+
+
+def wall_params(packed: dict, openings: List[dict] = None) -> dict:
+    """由 calculator.calculate_all() 的返回整理墙体参数"""
+    results = packed["results"]
+    frame, roof = results["frame"], results["roof"]
+    return {
+        "x_coords": np.asarray(results["grid"]["x_coords"], dtype=np.float64),
+        "depth": float(results["grid"]["depth_total"]),
+        "pillar_height": float(frame["pillar_height"]),
+        "pillar_diameter": float(frame["pillar_diameter"]),
+        "purlin_y": np.asarray(roof["purlin_y"], dtype=np.float64),
+        "purlin_z": np.asarray(roof["purlin_z"], dtype=np.float64),
+        "openings": openings or [],
+        "rule": packed.get("rule", {}),
+    }
 
 
 class WallBase:
@@ -8,9 +52,13 @@ class WallBase:
     def __init__(self, params):
         self.params = params
 
-    def compute(self):
-        # 计算下碱、基座几何尺寸
-        pass
+    def compute_base(self) -> List[WallSegment]:
+        """各墙段 0 ~ 下碱高，墙厚取全厚；门洞贯穿下碱"""
+        top = self.base_height
+        return [
+            WallSegment.flat(f"{name}_base", start, end, t, 0.0, top, self._openings(name))
+            for name, start, end, t, _ in self.layout()
+        ]
 
 
 class WallBody:
@@ -19,9 +67,16 @@ class WallBody:
     def __init__(self, params):
         self.params = params
 
-    def compute(self):
-        # 计算墙厚、开洞位置、封檩高度
-        pass
+    def compute_body(self) -> List[WallSegment]:
+        """下碱顶 ~ 墙身顶（檐枋下皮），两侧各退花碱"""
+        bottom = self.base_height
+        segments = []
+        for name, start, end, t, _ in self.layout():
+            body_t = t * (1.0 - 2.0 * self.rule.get("wall_body_inset_ratio", BODY_INSET_RATIO))
+            segments.append(
+                WallSegment.flat(f"{name}_body", start, end, body_t, bottom, self.body_top, self._openings(name))
+            )
+        return segments
 
 
 class WallRoofJoint:
@@ -30,21 +85,98 @@ class WallRoofJoint:
     def __init__(self, params):
         self.params = params
 
-    def compute(self):
-        # 计算老檐枋、山花、签尖
-        pass
+    def compute_roofjoint(self) -> Dict[str, List]:
+        """平顶墙段加签尖；山花由子类给出"""
+        coping = [
+            coping_prism(start, end, t, self.body_top, 0.5 * t, name=f"{name}_coping")
+            for name, start, end, t, gabled in self.layout() if not gabled
+        ]
+        return {"gable": self.compute_gable(), "coping": coping}
+
+    def compute_gable(self) -> List[WallSegment]:
+        return []
 
 
 class Wall(WallBase, WallBody, WallRoofJoint):
     """完整山墙系统"""
 
+    # 两山墙是否上至山尖（硬山 / 悬山）
+    GABLED_SIDES = True
+
     def __init__(self, params):
         WallBase.__init__(self, params)
         WallBody.__init__(self, params)
         WallRoofJoint.__init__(self, params)
         self.geometry = WallGeometry(params)
 
-    def assemble(self):
+    # ---------------- 公共尺寸 ----------------
+
+    @property
+    def rule(self) -> dict:
+        return self.params.get("rule", {})
+
+    @property
+    def base_height(self) -> float:
+        return self.params["pillar_height"] * self.rule.get("wall_base_height_ratio", BASE_HEIGHT_RATIO)
+
+    @property
+    def body_top(self) -> float:
+        """墙身顶：檐枋下皮，取檐柱高减一柱径（不低于下碱顶）"""
+        return max(self.params["pillar_height"] - self.params["pillar_diameter"], self.base_height)
+
+    def thickness(self, kind: str) -> float:
+        ratio = {
+            "gable": self.rule.get("gable_wall_thickness_ratio", GABLE_THICKNESS_RATIO),
+            "eave": self.rule.get("eave_wall_thickness_ratio", EAVE_THICKNESS_RATIO),
+        }[kind]
+        return self.params["pillar_diameter"] * ratio
+
+    def layout(self):
+        """[(名称, 起点, 终点, 墙厚, 是否上至山尖)]，两山墙由前檐向后檐"""
+        x = self.params["x_coords"]
+        depth = self.params["depth"]
+        gable_t = self.thickness("gable")
+        return [
+            ("back", (x[0], depth), (x[-1], depth), self.thickness("eave"), False),
+            ("left", (x[0], 0.0), (x[0], depth), gable_t, self.GABLED_SIDES),
+            ("right", (x[-1], 0.0), (x[-1], depth), gable_t, self.GABLED_SIDES),
+        ]
+
+    def _openings(self, wall: str) -> np.ndarray:
+        rows = [
+            (o["u"] - o["width"] / 2.0, o["u"] + o["width"] / 2.0, o["sill"], o["sill"] + o["height"])
+            for o in self.params.get("openings", []) if o["wall"] == wall
+        ]
+        return np.asarray(rows, dtype=np.float64).reshape(-1, 4)
+
+    # ---------------- 山尖轮廓 ----------------
+
+    def gable_profile(self, drop: float = 0.0):
+        """
+        山墙上沿：沿进深 u = y 的檩位折线（向下偏移 drop），
+        两端各按檐步坡度延至墙段起止（u = 0 / D）。
+        """
+        y, z = self.params["purlin_y"], self.params["purlin_z"] - drop
+        depth = self.params["depth"]
+        u = np.concatenate([[0.0], y, [depth]])
+        top = np.concatenate([[z[0]], z, [z[-1]]])
+        u, idx = np.unique(u, return_index=True)
+        return u, top[idx]
+
+    def gable_segments(self, drop: float) -> List[WallSegment]:
+        """两山墙墙身以上的山尖部分"""
+        u, top = self.gable_profile(drop)
+        segments = []
+        for name, start, end, t, gabled in self.layout():
+            if gabled:
+                body_t = t * (1.0 - 2.0 * self.rule.get("wall_body_inset_ratio", BODY_INSET_RATIO))
+                segments.append(WallSegment(f"{name}_gable", start, end, body_t, self.body_top, u, top,
+                                            self._openings(name)))
+        return segments
+
+    # ---------------- 组装 ----------------
+
+    def assemble(self) -> Dict[str, MeshData]:
         base = self.compute_base()
         body = self.compute_body()
         roofjoint = self.compute_roofjoint()
@@ -54,22 +186,49 @@ class Wall(WallBase, WallBody, WallRoofJoint):
 class YingShanWall(Wall):
     """硬山墙"""
 
-    def compute_roofjoint(self):
-        # 无挑檐，与屋面平齐
-        pass
+    def compute_gable(self):
+        # 无挑檐，山尖与屋面平齐：上沿取檩背（檩位上抬半柱径）
+        return self.gable_segments(drop=-0.5 * self.params["pillar_diameter"])
 
 
 class XuanShanWall(Wall):
     """悬山墙"""
 
-    def compute_roofjoint(self):
-        # 檐椽挑出墙外，计算挑檐长度与签尖
-        pass
+    def compute_gable(self):
+        # 檩、椽挑出墙外（出梢），山尖收于檩下，上沿取檩底
+        return self.gable_segments(drop=0.5 * self.params["pillar_diameter"])
 
 
 class XieShanWall(Wall):
     """歇山墙"""
 
-    def compute_roofjoint(self):
-        # 前后坡屋面 + 博风板交界，增加脊部构件
-        pass
+    GABLED_SIDES = False
+
+    def compute_gable(self):
+        # 山花板：退进一步架（撒头之上），下沿为下金檩，上沿随檩位至脊
+        y, z = self.params["purlin_y"], self.params["purlin_z"]
+        x = self.params["x_coords"]
+        inset = y[1] - y[0]
+        u = y[1:-1] - y[1]
+        top = z[1:-1] + 0.5 * self.params["pillar_diameter"]
+        t = self.params["pillar_diameter"] * self.rule.get("gable_board_thickness_ratio", 0.25)
+
+        return [
+            WallSegment(f"{name}_gable", (gx, y[1]), (gx, y[-2]), t, z[1], u, top)
+            for name, gx in (("left", x[0] + inset), ("right", x[-1] - inset))
+        ]
+
+
+# 屋顶形式 ASCII 标识 → 墙体类
+WALL_CLASSES = {"hard_hill": YingShanWall, "hanging_hill": XuanShanWall, "hip_roof": XieShanWall}
+
+
+def build_walls(packed: dict, openings: List[dict] = None) -> Dict[str, MeshData]:
+    """
+    由 calculator.calculate_all() 的返回生成墙体网格 {部件名: MeshData}；
+    无墙体规则的屋面形式（庑殿、攒尖等）返回空字典。
+    """
+    wall_cls = WALL_CLASSES.get(Vocabulary.category_id(packed["category_info"], "roof_forms"))
+    if wall_cls is None:
+        return {}
+    return wall_cls(wall_params(packed, openings)).assemble()
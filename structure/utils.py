@@ -1,8 +1,11 @@
 # -----------------------------------------------------------------------------
 # file: structure/utils.py
 # -----------------------------------------------------------------------------
-from typing import Callable
-import bpy
+from typing import Callable, Dict, List
+
+from core.naming_service import reset_naming
+from geometry.mesh import MeshData
+from structure.component_calculator_schema import bpy
 
 # ================================================================
 # Mesh 缓存 / 创建
@@ -23,6 +26,24 @@ def get_or_create_mesh(mesh_key: str, create_func: Callable):
     return mesh
 
 
+# 原型对象名 → 原型网格（MeshData），供 BulkWriter 按变换矩阵烘焙
+_PROTOTYPE_MESHES: Dict[str, MeshData] = {}
+
+
+def register_prototype(name: str, mesh: MeshData):
+    _PROTOTYPE_MESHES[name] = mesh
+
+
+def prototype_mesh(proto) -> MeshData:
+    """原型对象（components.create_*）或 MeshData → MeshData"""
+    if isinstance(proto, MeshData):
+        return proto
+    name = getattr(proto, "name", None)
+    if name not in _PROTOTYPE_MESHES:
+        raise ValueError(f"原型 {name} 没有登记网格（components.create_* 创建的原型会自动登记）")
+    return _PROTOTYPE_MESHES[name]
+
+
 # ================================================================
 # Collection 操作
 # ================================================================
@@ -47,6 +68,50 @@ def link_child_collection(parent: bpy.types.Collection, child: bpy.types.Collect
         parent.children.link(child)
 
 
+# ================================================================
+# 进程内集合索引
+# ================================================================
+class CollectionIndex:
+    """
+    name → collection 的进程内索引，以及已建立的父子链接。
+    每个名称只在 bpy.data.collections / parent.children 中查找一次，
+    之后均为 O(1) 字典查找。
+
+    注意：若在外部删除了集合，需调用 reset() 清空索引。
+    """
+
+    def __init__(self):
+        self._collections: Dict[str, object] = {}
+        self._links = set()
+
+    def get(self, name: str):
+        coll = self._collections.get(name)
+        if coll is None:
+            coll = ensure_collection(name)
+            self._collections[name] = coll
+        return coll
+
+    def link(self, parent, child):
+        key = (parent.name, child.name)
+        if key in self._links:
+            return
+        link_child_collection(parent, child)
+        self._links.add(key)
+
+    def reset(self):
+        self._collections.clear()
+        self._links.clear()
+
+
+_collection_index = CollectionIndex()
+
+
+def reset_collection_index():
+    """清空集合索引；集合随之重建，其构件序号也从 1 重新计"""
+    _collection_index.reset()
+    reset_naming()
+
+
 # ================================================================
 # 生成三级 + 四级的集合层级
 # ================================================================
@@ -57,15 +122,16 @@ DEFAULT_SUB_COLLECTIONS = {
 }
 
 
-def ensure_sub_collections(parent_coll: bpy.types.Collection):
+def ensure_sub_collections(parent_coll: bpy.types.Collection, index: CollectionIndex = None):
     """为建筑实例创建统一的三个子集合：platform / main_body / roof"""
+    index = index or _collection_index
     sub_colls = {}
 
     for en_name in DEFAULT_SUB_COLLECTIONS.keys():
         sub_name = f"{parent_coll.name}_{en_name}"
-        sub_coll = ensure_collection(sub_name)
+        sub_coll = index.get(sub_name)
 
-        link_child_collection(parent_coll, sub_coll)
+        index.link(parent_coll, sub_coll)
 
         sub_colls[en_name] = sub_coll
 
@@ -75,6 +141,52 @@ def ensure_sub_collections(parent_coll: bpy.types.Collection):
 # ================================================================
 # 从数据初始化四级集合结构
 # ================================================================
+def _hierarchy_names(info: dict):
+    basic = info.get("basic_info", {})
+
+    garden_name = basic.get("garden_name", "Garden")
+    garden_id   = basic.get("garden_id", "GID")
+    building_id = basic.get("building_id", "00")
+    building_name = basic.get("building_name", "Building")
+
+    return garden_name, f"{garden_name}_{garden_id}", f"{building_id}_{building_name}"
+
+
+def build_hierarchy(infos: List[dict], index: CollectionIndex = None) -> List[dict]:
+    """
+    一次性为全部建筑建立四级集合层级（见 ensure_hierarchy_from_data）。
+    园区 / 园区 ID 两级先去重，每个只创建、链接一次；
+    返回列表与 infos 一一对应。
+    """
+    index = index or _collection_index
+    names = [_hierarchy_names(info) for info in infos]
+
+    # 1、2 级去重（dict 保持首次出现顺序）
+    for garden_name, lv2_name in dict.fromkeys((n[0], n[1]) for n in names):
+        index.link(index.get(garden_name), index.get(lv2_name))
+
+    hierarchies = []
+    for garden_name, lv2_name, lv3_name in names:
+        coll_lv1 = index.get(garden_name)
+        coll_lv2 = index.get(lv2_name)
+
+        # 3 - 建筑 ID + 名称
+        coll_lv3 = index.get(lv3_name)
+        index.link(coll_lv2, coll_lv3)
+
+        # 4 - 默认子集合
+        sub_colls = ensure_sub_collections(coll_lv3, index)
+
+        hierarchies.append({
+            "garden": coll_lv1,
+            "garden_id": coll_lv2,
+            "building": coll_lv3,
+            "subs": sub_colls,
+        })
+
+    return hierarchies
+
+
 def ensure_hierarchy_from_data(info: dict):
     """
     根据 data_loader 输出初始化集合层级：
@@ -92,37 +204,9 @@ def ensure_hierarchy_from_data(info: dict):
             'building_name': '松篁深处'
         }
     }
+    批量建筑请直接使用 build_hierarchy。
     """
-
-    basic = info.get("basic_info", {})
-
-    garden_name = basic.get("garden_name", "Garden")
-    garden_id   = basic.get("garden_id", "GID")
-    building_id = basic.get("building_id", "00")
-    building_name = basic.get("building_name", "Building")
-
-    # 1 - 顶层园区
-    coll_lv1 = ensure_collection(garden_name)
-
-    # 2 - 园区 ID
-    lv2_name = f"{garden_name}_{garden_id}"
-    coll_lv2 = ensure_collection(lv2_name)
-    link_child_collection(coll_lv1, coll_lv2)
-
-    # 3 - 建筑 ID + 名称
-    lv3_name = f"{building_id}_{building_name}"
-    coll_lv3 = ensure_collection(lv3_name)
-    link_child_collection(coll_lv2, coll_lv3)
-
-    # 4 - 默认子集合
-    sub_colls = ensure_sub_collections(coll_lv3)
-
-    return {
-        "garden": coll_lv1,
-        "garden_id": coll_lv2,
-        "building": coll_lv3,
-        "subs": sub_colls,
-    }
+    return build_hierarchy([info])[0]
 
 
 if __name__ == "__main__":
@@ -0,0 +1,194 @@
+# -----------------------------------------------------------------------------
+# file: structure/writer.py
+# -----------------------------------------------------------------------------
+"""
+批量写入层：逐对象、逐属性的 Python 调用是大场景的主要开销。
+
+BulkWriter 先把顶点 / 面 / 变换 / 集合归属收集为扁平数组，
+commit() 时每个 (集合, 构件类) 只创建一个合并 mesh 与一个对象，
+顶点与面通过 foreach_set 一次写入；Mock 环境下退化为 from_pydata。
+
+合并后单个构件不再是独立对象：add() 可带上各构件名（NamingService 生成，
+与摆放一一对应），commit() 时按合并顺序记在对象的 member_names 上，
+parse_names() 即可还原每根构件的参数。
+"""
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from core.memory_trace import MemoryTracer
+from core.naming_service import NamingService, shared_naming
+from geometry.mesh import MeshData, box, instance_mesh, merge_meshes
+from structure.component_calculator_schema import bpy
+
+
+class BulkWriter:
+
+    def __init__(self, name_prefix: str = "", naming: Optional[NamingService] = None):
+        self.name_prefix = name_prefix
+        # 序号按（集合, 前缀）计数；缺省共用进程内实例，跨 writer、跨多次 commit 集合内不重名
+        self.naming = naming or shared_naming()
+
+        # 集合与构件类 → 整数编号
+        self._collections: List[object] = []
+        self._collection_index: Dict[int, int] = {}
+        self._classes: List[str] = []
+        self._class_index: Dict[str, int] = {}
+
+        # 每次 add 一条记录，归属以整数数组保存
+        self._meshes: List[MeshData] = []
+        self._batch_class: List[int] = []
+        self._batch_collection: List[int] = []
+        self._names: List[Optional[np.ndarray]] = []
+
+    # ---------------- 收集 ----------------
+
+    def _collection_id(self, collection) -> int:
+        key = id(collection)
+        if key not in self._collection_index:
+            self._collection_index[key] = len(self._collections)
+            self._collections.append(collection)
+        return self._collection_index[key]
+
+    def _class_id(self, component_class: str) -> int:
+        if component_class not in self._class_index:
+            self._class_index[component_class] = len(self._classes)
+            self._classes.append(component_class)
+        return self._class_index[component_class]
+
+    def add(self, component_class: str, mesh: MeshData, collection, matrices: Optional[np.ndarray] = None,
+            names: Optional[Sequence[str]] = None):
+        """
+        登记一批构件：mesh 为原型，matrices (N, 4, 4) 为全部摆放（缺省即原位一次）。
+        names 为各构件名（N 个，通常由 self.naming 生成）。
+        几何在此处一次性烘焙为世界坐标。
+        """
+        count = 1 if matrices is None else len(matrices)
+        if names is not None and len(names) != count:
+            raise ValueError(f"构件名数量与摆放数不符：{len(names)} / {count}")
+        if matrices is not None:
+            mesh = instance_mesh(mesh, matrices)
+
+        self._meshes.append(mesh)
+        self._batch_class.append(self._class_id(component_class))
+        self._batch_collection.append(self._collection_id(collection))
+        self._names.append(None if names is None else np.asarray(names, dtype=str))
+
+    def add_members(self, members, prefix: str, collection, component_class: Optional[str] = None):
+        """
+        线状构件数组（roof_frame_calculator.MemberArrays）：单位长度方截面原型，
+        截面边长取构件径，按 PURL / RAFT 等模板命名。
+        """
+        if not len(members):
+            return
+        d = float(members.diameter) or 1.0
+        names = self.naming.name_members(members, prefix, collection_name(collection))
+        self.add(component_class or prefix.lower(), box((1.0, d, d), name=prefix), collection,
+                 members.transforms(), names)
+
+    def clear(self):
+        self.__init__(self.name_prefix, self.naming)
+
+    # ---------------- 提交 ----------------
+
+    @MemoryTracer.traced("assemble:commit")
+    def commit(self) -> Dict[str, object]:
+        """
+        按 (集合, 构件类) 分组合并并写入场景。
+        返回 {对象名: 对象}
+        """
+        if not self._meshes:
+            return {}
+
+        batch_class = np.asarray(self._batch_class)
+        batch_collection = np.asarray(self._batch_collection)
+        group_keys = batch_collection * len(self._classes) + batch_class
+
+        created = {}
+        for key in np.unique(group_keys):
+            members = np.flatnonzero(group_keys == key)
+            coll_id, class_id = divmod(int(key), len(self._classes))
+            collection = self._collections[coll_id]
+
+            name = f"{self.name_prefix}{collection_name(collection, coll_id)}_{self._classes[class_id]}"
+            merged = merge_meshes([self._meshes[i] for i in members], name=name)
+
+            obj = _new_object(name, _write_mesh(name, merged))
+            _link_object(collection, obj)
+            names = [self._names[i] for i in members if self._names[i] is not None]
+            if names:
+                _set_member_names(obj, np.concatenate(names))
+            created[name] = obj
+
+        self.clear()
+        return created
+
+
+# ================================================================
+# bpy 兼容写入
+# ================================================================
+def collection_name(collection, default="") -> str:
+    return str(getattr(collection, "name", default))
+
+
+def _set_member_names(obj, names: np.ndarray):
+    """真实 Blender：自定义属性（IDProperty 不支持字符串列表，以换行拼接）；Mock 直接挂属性"""
+    try:
+        obj["member_names"] = "\n".join(names.tolist())
+    except TypeError:
+        obj.member_names = names.tolist()
+
+
+def _new_mesh(name: str):
+    try:
+        return bpy.data.meshes.new(name)
+    except Exception:
+        # Mock
+        return bpy.data_meshes_new(name)
+
+
+def _new_object(name: str, mesh):
+    try:
+        return bpy.data.objects.new(name, mesh)
+    except Exception:
+        return bpy.data_objects_new(name, mesh)
+
+
+def _link_object(collection, obj):
+    try:
+        collection.objects.link(obj)
+    except Exception:
+        collection.objects_link(obj)
+
+
+def create_mesh_object(name: str, data: MeshData):
+    """单个网格对象（原型等），不链接到集合；真实 Blender 与 Mock 均可用"""
+    return _new_object(name, _write_mesh(name, data))
+
+
+def _write_mesh(name: str, data: MeshData):
+    """真实 Blender：foreach_set 批量写入；否则 from_pydata"""
+    mesh = _new_mesh(name)
+
+    if not hasattr(getattr(mesh, "vertices", None), "foreach_set"):
+        mesh.from_pydata(data.vertices.tolist(), [], data.faces.tolist())
+        return mesh
+
+    nv, nf = data.num_vertices, data.num_faces
+    mesh.vertices.add(nv)
+    mesh.vertices.foreach_set("co", data.vertices.astype(np.float32).ravel())
+
+    mesh.loops.add(nf * 3)
+    mesh.loops.foreach_set("vertex_index", data.faces.astype(np.int32).ravel())
+
+    mesh.polygons.add(nf)
+    mesh.polygons.foreach_set("loop_start", np.arange(0, nf * 3, 3, dtype=np.int32))
+    try:
+        # Blender 4.0 起 loop_total 只读，由 loop_start 推出
+        mesh.polygons.foreach_set("loop_total", np.full(nf, 3, dtype=np.int32))
+    except (AttributeError, TypeError, RuntimeError):
+        pass
+
+    mesh.update(calc_edges=True)
+    mesh.validate()
+    return mesh